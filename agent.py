@@ -0,0 +1,138 @@
+"""独立运行的状态采集 agent
+
+在被监控节点上运行，周期性采集本机状态并以二进制快照推送给所有连接的聚合器：
+
+    python -m astrbot_plugin_status.agent --name node1
+    python -m astrbot_plugin_status.agent --listen tcp://10.0.0.5:9477 --name node1
+    python -m astrbot_plugin_status.agent --listen unix:///run/astrbot_status.sock
+
+默认只监听 127.0.0.1:9477。协议没有认证，任何能连上的人都能读到完整的状态快照，
+需要跨主机访问时请显式指定内网地址，并用防火墙或 SSH 隧道限制来源。
+
+只依赖 psutil 与 py-cpuinfo，不需要安装 AstrBot。
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import time
+from typing import Optional, Set
+
+from .snapshot import (
+    FRAME_HEARTBEAT,
+    FRAME_HELLO,
+    FRAME_SNAPSHOT,
+    PROTOCOL_VERSION,
+    encode_snapshot,
+    pack_frame,
+    serve_endpoint,
+)
+from .system_info import get_all_status_info
+
+logger = logging.getLogger(__name__)
+
+
+class StatusAgent:
+    """采集本机状态并推送给订阅者"""
+
+    def __init__(
+        self,
+        listen: str,
+        name: Optional[str] = None,
+        interval: float = 5.0,
+        heartbeat: float = 2.0,
+    ):
+        self.listen = listen
+        self.name = name or socket.gethostname()
+        self.interval = interval
+        self.heartbeat = heartbeat
+        self.clients: Set[asyncio.StreamWriter] = set()
+        self.latest: Optional[bytes] = None
+        self.last_sent = 0.0
+
+    async def run(self):
+        """启动服务并进入采集循环"""
+        server = await serve_endpoint(self.handle_client, self.listen)
+        logger.info(f"agent {self.name} 监听于 {self.listen}")
+        async with server:
+            await asyncio.gather(self.collect_loop(), self.heartbeat_loop())
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """新连接：发送 HELLO 与最新快照，然后加入广播列表"""
+        hello = f"{PROTOCOL_VERSION}|{self.name}".encode("utf-8")
+        writer.write(pack_frame(FRAME_HELLO, hello))
+        if self.latest:
+            writer.write(pack_frame(FRAME_SNAPSHOT, self.latest))
+        self.clients.add(writer)
+        try:
+            # 聚合器不发送数据，读到 EOF 即表示断开
+            await reader.read()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    async def collect_loop(self):
+        """周期采集并广播快照"""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = time.monotonic()
+            try:
+                # 采集包含阻塞调用 (cpu_percent 等)，放到线程池执行
+                status_info = await loop.run_in_executor(None, get_all_status_info)
+                self.latest = encode_snapshot(status_info)
+                await self.broadcast(pack_frame(FRAME_SNAPSHOT, self.latest))
+            except Exception as e:
+                logger.error(f"采集状态失败: {e}")
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(0.0, self.interval - elapsed))
+
+    async def heartbeat_loop(self):
+        """空闲时发送心跳，便于聚合器判断连接存活"""
+        frame = pack_frame(FRAME_HEARTBEAT)
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            if time.monotonic() - self.last_sent >= self.heartbeat:
+                await self.broadcast(frame)
+
+    async def broadcast(self, frame: bytes):
+        """向所有连接发送一帧，写失败的连接直接丢弃"""
+        self.last_sent = time.monotonic()
+        if self.clients:
+            await asyncio.gather(*(self._send(w, frame) for w in list(self.clients)))
+
+    async def _send(self, writer: asyncio.StreamWriter, frame: bytes):
+        try:
+            writer.write(frame)
+            await asyncio.wait_for(writer.drain(), timeout=self.heartbeat)
+        except (ConnectionError, OSError, asyncio.TimeoutError):
+            self.clients.discard(writer)
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AstrBot 状态采集 agent")
+    parser.add_argument(
+        "--listen",
+        default="tcp://127.0.0.1:9477",
+        help="监听地址，tcp://host:port 或 unix:///path（默认仅本机）",
+    )
+    parser.add_argument("--name", help="节点名称，默认为主机名")
+    parser.add_argument("--interval", type=float, default=5.0, help="采集间隔（秒）")
+    parser.add_argument("--heartbeat", type=float, default=2.0, help="心跳间隔（秒）")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    agent = StatusAgent(args.listen, args.name, args.interval, args.heartbeat)
+    try:
+        asyncio.run(agent.run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""阈值告警模块
+
+规则在每次采样后增量求值，单条规则的求值为 O(1)（均摊），不回扫历史：
+
+    cpu > 90 for 120      CPU 使用率持续 120 秒高于 90%
+    disk > 95             磁盘使用率高于 95%
+    swap rising for 300   交换分区使用率在 300 秒窗口内持续上升
+    ram rising 2 for 600  内存使用率 600 秒内平均每分钟上升超过 2 个百分点
+
+阈值规则触发后，指标需越过阈值的 hysteresis% 才算恢复（回差按阈值的比例计算，
+百分比与 B/s 指标通用）。冷却期内被抑制的触发不会推送，对应的恢复也不会推送。
+"""
+
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .perf import RollingHistogram
+
+logger = logging.getLogger(__name__)
+
+METRIC_LABELS = {
+    "cpu": ("CPU", "%"),
+    "ram": ("内存", "%"),
+    "swap": ("交换分区", "%"),
+    "disk": ("磁盘", "%"),
+    "net_up": ("上行", "B/s"),
+    "net_down": ("下行", "B/s"),
+    "disk_io": ("磁盘 I/O", "B/s"),
+}
+
+_THRESHOLD_RE = re.compile(
+    r"^\s*(?P<metric>\w+)\s*(?P<op>>=|<=|>|<)\s*(?P<value>[\d.]+)"
+    r"(?:\s+for\s+(?P<duration>\d+)\s*s?)?\s*$",
+    re.IGNORECASE,
+)
+_RISING_RE = re.compile(
+    r"^\s*(?P<metric>\w+)\s+rising(?:\s+(?P<rate>[\d.]+))?"
+    r"(?:\s+for\s+(?P<duration>\d+)\s*s?)?\s*$",
+    re.IGNORECASE,
+)
+
+DEFAULT_RISING_WINDOW = 300
+DEFAULT_RISING_RATE = 0.1  # 每分钟
+
+
+class RunningSlope:
+    """滑动时间窗口内的最小二乘斜率，增删样本均为 O(1)"""
+
+    def __init__(self, window: float):
+        self.window = window
+        self.samples: Deque[Tuple[float, float]] = deque()
+        self.sum_t = self.sum_v = self.sum_tt = self.sum_tv = 0.0
+
+    def add(self, t: float, v: float):
+        self.samples.append((t, v))
+        self.sum_t += t
+        self.sum_v += v
+        self.sum_tt += t * t
+        self.sum_tv += t * v
+        while self.samples and t - self.samples[0][0] > self.window:
+            old_t, old_v = self.samples.popleft()
+            self.sum_t -= old_t
+            self.sum_v -= old_v
+            self.sum_tt -= old_t * old_t
+            self.sum_tv -= old_t * old_v
+
+    def span(self) -> float:
+        """窗口内样本覆盖的时长"""
+        if len(self.samples) < 2:
+            return 0.0
+        return self.samples[-1][0] - self.samples[0][0]
+
+    def slope(self) -> float:
+        """每秒变化量"""
+        n = len(self.samples)
+        if n < 2:
+            return 0.0
+        denominator = n * self.sum_tt - self.sum_t * self.sum_t
+        if denominator <= 0:
+            return 0.0
+        return (n * self.sum_tv - self.sum_t * self.sum_v) / denominator
+
+
+@dataclass
+class AlertRule:
+    """单条告警规则及其运行状态"""
+
+    text: str
+    metric: str
+    kind: str  # "threshold" 或 "rising"
+    op: str = ">"
+    threshold: float = 0.0
+    duration: float = 0.0
+    active: bool = False
+    pending_since: Optional[float] = None
+    last_fired: float = 0.0
+    notified: bool = False  # 本次告警是否已推送，未推送的告警恢复时也不推送
+    last_value: float = 0.0
+    fired_count: int = 0
+    slope: Optional[RunningSlope] = field(default=None, repr=False)
+
+    @classmethod
+    def parse(cls, text: str) -> "AlertRule":
+        """解析规则文本，格式错误时抛出 ValueError"""
+        match = _RISING_RE.match(text)
+        if match:
+            metric = match["metric"].lower()
+            duration = float(match["duration"] or DEFAULT_RISING_WINDOW)
+            rate = float(match["rate"]) if match["rate"] else DEFAULT_RISING_RATE
+            rule = cls(text.strip(), metric, "rising", threshold=rate, duration=duration)
+            rule.slope = RunningSlope(duration)
+        else:
+            match = _THRESHOLD_RE.match(text)
+            if not match:
+                raise ValueError(f"无法解析告警规则: {text}")
+            metric = match["metric"].lower()
+            rule = cls(
+                text.strip(),
+                metric,
+                "threshold",
+                op=match["op"],
+                threshold=float(match["value"]),
+                duration=float(match["duration"] or 0),
+            )
+        if metric not in METRIC_LABELS:
+            raise ValueError(f"未知指标 {metric}，可用: {', '.join(METRIC_LABELS)}")
+        return rule
+
+    def breached(self, value: float, now: float, hysteresis: float) -> bool:
+        """当前样本是否满足告警条件；已告警时按回差判断是否仍未恢复"""
+        if self.kind == "rising":
+            self.slope.add(now, value)
+            per_minute = self.slope.slope() * 60
+            self.last_value = per_minute
+            if self.active:
+                return per_minute > 0
+            # 窗口需基本填满，避免启动初期的噪声
+            return self.slope.span() >= self.duration * 0.9 and per_minute > self.threshold
+
+        self.last_value = value
+        margin = abs(self.threshold) * hysteresis / 100 if self.active else 0.0
+        if self.op in (">", ">="):
+            limit = self.threshold - margin
+            return value >= limit if self.op == ">=" else value > limit
+        limit = self.threshold + margin
+        return value <= limit if self.op == "<=" else value < limit
+
+
+class AlertEngine:
+    """在采样流上增量求值告警规则"""
+
+    def __init__(
+        self,
+        rules: List[str],
+        notify: Callable[[str], None],
+        hysteresis: float = 5.0,
+        cooldown: float = 600.0,
+    ):
+        self.notify = notify
+        self.hysteresis = hysteresis
+        self.cooldown = cooldown
+        self.rules: List[AlertRule] = []
+        for text in rules or []:
+            try:
+                self.rules.append(AlertRule.parse(str(text)))
+            except ValueError as e:
+                logger.warning(str(e))
+        self.eval_histogram = RollingHistogram(1000)
+        self.ticks = 0
+
+    def evaluate(self, metrics: Dict[str, float], now: Optional[float] = None):
+        """对一次采样求值全部规则"""
+        started = time.perf_counter()
+        now = time.monotonic() if now is None else now
+        messages = []
+        for rule in self.rules:
+            value = metrics.get(rule.metric)
+            if value is None:
+                continue
+            message = self._step(rule, value, now)
+            if message:
+                messages.append(message)
+        self.ticks += 1
+        self.eval_histogram.record((time.perf_counter() - started) * 1e6)
+
+        for message in messages:
+            try:
+                self.notify(message)
+            except Exception as e:
+                logger.error(f"发送告警失败: {e}")
+
+    def _step(self, rule: AlertRule, value: float, now: float) -> Optional[str]:
+        """推进单条规则的状态机，需要通知时返回消息文本"""
+        breached = rule.breached(value, now, self.hysteresis)
+
+        if rule.active:
+            if not breached:
+                rule.active = False
+                rule.pending_since = None
+                if not rule.notified:
+                    return None
+                rule.notified = False
+                return f"✅ 告警恢复: {rule.text} (当前 {self._format(rule, value)})"
+            return None
+
+        if not breached:
+            rule.pending_since = None
+            return None
+
+        if rule.pending_since is None:
+            rule.pending_since = now
+        # rising 规则的持续时间已体现在窗口中
+        held = rule.kind == "rising" or now - rule.pending_since >= rule.duration
+        if not held:
+            return None
+
+        rule.active = True
+        if rule.fired_count and now - rule.last_fired < self.cooldown:
+            # 冷却期内重新触发，只更新状态不重复通知
+            return None
+        rule.last_fired = now
+        rule.notified = True
+        rule.fired_count += 1
+        return f"🚨 告警: {rule.text} (当前 {self._format(rule, value)})"
+
+    def _format(self, rule: AlertRule, value: float) -> str:
+        label, unit = METRIC_LABELS[rule.metric]
+        if rule.kind == "rising":
+            return f"{label} {value:.1f}{unit}，每分钟 {rule.last_value:+.2f}"
+        if unit == "B/s":
+            return f"{label} {value / 1024**2:.1f}MB/s"
+        return f"{label} {value:.1f}{unit}"
+
+    def format_report(self) -> str:
+        """规则状态与求值开销"""
+        if not self.rules:
+            return "🔔 未配置告警规则"
+
+        lines = [f"🔔 告警规则 ({len(self.rules)} 条)"]
+        for rule in self.rules:
+            if rule.active:
+                state = "🚨 告警中"
+            elif rule.pending_since is not None:
+                state = "⏳ 待确认"
+            else:
+                state = "✅ 正常"
+            lines.append(f"{state} {rule.text} (触发 {rule.fired_count} 次)")
+
+        p50, p99 = self.eval_histogram.percentiles(50, 99)
+        lines.append("")
+        lines.append(
+            f"⏱️ 每次求值耗时 p50 {p50:.1f}µs / p99 {p99:.1f}µs (已求值 {self.ticks} 次)"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,134 @@
+"""共享内存快照读取开销基准
+
+    python benchmarks/bench_shm.py
+
+对比读取共享内存快照与直接调用 psutil 采集同等指标的耗时；
+另起一个子进程持续高频写入，验证 seqlock 在并发写入下读到的快照始终一致。
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import sys
+import time
+
+import fakes
+from harness import add_common_arguments, finish, measure, percentile
+
+SEGMENT = f"astrbot_status_bench_{multiprocessing.current_process().pid}"
+
+
+def run_writer(name: str, cores: int, seconds: float):
+    """子进程：以约 10kHz 发布快照（远高于实际采样频率），每个快照内所有数值相同"""
+    shm_snapshot = fakes.load_plugin_module("shm_snapshot")
+    writer = shm_snapshot.SnapshotWriter(name)
+    deadline = time.monotonic() + seconds
+    ticks = 0
+    try:
+        while time.monotonic() < deadline:
+            ticks += 1
+            value = float(ticks % 100)
+            metrics = {metric: value for metric in shm_snapshot.METRICS}
+            writer.publish(metrics, [value] * cores, ticks=ticks)
+            time.sleep(0.0001)
+    finally:
+        writer.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_common_arguments(parser, iterations=2000)
+    parser.add_argument("--cores", type=int, default=64, help="每核槽位写入数量")
+    args = parser.parse_args(argv)
+
+    shm_snapshot = fakes.load_plugin_module("shm_snapshot")
+    results = {}
+
+    writer = shm_snapshot.SnapshotWriter(SEGMENT)
+    try:
+        metrics = {metric: 12.5 for metric in shm_snapshot.METRICS}
+        per_core = [float(i % 100) for i in range(args.cores)]
+        results["shm.publish"] = measure(
+            lambda: writer.publish(metrics, per_core, ticks=1),
+            args.iterations,
+            args.warmup,
+        )
+        reader = shm_snapshot.SnapshotReader(SEGMENT)
+        results["shm.read"] = measure(reader.read, args.iterations, args.warmup)
+        results["shm.attach+read"] = measure(
+            lambda: shm_snapshot.SnapshotReader(SEGMENT).read(),
+            args.iterations // 10,
+            args.warmup,
+        )
+        reader.close()
+    finally:
+        writer.close()
+
+    # 参照：直接调用 psutil 采集同样的指标（需要真实 psutil）
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+
+        def collect():
+            psutil.cpu_percent(percpu=True)
+            psutil.virtual_memory()
+            psutil.swap_memory()
+            psutil.disk_usage("/")
+            psutil.net_io_counters()
+            psutil.disk_io_counters()
+
+        results["psutil.collect"] = measure(
+            collect, max(1, args.iterations // 20), args.warmup
+        )
+
+    # 并发写入下的一致性
+    process = multiprocessing.Process(
+        target=run_writer, args=(SEGMENT, args.cores, 2.0), daemon=True
+    )
+    process.start()
+    reader = None
+    deadline = time.monotonic() + 5
+    while reader is None and time.monotonic() < deadline:
+        try:
+            reader = shm_snapshot.SnapshotReader(SEGMENT)
+            reader.read()
+        except (FileNotFoundError, LookupError, ValueError):
+            reader = None
+            time.sleep(0.01)
+    if reader is None:
+        print("写入子进程未就绪", file=sys.stderr)
+        return 1
+
+    samples = []
+    torn = 0
+    try:
+        while process.is_alive():
+            started = time.perf_counter_ns()
+            try:
+                snap = reader.read()
+            except TimeoutError:
+                continue
+            samples.append((time.perf_counter_ns() - started) / 1e6)
+            if any(v != snap.cpu for v in snap.per_core) or snap.disk_io != snap.cpu:
+                torn += 1
+    finally:
+        reader.close()
+        process.join()
+
+    if samples:
+        results["shm.read.contended"] = {
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "mean_ms": statistics.fmean(samples),
+            "alloc_peak_kb": 0.0,
+            "alloc_retained_kb": 0.0,
+        }
+    print(f"并发写入下读取 {len(samples)} 次，不一致 {torn} 次")
+    code = finish(results, args, section=f"shm[cores={args.cores}]")
+    return 1 if torn else code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""套接字状态汇总基准
+
+    python benchmarks/bench_sockets.py
+    python benchmarks/bench_sockets.py --sockets 200000
+
+在临时目录中生成内核格式的 /proc/net/{tcp,tcp6,udp,udp6}（fakes.write_proc_net），
+对比 get_socket_info 单次扫描计数与 psutil.net_connections 逐条构造对象的耗时。
+需要真实的 psutil（仅 Linux）。
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+import fakes
+from harness import add_common_arguments, finish, measure
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_common_arguments(parser, iterations=20)
+    parser.add_argument("--sockets", type=int, default=50000, help="合成套接字数量")
+    args = parser.parse_args(argv)
+
+    try:
+        import psutil
+    except ImportError:
+        print("需要安装 psutil", file=sys.stderr)
+        return 1
+    system_info = fakes.load_plugin_module("system_info")
+
+    with tempfile.TemporaryDirectory(prefix="bench_sockets_") as tmp:
+        expected = fakes.write_proc_net(Path(tmp), args.sockets)
+        info = system_info.get_socket_info(proc_root=tmp)
+        counted = {
+            state: info.states.get(name, 0)
+            for state, name in system_info.TCP_STATES.items()
+        }
+        mismatched = [
+            state
+            for state, count in expected.items()
+            if counted[state.encode()] != count
+        ]
+        if mismatched or info.udp_total != args.sockets // 10:
+            print(f"计数与生成数据不一致: {mismatched}", file=sys.stderr)
+            return 1
+
+        results = {
+            "sockets.proc_scan": measure(
+                lambda: system_info.get_socket_info(proc_root=tmp),
+                args.iterations,
+                args.warmup,
+            )
+        }
+
+        procfs_path = psutil.PROCFS_PATH
+        psutil.PROCFS_PATH = tmp
+        try:
+            results["sockets.psutil"] = measure(
+                lambda: psutil.net_connections("inet"),
+                max(1, args.iterations // 4),
+                args.warmup,
+            )
+        finally:
+            psutil.PROCFS_PATH = procfs_path
+
+    scan, reference = results["sockets.proc_scan"], results["sockets.psutil"]
+    print(
+        f"{args.sockets} 个套接字: 扫描 {scan['p50_ms']:.1f}ms，"
+        f"psutil {reference['p50_ms']:.1f}ms "
+        f"({reference['p50_ms'] / max(scan['p50_ms'], 1e-9):.0f}x)"
+    )
+    return finish(results, args, section=f"sockets[n={args.sockets}]")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""状态采集与渲染基准测试
+
+用法（在插件目录下执行）：
+
+    python benchmarks/bench_status.py --save-baseline  # 记录新基线
+    python benchmarks/bench_status.py --baseline benchmarks/baseline.json  # 对比
+
+psutil / cpuinfo / GPU 模块均被替换为确定性的假实现（套接字表读自合成的 /proc），
+结果只反映插件自身代码。
+"""
+
+import argparse
+import copy
+import itertools
+import sys
+
+import numpy as np
+from PIL import ImageDraw
+
+import fakes
+from harness import add_common_arguments, finish, measure
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_common_arguments(parser)
+    parser.add_argument("--cores", type=int, default=8, help="假 CPU 逻辑核心数")
+    args = parser.parse_args(argv)
+
+    host = fakes.install(cores=args.cores)
+    system_info = fakes.load_plugin_module("system_info")
+    renderer_mod = fakes.load_plugin_module("kawaii_renderer")
+    # 关闭画面复用，各渲染阶段测的是完整绘制
+    renderer = renderer_mod.KawaiiStatusRenderer(reuse_size=0)
+
+    def bench(fn, setup=host.tick):
+        return measure(fn, args.iterations, args.warmup, setup=setup)
+
+    results = {}
+
+    collectors = {
+        "cpu": system_info.get_cpu_info,
+        "memory": system_info.get_memory_info,
+        "swap": system_info.get_swap_info,
+        "disk": system_info.get_disk_info,
+        "network": system_info.get_network_info,
+        "sockets": system_info.get_socket_info,
+        "gpu": system_info.get_gpu_info,
+        "system": system_info.get_system_info,
+    }
+    for name, collector in collectors.items():
+        results[f"collect.{name}"] = bench(collector)
+    results["collect.all"] = bench(system_info.get_all_status_info)
+
+    # 渲染各阶段使用固定输入，逐阶段拆开计时
+    status_info = system_info.get_all_status_info()
+    base_img = renderer.load_background()
+    layer = renderer.draw_layer(base_img.size, status_info)
+    final_img = renderer.composite(base_img, layer)
+
+    results["render.background"] = bench(renderer.load_background, setup=None)
+    results["render.draw"] = bench(
+        lambda: renderer.draw_layer(base_img.size, status_info), setup=None
+    )
+    results["render.composite"] = bench(
+        lambda: renderer.composite(base_img, layer), setup=None
+    )
+    results["render.encode"] = bench(lambda: renderer.encode(final_img), setup=None)
+    results["render.total"] = bench(lambda: renderer.render(status_info), setup=None)
+    results["render.plan"] = bench(lambda: renderer.plan(status_info), setup=None)
+
+    # 画面未变化时只需生成计划并查表
+    reuse_renderer = renderer_mod.KawaiiStatusRenderer()
+    reuse_renderer.render(status_info)
+    results["render.reuse_hit"] = bench(
+        lambda: reuse_renderer.render(status_info), setup=None
+    )
+
+    # 主题：由基础计划换色得到，背景经查找表重映射，不重新布局
+    themes = fakes.load_plugin_module("themes")
+    dark = themes.get_theme("dark")
+    base_plan = renderer.plan(status_info)
+    results["render.theme.recolor"] = bench(
+        lambda: renderer.themed(base_plan, dark), setup=None
+    )
+    results["render.theme.background"] = bench(
+        lambda: base_img.point(dark.background_lut()), setup=None
+    )
+
+    # 增量重绘：在两份状态之间交替合成画面，对比只变一个组件与全部组件都变化
+    host.tick()
+    changed_all = system_info.get_all_status_info()
+    changed_one = copy.deepcopy(status_info)
+    changed_one["cpu"].usage = (status_info["cpu"].usage + 37) % 100
+    full_renderer = renderer_mod.KawaiiStatusRenderer(reuse_size=0, incremental=False)
+    for label, other in (("one", changed_one), ("all", changed_all)):
+        plans = itertools.cycle([renderer.plan(status_info), renderer.plan(other)])
+        results[f"render.compose.full.{label}"] = bench(
+            lambda: full_renderer.compose(next(plans)), setup=None
+        )
+        incremental = renderer_mod.KawaiiStatusRenderer(reuse_size=0)
+        results[f"render.compose.incremental.{label}"] = bench(
+            lambda: incremental.compose(next(plans)), setup=None
+        )
+
+    # 热力图耗时应与核心数无关
+    for cores in (4, 32, 256):
+        per_core = [(i * 37) % 101 for i in range(cores)]
+        results[f"render.heatmap.{cores}"] = bench(
+            lambda: renderer.draw_core_heatmap(layer, per_core), setup=None
+        )
+
+    # 趋势线：抽取到像素宽度后耗时应与历史长度基本无关
+    history_mod = fakes.load_plugin_module("history")
+    rng = np.random.default_rng(0)
+    for samples in (300, 3600, 86400):
+        history = {
+            name: rng.uniform(0, 100, samples).astype(np.float32)
+            for name in ("cpu", "ram", "net_up", "net_down", "disk_io")
+        }
+        draw = ImageDraw.Draw(layer)
+        results[f"render.sparklines.{samples}"] = bench(
+            lambda: renderer.draw_sparklines(layer, draw, history), setup=None
+        )
+        results[f"decimate.{samples}"] = bench(
+            lambda: history_mod.decimate_minmax(history["cpu"], 150), setup=None
+        )
+
+    # 回放动画：300 个样本（2 秒间隔 10 分钟）的随机游走，抽取 60 帧
+    replay_mod = fakes.load_plugin_module("replay")
+    walk = {
+        name: np.clip(50 + rng.normal(0, 2, 300).cumsum(), 0, 100).astype(np.float32)
+        for name in ("cpu", "ram", "net_up", "net_down", "disk_io")
+    }
+    replay_info = dict(status_info, history=walk)
+    replay = replay_mod.ReplayRenderer()
+    results["render.replay.60"] = measure(
+        lambda: replay.render(renderer, replay_info, walk, 2.0, 0.0, 10),
+        max(1, args.iterations // 10),
+        warmup=1,
+    )
+
+    # 告警求值：每次采样的开销应随规则数线性增长，与运行时长无关
+    alerts_mod = fakes.load_plugin_module("alerts")
+    templates = ["cpu > 90 for 120", "disk > 95", "swap rising for 300", "ram < 5"]
+    for count in (4, 64):
+        engine = alerts_mod.AlertEngine(
+            [templates[i % len(templates)] for i in range(count)], lambda text: None
+        )
+        clock = iter(range(0, 10**9, 2))
+        metrics = {"cpu": 50.0, "ram": 40.0, "swap": 10.0, "disk": 60.0}
+        results[f"alerts.evaluate.{count}"] = bench(
+            lambda: engine.evaluate(metrics, now=next(clock)), setup=None
+        )
+
+    return finish(results, args, section=f"status[cores={args.cores}]")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
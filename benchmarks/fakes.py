@@ -0,0 +1,236 @@
+"""基准测试用的确定性假模块
+
+将 psutil、cpuinfo、pynvml、GPUtil 替换为可复现的假实现，
+并以包的形式加载插件模块（插件内部使用相对导入）。
+假 psutil 的 PROCFS_PATH 指向合成的 /proc，套接字统计不会读到本机的真实连接。
+"""
+
+import importlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import types
+from collections import Counter, namedtuple
+from pathlib import Path
+
+PLUGIN_DIR = Path(__file__).resolve().parent.parent
+PACKAGE_NAME = "astrbot_plugin_status"
+
+_svmem = namedtuple("svmem", "total available percent used free")
+_sswap = namedtuple("sswap", "total used free percent sin sout")
+_sdiskusage = namedtuple("sdiskusage", "total used free percent")
+_snetio = namedtuple(
+    "snetio",
+    "bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout",
+)
+_sdiskio = namedtuple("sdiskio", "read_count write_count read_bytes write_bytes")
+_scpufreq = namedtuple("scpufreq", "current min max")
+_shwtemp = namedtuple("shwtemp", "label current high critical")
+
+GB = 1024**3
+
+
+class FakeHost:
+    """可复现的主机状态，每次 tick 以固定种子推进"""
+
+    def __init__(self, cores: int = 8, seed: int = 42):
+        self.cores = cores
+        self.rng = random.Random(seed)
+        self.bytes_sent = 12 * GB
+        self.bytes_recv = 87 * GB
+        self.tick()
+
+    def tick(self):
+        """推进一次采样"""
+        rng = self.rng
+        self.per_core = [round(rng.uniform(0, 100), 1) for _ in range(self.cores)]
+        self.cpu_usage = round(sum(self.per_core) / self.cores, 1)
+        self.mem_used = rng.uniform(4, 28) * GB
+        self.swap_used = rng.uniform(0, 2) * GB
+        self.disk_used = rng.uniform(100, 400) * GB
+        self.bytes_sent += rng.randint(0, 50 * 1024**2)
+        self.bytes_recv += rng.randint(0, 200 * 1024**2)
+        self.gpu_usage = rng.randint(0, 100)
+        self.gpu_mem_used = int(rng.uniform(1, 20) * GB)
+
+
+def make_psutil(host: FakeHost) -> types.ModuleType:
+    """构造假 psutil 模块"""
+    mod = types.ModuleType("psutil")
+
+    def cpu_percent(interval=None, percpu=False):
+        return list(host.per_core) if percpu else host.cpu_usage
+
+    def cpu_freq(percpu=False):
+        return _scpufreq(3600.0, 800.0, 4800.0)
+
+    def cpu_count(logical=True):
+        return host.cores
+
+    def sensors_temperatures(fahrenheit=False):
+        return {"coretemp": [_shwtemp("Package id 0", 54.0, 90.0, 100.0)]}
+
+    def virtual_memory():
+        total = 32 * GB
+        used = int(host.mem_used)
+        return _svmem(total, total - used, round(used / total * 100, 1), used, 0)
+
+    def swap_memory():
+        total = 4 * GB
+        used = int(host.swap_used)
+        return _sswap(total, used, total - used, round(used / total * 100, 1), 0, 0)
+
+    def disk_usage(path):
+        total = 512 * GB
+        used = int(host.disk_used)
+        return _sdiskusage(total, used, total - used, round(used / total * 100, 1))
+
+    def net_io_counters(pernic=False):
+        return _snetio(host.bytes_sent, host.bytes_recv, 9_000_000, 31_000_000, 0, 0, 0, 0)
+
+    def disk_io_counters(perdisk=False):
+        return _sdiskio(1_200_000, 3_400_000, host.bytes_recv // 3, host.bytes_sent // 2)
+
+    def boot_time():
+        return 1_700_000_000.0
+
+    def pids():
+        return list(range(1, 412))
+
+    mod.cpu_percent = cpu_percent
+    mod.cpu_freq = cpu_freq
+    mod.cpu_count = cpu_count
+    mod.sensors_temperatures = sensors_temperatures
+    mod.virtual_memory = virtual_memory
+    mod.swap_memory = swap_memory
+    mod.disk_usage = disk_usage
+    mod.net_io_counters = net_io_counters
+    mod.disk_io_counters = disk_io_counters
+    mod.boot_time = boot_time
+    mod.pids = pids
+    return mod
+
+
+_TCP_HEADER = (
+    "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when"
+    " retrnsmt   uid  timeout inode\n"
+)
+_UDP_HEADER = (
+    "   sl  local_address rem_address   st tx_queue rx_queue tr tm->when"
+    " retrnsmt   uid  timeout inode ref pointer drops\n"
+)
+# 近似聊天机器人的连接分布：大量 ESTABLISHED / TIME_WAIT，少量监听
+_STATES = ["01"] * 50 + ["06"] * 35 + ["08"] * 5 + ["0A"] * 2 + ["02", "04", "09"]
+_PORTS = [443] * 60 + [80] * 15 + [5432] * 10 + [6379] * 10 + [8080] * 5
+
+
+def _socket_line(index: int, rng: random.Random, v6: bool, udp: bool) -> str:
+    width = 32 if v6 else 8
+    local = f"{rng.getrandbits(width * 4):0{width}X}"
+    remote = f"{rng.getrandbits(width * 4):0{width}X}"
+    if udp:
+        state, rport, lport = "07", 0, rng.randrange(1024, 65535)
+    else:
+        state = rng.choice(_STATES)
+        lport = 8080 if state == "0A" else rng.randrange(32768, 61000)
+        rport = 0 if state == "0A" else rng.choice(_PORTS)
+    if rport == 0:
+        remote = "0" * width
+    return (
+        f"{index:5d}: {local}:{lport:04X} {remote}:{rport:04X} {state}"
+        f" 00000000:00000000 00:00000000 00000000  1000        0 {100000 + index}"
+        " 1 0000000000000000 20 4 30 10 -1\n"
+    )
+
+
+def write_proc_net(root: Path, sockets: int, seed: int = 42) -> Counter:
+    """在 root/net 下生成内核格式的 tcp/tcp6/udp/udp6
+
+    合成套接字 TCP:UDP = 9:1，IPv4:IPv6 = 3:1，返回期望的 TCP 状态计数。
+    """
+    rng = random.Random(seed)
+    net = root / "net"
+    net.mkdir(parents=True, exist_ok=True)
+    files = {name: [] for name in ("tcp", "tcp6", "udp", "udp6")}
+    for index in range(sockets):
+        udp = index % 10 == 9
+        v6 = index % 4 == 3
+        name = ("udp" if udp else "tcp") + ("6" if v6 else "")
+        files[name].append(_socket_line(len(files[name]), rng, v6, udp))
+
+    expected: Counter = Counter()
+    for name, lines in files.items():
+        header = _UDP_HEADER if name.startswith("udp") else _TCP_HEADER
+        (net / name).write_text(header + "".join(lines), encoding="ascii")
+        if name.startswith("tcp"):
+            expected.update(line.split()[3] for line in lines)
+    return expected
+
+
+def make_proc_root(sockets: int = 1000, seed: int = 42) -> str:
+    """合成的 /proc（目前只含 net/ 下的套接字表），按参数复用临时目录中的同一份"""
+    root = Path(tempfile.gettempdir()) / f"astrbot_status_fake_proc_{sockets}_{seed}"
+    if not root.is_dir():
+        staging = Path(tempfile.mkdtemp(prefix=f"{root.name}_", dir=root.parent))
+        write_proc_net(staging, sockets, seed)
+        try:
+            os.rename(staging, root)
+        except OSError:
+            # 其他进程已生成同一份
+            shutil.rmtree(staging, ignore_errors=True)
+    return str(root)
+
+
+def make_cpuinfo() -> types.ModuleType:
+    """构造假 cpuinfo 模块"""
+    mod = types.ModuleType("cpuinfo")
+    info = {"brand_raw": "AMD Ryzen 9 7950X 16-Core Processor", "hz_actual": (4.5e9, 0)}
+    mod.get_cpu_info = lambda: dict(info)
+    return mod
+
+
+def make_pynvml(host: FakeHost) -> types.ModuleType:
+    """构造假 pynvml 模块"""
+    mod = types.ModuleType("pynvml")
+    mod.NVML_TEMPERATURE_GPU = 0
+    mod.nvmlInit = lambda: None
+    mod.nvmlDeviceGetHandleByIndex = lambda index: object()
+    mod.nvmlDeviceGetName = lambda handle: b"NVIDIA GeForce RTX 4090"
+    mod.nvmlDeviceGetUtilizationRates = lambda handle: types.SimpleNamespace(
+        gpu=host.gpu_usage, memory=0
+    )
+    mod.nvmlDeviceGetMemoryInfo = lambda handle: types.SimpleNamespace(
+        total=24 * GB, used=host.gpu_mem_used, free=24 * GB - host.gpu_mem_used
+    )
+    mod.nvmlDeviceGetTemperature = lambda handle, sensor: 61
+    return mod
+
+
+def make_gputil() -> types.ModuleType:
+    """构造假 GPUtil 模块（pynvml 存在时不会被用到）"""
+    mod = types.ModuleType("GPUtil")
+    mod.getGPUs = lambda: []
+    return mod
+
+
+def install(cores: int = 8, seed: int = 42, sockets: int = 1000) -> FakeHost:
+    """把假模块注入 sys.modules，返回驱动它们的 FakeHost"""
+    host = FakeHost(cores=cores, seed=seed)
+    psutil = make_psutil(host)
+    psutil.PROCFS_PATH = make_proc_root(sockets, seed)
+    sys.modules["psutil"] = psutil
+    sys.modules["cpuinfo"] = make_cpuinfo()
+    sys.modules["pynvml"] = make_pynvml(host)
+    sys.modules["GPUtil"] = make_gputil()
+    return host
+
+
+def load_plugin_module(name: str) -> types.ModuleType:
+    """以包形式导入插件子模块，例如 load_plugin_module("system_info")"""
+    if PACKAGE_NAME not in sys.modules:
+        package = types.ModuleType(PACKAGE_NAME)
+        package.__path__ = [str(PLUGIN_DIR)]
+        sys.modules[PACKAGE_NAME] = package
+    return importlib.import_module(f"{PACKAGE_NAME}.{name}")
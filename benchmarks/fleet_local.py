@@ -0,0 +1,153 @@
+"""本地多节点联调：以子进程启动若干 agent 并用聚合器接入
+
+    python benchmarks/fleet_local.py --agents 4
+
+每个 agent 使用不同种子的假 psutil，验证快照推送、心跳、过期判定与断线重连，
+全部检查通过时退出码为 0。
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import fakes
+
+
+def run_agent_child(argv):
+    """子进程入口：注入假模块后运行 agent"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cores", type=int, default=8)
+    args, rest = parser.parse_known_args(argv)
+    fakes.install(cores=args.cores, seed=args.seed)
+    agent = fakes.load_plugin_module("agent")
+    agent.main(rest)
+
+
+def spawn_agent(index: int, endpoint: str, interval: float, heartbeat: float):
+    return subprocess.Popen(
+        [
+            sys.executable,
+            __file__,
+            "agent",
+            "--seed",
+            str(index),
+            "--listen",
+            endpoint,
+            "--name",
+            f"node{index}",
+            "--interval",
+            str(interval),
+            "--heartbeat",
+            str(heartbeat),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_until(predicate, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(0.05)
+    return predicate()
+
+
+async def check_ready(fleet) -> list:
+    """等待所有节点上报首个快照并核对内容"""
+    failures = []
+    started = time.monotonic()
+    ok = await wait_until(
+        lambda: all(s.status_info is not None for s in fleet.states()), 15
+    )
+    if not ok:
+        failures.append("部分节点未在 15 秒内上报快照")
+    else:
+        elapsed = time.monotonic() - started
+        print(f"全部 {len(fleet.states())} 个节点就绪，用时 {elapsed:.2f}s")
+
+    for state in fleet.states():
+        if state.status_info and state.remote_name != state.name:
+            failures.append(f"{state.name}: HELLO 名称不符 ({state.remote_name})")
+    sizes = [s.snapshot_bytes for s in fleet.states() if s.snapshot_bytes]
+    if sizes:
+        print(f"快照大小: {min(sizes)}-{max(sizes)} 字节")
+
+    print(fleet.format_overview())
+    return failures
+
+
+async def main_async(args) -> int:
+    tmpdir = tempfile.TemporaryDirectory()
+    if args.transport == "unix":
+        endpoints = [
+            f"unix://{Path(tmpdir.name) / f'agent{i}.sock'}" for i in range(args.agents)
+        ]
+    else:
+        endpoints = [f"tcp://127.0.0.1:{args.base_port + i}" for i in range(args.agents)]
+
+    procs = [
+        spawn_agent(i, endpoint, args.interval, args.heartbeat)
+        for i, endpoint in enumerate(endpoints)
+    ]
+    fleet_mod = fakes.load_plugin_module("fleet")
+    nodes = {f"node{i}": endpoint for i, endpoint in enumerate(endpoints)}
+    fleet = fleet_mod.FleetAggregator(nodes, stale_after=args.stale)
+    fleet.start()
+    try:
+        failures = await check_ready(fleet)
+
+        # 终止一个 agent，确认聚合器将其标记为过期
+        victim = procs[0]
+        victim.terminate()
+        victim.wait()
+        state = fleet.get("node0")
+        ok = await wait_until(lambda: state.is_stale(args.stale), args.stale + 5)
+        if ok:
+            print("node0 已被标记为过期")
+        else:
+            failures.append("node0 终止后未被标记为过期")
+
+        # 重新启动后应自动重连并恢复
+        procs[0] = spawn_agent(0, endpoints[0], args.interval, args.heartbeat)
+        ok = await wait_until(lambda: not state.is_stale(args.stale), 45)
+        if ok:
+            print(f"node0 重连成功 (重连次数 {state.reconnects})")
+        else:
+            failures.append("node0 重启后未恢复")
+
+        for line in failures:
+            print(f"失败: {line}")
+        return 1 if failures else 0
+    finally:
+        await fleet.stop()
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait()
+        tmpdir.cleanup()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=3)
+    parser.add_argument("--transport", choices=["unix", "tcp"], default="unix")
+    parser.add_argument("--base-port", type=int, default=19477)
+    parser.add_argument("--interval", type=float, default=0.5)
+    parser.add_argument("--heartbeat", type=float, default=0.2)
+    parser.add_argument("--stale", type=float, default=1.5)
+    args = parser.parse_args(argv)
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "agent":
+        run_agent_child(sys.argv[2:])
+    else:
+        sys.exit(main())
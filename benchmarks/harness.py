@@ -0,0 +1,177 @@
+"""基准测试通用工具：计时、分配统计、基线对比"""
+
+import argparse
+import gc
+import json
+import math
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """最近秩法百分位"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def measure(
+    fn: Callable[[], object],
+    iterations: int,
+    warmup: int = 3,
+    setup: Optional[Callable[[], None]] = None,
+) -> Dict[str, float]:
+    """对 fn 计时并单独一轮统计内存分配
+
+    setup 在每次调用前执行且不计入耗时，用于推进假数据等。
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            if setup:
+                setup()
+            start = time.perf_counter_ns()
+            fn()
+            samples.append((time.perf_counter_ns() - start) / 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    # 分配统计单独执行，避免 tracemalloc 的开销污染计时
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "mean_ms": statistics.fmean(samples),
+        "alloc_peak_kb": (peak - before) / 1024,
+        "alloc_retained_kb": (after - before) / 1024,
+    }
+
+
+def print_table(results: Dict[str, Dict[str, float]], file=sys.stdout):
+    """打印结果表格"""
+    header = f"{'stage':<28}{'p50 ms':>10}{'p95 ms':>10}{'peak KiB':>12}{'kept KiB':>11}"
+    print(header, file=file)
+    print("-" * len(header), file=file)
+    for name, row in results.items():
+        print(
+            f"{name:<28}{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}"
+            f"{row['alloc_peak_kb']:>12.1f}{row['alloc_retained_kb']:>11.1f}",
+            file=file,
+        )
+
+
+def compare_baseline(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+    floor_ms: float,
+) -> List[str]:
+    """返回超过基线的阶段描述
+
+    以 p50 为准；允许 tolerance 的相对波动，并对亚毫秒阶段给出 floor_ms 的绝对余量。
+    """
+    regressions = []
+    for name, row in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        limit = base["p50_ms"] * (1 + tolerance) + floor_ms
+        if row["p50_ms"] > limit:
+            regressions.append(
+                f"{name}: p50 {row['p50_ms']:.3f}ms > {limit:.3f}ms "
+                f"(baseline {base['p50_ms']:.3f}ms)"
+            )
+    return regressions
+
+
+def add_common_arguments(parser: argparse.ArgumentParser, iterations: int = 30):
+    """添加各基准脚本共用的命令行参数"""
+    parser.add_argument("--iterations", type=int, default=iterations)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="与该基线文件对比，缺少对应分区或出现退化时退出码为 1",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help=f"把本次结果写入基线文件（默认 {DEFAULT_BASELINE.name}）",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="允许的 p50 相对退化比例"
+    )
+    parser.add_argument(
+        "--floor-ms", type=float, default=0.05, help="对比时的绝对余量（毫秒）"
+    )
+    parser.add_argument("--json", type=Path, help="把结果另存为 JSON")
+
+
+def finish(results: Dict[str, Dict[str, float]], args, section: str) -> int:
+    """输出结果、读写基线，返回进程退出码
+
+    基线文件按 section 分区，不同基准脚本共用同一个文件。
+    只有显式传入 --baseline 时才做对比；此时找不到基线也视为失败，
+    避免门禁因缺少基线而静默通过。
+    """
+    print_table(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    path = args.baseline or DEFAULT_BASELINE
+    stored = {}
+    if path.exists():
+        stored = json.loads(path.read_text(encoding="utf-8"))
+
+    if args.save_baseline:
+        stored[section] = results
+        path.write_text(json.dumps(stored, indent=2), encoding="utf-8")
+        print(f"\n基线已写入 {path} [{section}]")
+        return 0
+
+    if args.baseline is None:
+        print("\n未指定 --baseline，跳过基线对比")
+        return 0
+
+    if section not in stored:
+        print(f"\n{path} 中没有基线 [{section}]，先用 --save-baseline 生成")
+        return 1
+
+    regressions = compare_baseline(
+        results, stored[section], args.tolerance, args.floor_ms
+    )
+    if regressions:
+        print("\n性能退化:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print("\n所有阶段均在基线范围内")
+    return 0
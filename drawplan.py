@@ -0,0 +1,239 @@
+"""绘制计划
+
+渲染分两步：先把所有绘制调用记录为 DrawPlan（只计算要画的字符串、角度和小块像素，
+不碰整张画布），再回放到真实图层上。同一计划必然产生同一张图片，
+因此计划的指纹可以作为已编码图片的内容地址。
+
+每个绘制调用以"类型 + 位置"标识，对比前后两份计划即可得到内容变化的调用，
+其新旧覆盖范围的并集就是需要重绘的脏区域。
+"""
+
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageDraw
+
+Box = Tuple[int, int, int, int]
+
+
+class DrawOp(NamedTuple):
+    """一次绘制调用"""
+
+    name: str
+    args: tuple
+    kwargs: dict
+    ident: str  # 内容标识，相同即绘制结果相同
+
+
+def quantize(value: float, step: float) -> float:
+    """按 step 取整（step 不大于 0 时原样返回），易抖动的数值先取整再记录到计划"""
+    if step <= 0:
+        return value
+    return round(value / step) * step
+
+
+def _union(a: Box, b: Box) -> Box:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class DrawPlan:
+    """记录 ImageDraw / Image.paste 调用的替身
+
+    同时充当 draw（text / arc / ellipse）与 img（paste）传给各绘制函数。
+    arc_step 大于 0 时弧线角度按该步长取整，数值微小变化不会产生新的画面。
+    """
+
+    def __init__(self, arc_step: float = 0.0):
+        self.arc_step = arc_step
+        self.ops: List[DrawOp] = []
+        self._digest = hashlib.blake2b(digest_size=16)
+        self._extents: Dict[int, Box] = {}
+
+    def _record(self, name: str, args: tuple, kwargs: dict, key: Any = None):
+        ident = repr((name, args if key is None else key, kwargs))
+        self.ops.append(DrawOp(name, args, kwargs, ident))
+        self._digest.update(ident.encode())
+
+    def text(self, xy, text, **kwargs):
+        self._record("text", (xy, text), kwargs)
+
+    def ellipse(self, xy, **kwargs):
+        self._record("ellipse", (xy,), kwargs)
+
+    def arc(self, xy, start, end, **kwargs):
+        start = quantize(start, self.arc_step)
+        end = quantize(end, self.arc_step)
+        self._record("arc", (xy, start, end), kwargs)
+
+    def paste(self, image: Image.Image, xy):
+        # 像素块按内容参与指纹
+        key = (image.mode, image.size, hashlib.blake2b(image.tobytes()).digest(), xy)
+        self._record("paste", (image, xy), {}, key=key)
+
+    def recolor(
+        self,
+        fill: Callable[[Any], Any],
+        image: Callable[[Image.Image], Image.Image],
+    ) -> "DrawPlan":
+        """逐项换色得到新计划：fill 处理 fill / outline 参数，image 处理像素块
+
+        位置与形状不变，已计算的覆盖范围直接沿用。
+        """
+        plan = DrawPlan(self.arc_step)
+        for name, args, kwargs, _ in self.ops:
+            if name == "paste":
+                plan.paste(image(args[0]), args[1])
+                continue
+            kwargs = {
+                key: fill(value) if key in ("fill", "outline") else value
+                for key, value in kwargs.items()
+            }
+            plan._record(name, args, kwargs)
+        plan._extents = dict(self._extents)
+        return plan
+
+    def fingerprint(self) -> bytes:
+        """计划内容的摘要"""
+        return self._digest.digest()
+
+    def replay(
+        self,
+        img: Image.Image,
+        ops: Optional[List[DrawOp]] = None,
+        offset: Tuple[int, int] = (0, 0),
+    ):
+        """把记录的调用按顺序绘制到图层上，offset 为图层左上角在整张画布中的坐标"""
+        draw = ImageDraw.Draw(img)
+        dx, dy = offset
+        for name, args, kwargs, _ in self.ops if ops is None else ops:
+            if name == "paste":
+                image, (x, y) = args
+                img.paste(image, (x - dx, y - dy))
+            elif name == "text":
+                (x, y), text = args
+                draw.text((x - dx, y - dy), text, **kwargs)
+            else:
+                (x0, y0, x1, y1), *rest = args
+                box = (x0 - dx, y0 - dy, x1 - dx, y1 - dy)
+                getattr(draw, name)(box, *rest, **kwargs)
+
+    def extent(self, index: int) -> Box:
+        """第 index 个调用可能改动的像素范围（按需计算并缓存）"""
+        box = self._extents.get(index)
+        if box is None:
+            name, args, kwargs, _ = self.ops[index]
+            if name == "text":
+                (x, y), text = args
+                font = kwargs["font"]
+                try:
+                    bbox = font.getbbox(text, anchor=kwargs.get("anchor"))
+                except TypeError:
+                    # 位图字体不支持 anchor
+                    bbox = font.getbbox(text)
+                left, top, right, bottom = bbox
+                box = (
+                    int(x + left) - 2,
+                    int(y + top) - 2,
+                    int(x + right) + 2,
+                    int(y + bottom) + 2,
+                )
+            elif name == "paste":
+                image, (x, y) = args
+                box = (x, y, x + image.width, y + image.height)
+            else:
+                x0, y0, x1, y1 = args[0]
+                box = (int(x0) - 1, int(y0) - 1, int(x1) + 2, int(y1) + 2)
+            self._extents[index] = box
+        return box
+
+    def _keyed(self) -> Dict[tuple, int]:
+        """以 (类型, 位置, 同位置序号) 标识每个调用"""
+        keyed = {}
+        seen: Counter = Counter()
+        for index, op in enumerate(self.ops):
+            position = op.args[1] if op.name == "paste" else op.args[0]
+            key = (op.name, position)
+            keyed[key + (seen[key],)] = index
+            seen[key] += 1
+        return keyed
+
+    def dirty_regions(self, previous: "DrawPlan") -> List[Box]:
+        """相对上一份计划发生变化的区域（新旧覆盖范围的并集，相交区域已合并）"""
+        current, old = self._keyed(), previous._keyed()
+        regions: List[Box] = []
+        for key in current.keys() | old.keys():
+            index, old_index = current.get(key), old.get(key)
+            if index is not None and old_index is not None:
+                if self.ops[index].ident == previous.ops[old_index].ident:
+                    continue
+                box = _union(self.extent(index), previous.extent(old_index))
+            elif index is not None:
+                box = self.extent(index)
+            else:
+                box = previous.extent(old_index)
+            regions.append(box)
+
+        # 合并相交的区域，避免重叠部分重复绘制
+        merged: List[Box] = []
+        for box in regions:
+            while True:
+                for other in merged:
+                    if _intersects(box, other):
+                        merged.remove(other)
+                        box = _union(box, other)
+                        break
+                else:
+                    break
+            merged.append(box)
+        return merged
+
+    def ops_within(self, box: Box) -> List[DrawOp]:
+        """覆盖范围与 box 相交的调用（保持原顺序）"""
+        return [
+            op
+            for index, op in enumerate(self.ops)
+            if _intersects(self.extent(index), box)
+        ]
+
+
+class EncodedCache:
+    """指纹 -> 已编码图片字节的小型 LRU
+
+    事件循环与推送、回放等工作线程会同时访问，读写都在锁内完成。
+    """
+
+    def __init__(self, size: int = 8):
+        self.size = size
+        self.entries: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: bytes) -> Optional[bytes]:
+        with self._lock:
+            data = self.entries.get(fingerprint)
+            if data is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(fingerprint)
+            self.hits += 1
+            return data
+
+    def put(self, fingerprint: bytes, data: bytes):
+        if self.size <= 0:
+            return
+        with self._lock:
+            self.entries[fingerprint] = data
+            self.entries.move_to_end(fingerprint)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
@@ -0,0 +1,200 @@
+"""多节点状态聚合模块
+
+为每个 agent 维护一条常驻连接（连接池按节点名复用），
+接收推送的快照与心跳，并跟踪每个节点的数据新鲜度。
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .snapshot import (
+    FRAME_HEARTBEAT,
+    FRAME_HELLO,
+    FRAME_SNAPSHOT,
+    decode_snapshot,
+    open_endpoint,
+    parse_endpoint,
+    read_frame,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NodeState:
+    """单个节点的最新状态"""
+
+    name: str
+    endpoint: str
+    connected: bool = False
+    remote_name: str = ""
+    status_info: Optional[Dict] = None
+    collected_at: float = 0.0  # agent 侧采集时间
+    last_seen: float = 0.0  # 最近一次收到任意帧的本地单调时间
+    snapshot_bytes: int = 0
+    reconnects: int = 0
+    last_error: str = ""
+    _received_at: float = field(default=0.0, repr=False)
+
+    def age(self) -> Optional[float]:
+        """距最近一次快照的秒数，没有快照时为 None"""
+        if not self._received_at:
+            return None
+        return time.monotonic() - self._received_at
+
+    def is_stale(self, stale_after: float) -> bool:
+        """连接断开、从未收到快照、或超过 stale_after 秒没有新快照
+
+        心跳只说明连接存活，不刷新数据的新鲜度。
+        """
+        if not self.connected or self.status_info is None:
+            return True
+        return time.monotonic() - self._received_at > stale_after
+
+
+class NodeConnection:
+    """到单个 agent 的常驻连接，断开后指数退避重连"""
+
+    def __init__(self, state: NodeState, stale_after: float, connect_timeout: float):
+        self.state = state
+        self.stale_after = stale_after
+        self.connect_timeout = connect_timeout
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self.task = None
+
+    async def run(self):
+        backoff = 1.0
+        while True:
+            try:
+                await self._session()
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except (OSError, asyncio.TimeoutError, ValueError) as e:
+                # ValueError 含 SnapshotError 与无效的地址
+                self.state.last_error = str(e) or type(e).__name__
+            except asyncio.IncompleteReadError:
+                self.state.last_error = "连接被关闭"
+            finally:
+                self.state.connected = False
+            self.state.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _session(self):
+        reader, writer = await asyncio.wait_for(
+            open_endpoint(self.state.endpoint), timeout=self.connect_timeout
+        )
+        self.state.connected = True
+        self.state.last_error = ""
+        try:
+            while True:
+                # 超过两倍过期时间仍无心跳，视为连接已死
+                frame_type, payload = await asyncio.wait_for(
+                    read_frame(reader), timeout=self.stale_after * 2
+                )
+                now = time.monotonic()
+                self.state.last_seen = now
+                if frame_type == FRAME_SNAPSHOT:
+                    collected_at, status_info = decode_snapshot(payload)
+                    self.state.status_info = status_info
+                    self.state.collected_at = collected_at
+                    self.state.snapshot_bytes = len(payload)
+                    self.state._received_at = now
+                elif frame_type == FRAME_HELLO:
+                    _, _, remote_name = payload.decode("utf-8", "replace").partition("|")
+                    self.state.remote_name = remote_name
+                elif frame_type != FRAME_HEARTBEAT:
+                    logger.debug(f"忽略未知帧类型 {frame_type}")
+        finally:
+            writer.close()
+
+
+class FleetAggregator:
+    """汇总多个 agent 的状态"""
+
+    def __init__(
+        self,
+        nodes: Dict[str, str],
+        stale_after: float = 30.0,
+        connect_timeout: float = 5.0,
+    ):
+        self.stale_after = stale_after
+        self.connections: Dict[str, NodeConnection] = {
+            name: NodeConnection(NodeState(name, endpoint), stale_after, connect_timeout)
+            for name, endpoint in nodes.items()
+        }
+
+    @staticmethod
+    def parse_nodes(entries: List[str]) -> Dict[str, str]:
+        """解析配置项 ["name=tcp://host:port", ...]，地址无效的条目记录日志后忽略"""
+        nodes = {}
+        for entry in entries or []:
+            name, sep, endpoint = str(entry).partition("=")
+            if not sep or not name.strip() or not endpoint.strip():
+                logger.warning(f"忽略无效的节点配置: {entry}")
+                continue
+            try:
+                parse_endpoint(endpoint.strip())
+            except ValueError as e:
+                logger.warning(f"忽略节点 {name.strip()}: {e}")
+                continue
+            nodes[name.strip()] = endpoint.strip()
+        return nodes
+
+    def start(self):
+        """为所有节点建立连接（需在事件循环中调用）"""
+        for connection in self.connections.values():
+            connection.start()
+
+    async def stop(self):
+        await asyncio.gather(*(c.stop() for c in self.connections.values()))
+
+    def names(self) -> List[str]:
+        return list(self.connections)
+
+    def get(self, name: str) -> Optional[NodeState]:
+        connection = self.connections.get(name)
+        return connection.state if connection else None
+
+    def states(self) -> List[NodeState]:
+        return [c.state for c in self.connections.values()]
+
+    def format_overview(self) -> str:
+        """生成节点总览文本"""
+        if not self.connections:
+            return "🌐 未配置任何节点"
+
+        lines = [f"🌐 节点总览 ({len(self.connections)} 个)"]
+        for state in self.states():
+            info = state.status_info
+            if info is None:
+                reason = state.last_error or "等待数据"
+                lines.append(f"⚫ {state.name}: 离线 ({reason})")
+                continue
+
+            icon = "🟡" if state.is_stale(self.stale_after) else "🟢"
+            cpu = info["cpu"].usage
+            mem = info["memory"].usage
+            disk = info["disk"].usage
+            age = state.age() or 0.0
+            lines.append(
+                f"{icon} {state.name}: CPU {cpu:.0f}% | RAM {mem:.0f}% | "
+                f"DISK {disk:.0f}% | {age:.0f}s 前"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,104 @@
+"""指标历史与趋势线模块
+
+MetricHistory 为定长环形缓冲区，追加为 O(1)；
+趋势线按像素宽度做向量化的 min/max 抽取后直接栅格化为 RGBA 数组。
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class MetricHistory:
+    """定长环形缓冲区"""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._buffer = np.zeros(self.capacity, dtype=np.float32)
+        self._index = 0
+        self._count = 0
+
+    def append(self, value: float):
+        """追加一个样本，满了覆盖最旧的样本"""
+        self._buffer[self._index] = value
+        self._index = (self._index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def values(self) -> np.ndarray:
+        """按时间顺序返回样本副本"""
+        if self._count < self.capacity:
+            return self._buffer[: self._count].copy()
+        return np.concatenate(
+            (self._buffer[self._index :], self._buffer[: self._index])
+        )
+
+    def last(self, default: float = 0.0) -> float:
+        """最近一个样本"""
+        if not self._count:
+            return default
+        return float(self._buffer[self._index - 1])
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def decimate_minmax(values: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """把样本抽取到不超过 width 列，每列保留区间内的最小值与最大值
+
+    样本数不超过 width 时原样返回，保证尖峰不会因抽取而丢失。
+    """
+    values = np.asarray(values, dtype=np.float32)
+    if len(values) <= width:
+        return values, values
+    edges = np.linspace(0, len(values), width + 1).astype(np.intp)[:-1]
+    return np.minimum.reduceat(values, edges), np.maximum.reduceat(values, edges)
+
+
+def rasterize_sparkline(
+    values: np.ndarray,
+    width: int,
+    height: int,
+    color: Tuple[int, int, int, int],
+    value_range: Optional[Tuple[float, float]] = None,
+    fill_alpha: int = 48,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """把样本栅格化为 height x width 的 RGBA 数组
+
+    每列绘制该列 min-max 的竖线，并与相邻列的区间相连，线下方为半透明填充。
+    样本不足 width 时靠右对齐。传入 out 时叠加到已有数组上（用于多条线）。
+    """
+    if out is None:
+        out = np.zeros((height, width, 4), dtype=np.uint8)
+    mins, maxs = decimate_minmax(values, width)
+    columns = len(mins)
+    if not columns:
+        return out
+
+    low, high = value_range if value_range else (0.0, float(maxs.max()))
+    span = high - low if high > low else 1.0
+    scale = (height - 1) / span
+    # 像素坐标向下增长：最大值对应上沿
+    top = ((high - np.clip(maxs, low, high)) * scale).round().astype(np.intp)
+    bottom = ((high - np.clip(mins, low, high)) * scale).round().astype(np.intp)
+
+    # 与前一列的区间相连，避免陡峭变化处出现断线
+    if columns > 1:
+        prev_top, prev_bottom = top[:-1].copy(), bottom[:-1].copy()
+        top[1:] = np.minimum(top[1:], prev_bottom)
+        bottom[1:] = np.maximum(bottom[1:], prev_top)
+
+    rows = np.arange(height, dtype=np.intp)[:, None]
+    line = (rows >= top) & (rows <= bottom)
+    fill = rows > bottom
+
+    target = out[:, width - columns :]
+    rgb = np.asarray(color[:3], dtype=np.uint8)
+    if fill_alpha:
+        area = fill & (target[..., 3] < fill_alpha)
+        target[area, :3] = rgb
+        target[area, 3] = fill_alpha
+    target[line, :3] = rgb
+    target[line, 3] = color[3]
+    return out
@@ -0,0 +1,107 @@
+"""按内容寻址的图片文件存储
+
+渲染结果以内容摘要命名写入一次，之后重复发送同一张图片都复用这个文件，
+适配器直接读取文件，不必在 Python 中反复 base64 编码或落盘临时文件。
+默认放在 tmpfs (/dev/shm) 上，总大小超过上限时按最近使用顺序淘汰。
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_SUBDIR = "astrbot_plugin_status"
+
+
+def default_store_dir() -> Path:
+    """优先使用 tmpfs，不可用时退回系统临时目录"""
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm / DEFAULT_SUBDIR
+    return Path(tempfile.gettempdir()) / DEFAULT_SUBDIR
+
+
+class ImageStore:
+    """容量受限的内容寻址图片文件存储"""
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: int = 64 * 1024**2):
+        self.root = Path(root) if root else default_store_dir()
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.files: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        self.writes = 0
+        self.reuses = 0
+        self._lock = threading.Lock()
+        self._adopt_existing()
+
+    def _adopt_existing(self):
+        """接管上次运行留下的文件，按修改时间排入 LRU"""
+        entries = []
+        for path in self.root.glob("*.png"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self.files[name] = size
+            self.total_bytes += size
+        self._evict()
+
+    def put(self, data: bytes, suffix: str = ".png") -> Path:
+        """写入（或复用）图片文件并返回路径"""
+        name = hashlib.blake2b(data, digest_size=16).hexdigest() + suffix
+        path = self.root / name
+        with self._lock:
+            if name in self.files and path.exists():
+                self.files.move_to_end(name)
+                self.reuses += 1
+                return path
+
+            # 先写临时文件再原子替换，发送方不会读到写了一半的文件
+            fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+
+            self.total_bytes -= self.files.pop(name, 0)
+            self.files[name] = len(data)
+            self.total_bytes += len(data)
+            self.writes += 1
+            self._evict(keep=name)
+        return path
+
+    def _evict(self, keep: Optional[str] = None):
+        while self.total_bytes > self.max_bytes and self.files:
+            name, size = next(iter(self.files.items()))
+            if name == keep:
+                break
+            del self.files[name]
+            self.total_bytes -= size
+            (self.root / name).unlink(missing_ok=True)
+
+    def format_report(self) -> str:
+        """文件写入与复用统计"""
+        return (
+            f"🗂️ 图片文件: 写入 {self.writes} 次，复用 {self.reuses} 次，"
+            f"现有 {len(self.files)} 个 ({self.total_bytes / 1024**2:.1f}MB"
+            f" / {self.max_bytes / 1024**2:.0f}MB)"
+        )
+
+    def clear(self) -> int:
+        """删除全部文件，返回删除数量"""
+        with self._lock:
+            count = len(self.files)
+            for name in self.files:
+                (self.root / name).unlink(missing_ok=True)
+            self.files.clear()
+            self.total_bytes = 0
+        return count
@@ -0,0 +1,105 @@
+"""AstrBot 版本与插件清单
+
+优先读取 AstrBot 通过 Context 暴露的已加载插件注册表；
+拿不到注册表时退回到扫描插件目录，扫描结果按目录 mtime 缓存，
+目录下增删插件会更新 mtime 使缓存失效。
+
+加载失败的插件数量只能从 AstrBot 的内部属性 _star_manager.failed_plugin_dict 读取，
+该属性不是公开接口，缺失时失败数量记为未知，只记录一次日志。
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .system_info import AstrBotInfo
+
+logger = logging.getLogger(__name__)
+
+
+def get_astrbot_version() -> str:
+    """运行中的 AstrBot 版本号，无法获取时返回空字符串"""
+    try:
+        from astrbot.core.config.default import VERSION
+
+        return str(VERSION)
+    except Exception:
+        return ""
+
+
+class PluginInventory:
+    """带缓存的插件数量统计"""
+
+    def __init__(self, context=None, plugins_dir: Optional[Path] = None):
+        self.context = context
+        self.plugins_dir = plugins_dir or Path(__file__).resolve().parent.parent
+        self.version = get_astrbot_version()
+        self._scan_mtime: Optional[int] = None
+        self._scan_count = 0
+        self._failed_unavailable_logged = False
+
+    def snapshot(self) -> AstrBotInfo:
+        """当前版本与插件加载情况"""
+        counts = self._from_registry()
+        if counts is None:
+            counts = (self._scan_directory(), None)
+        loaded, failed = counts
+        return AstrBotInfo(
+            version=self.version, plugins_loaded=loaded, plugins_failed=failed
+        )
+
+    def _from_registry(self) -> Optional[Tuple[int, Optional[int]]]:
+        """从 AstrBot 的插件注册表统计 (已加载, 加载失败)，不可用时返回 None"""
+        if self.context is None:
+            return None
+        try:
+            stars = self.context.get_all_stars()
+        except Exception:
+            return None
+
+        # 排除 AstrBot 内置插件，与插件目录的口径保持一致
+        loaded = sum(
+            1
+            for star in stars
+            if getattr(star, "activated", True) and not getattr(star, "reserved", False)
+        )
+        return loaded, self._failed_count()
+
+    def _failed_count(self) -> Optional[int]:
+        """加载失败的插件数量，AstrBot 未提供时返回 None"""
+        manager = getattr(self.context, "_star_manager", None)
+        failed = getattr(manager, "failed_plugin_dict", None)
+        if isinstance(failed, dict):
+            return len(failed)
+        if not self._failed_unavailable_logged:
+            self._failed_unavailable_logged = True
+            logger.info("当前 AstrBot 版本未提供加载失败的插件列表，不显示失败数量")
+        return None
+
+    def _scan_directory(self) -> int:
+        """扫描插件目录，目录 mtime 未变化时直接返回上次的结果"""
+        try:
+            mtime = os.stat(self.plugins_dir).st_mtime_ns
+        except OSError:
+            return 0
+        if mtime == self._scan_mtime:
+            return self._scan_count
+
+        count = 0
+        try:
+            with os.scandir(self.plugins_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith((".", "__")) or not entry.is_dir():
+                        continue
+                    # 检查是否包含main.py或__init__.py
+                    if os.path.exists(
+                        os.path.join(entry.path, "main.py")
+                    ) or os.path.exists(os.path.join(entry.path, "__init__.py")):
+                        count += 1
+        except OSError:
+            return 0
+
+        self._scan_mtime = mtime
+        self._scan_count = count
+        return count
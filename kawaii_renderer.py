@@ -1,27 +1,78 @@
 """Kawaii Status 渲染器"""
 
 import io
+import math
+import threading
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
-import cpuinfo
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+from .drawplan import Box, DrawPlan, EncodedCache, quantize
+from .history import rasterize_sparkline
+from .perf import NULL_TRACE
 from .system_info import (
+    AstrBotInfo,
+    BotInfo,
     CPUInfo,
     DiskInfo,
     GPUInfo,
     MemoryInfo,
     NetworkInfo,
+    SocketInfo,
     SwapInfo,
     SystemInfo,
 )
+from .themes import DEFAULT_THEME, ROLES, Recolor, Theme, get_theme
+
+
+# 上一帧画面、其绘制计划、相对更早一帧重绘过的区域（None 表示整帧重绘）
+FrameState = Tuple[Image.Image, DrawPlan, Optional[List[Box]]]
+
+# 易抖动的数值在记录到计划前取整，相邻两次采样的细微波动不产生新画面，
+# 画面指纹不变即可直接复用已编码的图片
+HEATMAP_STEP = 5.0  # 热力图每格颜色的档位（%）
+SPARKLINE_LEVELS = 16  # 趋势线纵轴档位数
+
+
+def nice_ceil(value: float) -> float:
+    """向上取到 1 / 2 / 5 x 10^n，自动缩放的纵轴不随峰值的细微变化而改变"""
+    if value <= 0:
+        return 1.0
+    magnitude = 10 ** math.floor(math.log10(value))
+    for factor in (1, 2, 5):
+        if value <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def format_ms(value: float) -> str:
+    """毫秒取整显示，不足 1ms 显示为 <1ms"""
+    return "<1ms" if value < 1 else f"{value:.0f}ms"
 
 
 class KawaiiStatusRenderer:
     """Kawaii Status 渲染器"""
 
-    def __init__(self):
+    # 背景图中预先画好的标题（CPU / System / Version / Plugins）与虚线框：
+    # 以基础主题的 details 颜色画在该纸色上，其他主题按 details 角色重新着色
+    heading_box: Box = (100, 1350, 980, 1610)
+    heading_paper = (238, 237, 236)
+
+    def __init__(
+        self, arc_step: float = 0.0, reuse_size: int = 8, incremental: bool = True
+    ):
+        # arc_step: 弧线角度取整步长 (度)；reuse_size: 按画面指纹复用的已编码图片数
+        # incremental: 保留上一帧，只重绘内容变化的区域
+        self.arc_step = arc_step
+        self.encoded = EncodedCache(reuse_size)
+        self.incremental = incremental
+        # 以下按主题名分别缓存：背景、上一帧状态（见 compose）、换色映射
+        self._backgrounds: Dict[str, Image.Image] = {}
+        self._frames: Dict[str, FrameState] = {}
+        self._recolors: Dict[str, Recolor] = {}
+        self._frame_lock = threading.Lock()
         self.setup_paths()
         self.setup_colors()
         self.setup_fonts()
@@ -38,19 +89,60 @@ class KawaiiStatusRenderer:
         self.adlam_font_path = self.resources_dir / "fonts" / "ADLaMDisplay-Regular.ttf"
 
     def setup_colors(self):
-        """设置颜色"""
-        # 原项目的颜色配置 (RGBA)
-        self.cpu_color = (84, 173, 255, 255)
-        self.ram_color = (255, 179, 204, 255)
-        self.swap_color = (251, 170, 147, 255)
-        self.disk_color = (184, 170, 159, 255)
-        # 新增的颜色配置
-        self.gpu_color = (144, 238, 144, 255)  # 浅绿色
-        self.network_upload_color = (255, 165, 0, 255)  # 橙色
-        self.network_download_color = (135, 206, 235, 255)  # 天蓝色
+        """设置颜色
+
+        绘制计划始终使用基础主题的颜色，其他主题在计划生成后换色（见 themed）。
+        """
+        self.base_theme = get_theme(DEFAULT_THEME)
+        for role in ROLES:
+            setattr(self, f"{role}_color", self.base_theme.palette[role])
         self.transparent_color = (0, 0, 0, 0)
-        self.details_color = (184, 170, 159, 255)
-        self.nickname_color = (84, 173, 255, 255)
+        self.heatmap_lut = self.build_heatmap_lut(self.base_theme)
+
+    @staticmethod
+    def build_heatmap_lut(theme: Theme) -> np.ndarray:
+        """每核热力图：0-100% 映射到 256 级颜色查找表，最后一项为空格子（透明）"""
+        palette = theme.palette
+        stops = np.array([0, 40, 70, 100]) * 2.55
+        stop_colors = np.array(
+            [
+                palette["cpu"],
+                palette["gpu"],
+                palette["network_upload"],
+                palette["hot"],
+            ],
+            dtype=np.float64,
+        )
+        levels = np.arange(256)
+        lut = np.zeros((257, 4), dtype=np.uint8)
+        for channel in range(4):
+            lut[:256, channel] = np.interp(
+                levels, stops, stop_colors[:, channel]
+            ).round()
+        return lut
+
+    def recolor(self, theme: Theme) -> Recolor:
+        """基础主题到 theme 的换色映射（含热力图各级颜色）"""
+        recolor = self._recolors.get(theme.name)
+        if recolor is None:
+            base = self.base_theme.palette
+            pairs = [(base[role], theme.palette[role]) for role in ROLES]
+            theme_lut = self.build_heatmap_lut(theme)
+            pairs.extend(
+                (tuple(source), tuple(target))
+                for source, target in zip(
+                    self.heatmap_lut[:256].tolist(), theme_lut[:256].tolist()
+                )
+            )
+            recolor = self._recolors[theme.name] = Recolor(pairs)
+        return recolor
+
+    def themed(self, plan: DrawPlan, theme: Theme) -> DrawPlan:
+        """把基础主题的计划换色为 theme（基础主题原样返回）"""
+        if theme.name == self.base_theme.name:
+            return plan
+        recolor = self.recolor(theme)
+        return plan.recolor(recolor.fill, recolor.image)
 
     def setup_fonts(self):
         """设置字体"""
@@ -60,25 +152,178 @@ class KawaiiStatusRenderer:
             self.baotu_fnt = ImageFont.truetype(str(self.baotu_font_path), 64)
             self.dingtalk_fnt = ImageFont.truetype(str(self.dingtalk_font_path), 38)
             self.baotu_small_fnt = ImageFont.truetype(str(self.baotu_font_path), 42)
+            self.adlam_small_fnt = ImageFont.truetype(str(self.adlam_font_path), 20)
         except (OSError, IOError):
             self.adlam_fnt = ImageFont.load_default()
             self.spicy_fnt = ImageFont.load_default()
             self.baotu_fnt = ImageFont.load_default()
             self.dingtalk_fnt = ImageFont.load_default()
             self.baotu_small_fnt = ImageFont.load_default()
+            self.adlam_small_fnt = ImageFont.load_default()
+
+    def render(
+        self, status_info: Dict, trace=NULL_TRACE, theme: Optional[str] = None
+    ) -> bytes:
+        """渲染状态图片 样式
+
+        先生成绘制计划，画面与最近渲染过的某张完全相同时直接返回其编码结果。
+        theme 为主题名，未知或为空时使用默认主题。
+        """
+        return self.render_plan(self.plan(status_info, trace), trace, theme)
+
+    def render_themes(self, status_info: Dict, themes: List[str]) -> Dict[str, bytes]:
+        """同一份状态按多个主题渲染，绘制计划只生成一次"""
+        plan = self.plan(status_info)
+        return {theme: self.render_plan(plan, theme=theme) for theme in themes}
+
+    def render_plan(
+        self, plan: DrawPlan, trace=NULL_TRACE, theme: Optional[str] = None
+    ) -> bytes:
+        """把基础主题的绘制计划换色为 theme 后合成并编码"""
+        resolved = get_theme(theme)
+        with trace.stage("theme"):
+            plan = self.themed(plan, resolved)
+        with trace.stage("reuse"):
+            fingerprint = plan.fingerprint()
+            cached = self.encoded.get(fingerprint)
+        if cached is not None:
+            return cached
+
+        with self._frame_lock:
+            final_img = self.compose(plan, trace, resolved)
+            with trace.stage("encode"):
+                image_data = self.encode(final_img)
+        self.encoded.put(fingerprint, image_data)
+        return image_data
+
+    def background(self, theme: Optional[Theme] = None) -> Image.Image:
+        """缓存的干净背景，重绘区域时从这里取底图
+
+        其他主题的背景由基础背景经查找表一次重映射得到，标题再按主题重新着色。
+        """
+        theme = theme or self.base_theme
+        image = self._backgrounds.get(theme.name)
+        if image is None:
+            if theme.name == self.base_theme.name:
+                image = self.load_background()
+            else:
+                lut = theme.background_lut()
+                image = self.background()
+                if lut:
+                    image = self.reink_headings(image, image.point(lut), theme)
+            self._backgrounds[theme.name] = image
+        return image
+
+    def reink_headings(
+        self, base: Image.Image, mapped: Image.Image, theme: Theme
+    ) -> Image.Image:
+        """把色调映射后背景中的标题改用主题的 details 颜色（就地修改 mapped）
+
+        色调映射把标题与纸色一起压暗，两者几乎没有对比度。按基础背景中每个像素
+        在纸色与标题色之间的位置求出不透明度，把目标颜色叠加到映射结果上，
+        抗锯齿边缘随之保留。框右下角压着的浅色爪印位置约为 0.15，低于 0.2 的视为纸色。
+        """
+        box = self.heading_box
+        paper = np.array(self.heading_paper, dtype=np.float32)
+        axis = paper - np.array(self.base_theme.palette["details"][:3], np.float32)
+        source = np.asarray(base.crop(box), dtype=np.float32)[..., :3]
+        alpha = (paper - source) @ axis / (axis @ axis)
+        alpha = ((alpha - 0.2) / 0.8).clip(0, 1)[..., None]
+
+        pixels = np.array(mapped.crop(box), dtype=np.float32)
+        target = np.array(theme.palette["details"][:3], dtype=np.float32)
+        pixels[..., :3] += (target - pixels[..., :3]) * alpha
+        mapped.paste(Image.fromarray(pixels.round().astype(np.uint8)), box[:2])
+        return mapped
+
+    def compose(
+        self,
+        plan: DrawPlan,
+        trace=NULL_TRACE,
+        theme: Optional[Theme] = None,
+        frames: Optional[Dict[str, FrameState]] = None,
+    ) -> Image.Image:
+        """得到计划对应的完整画面
+
+        有上一帧时只重绘变化的区域：从干净背景裁出该区域，回放与之相交的绘制调用，
+        合成后贴回上一帧。变化区域超过画面一半时直接整帧重绘。
+        每个主题各自保留上一帧，交替渲染不同主题也能增量合成。
+        frames 为调用方自备的帧状态（如回放动画），此时总是增量合成，
+        且不影响本渲染器自己的上一帧。
+        """
+        theme = theme or self.base_theme
+        incremental = self.incremental if frames is None else True
+        frames = self._frames if frames is None else frames
+        previous = frames.get(theme.name)
+        with trace.stage("layout"):
+            base_img = self.background(theme)
+            regions = None
+            if incremental and previous is not None:
+                regions = self.clip_regions(
+                    plan.dirty_regions(previous[1]), base_img.size
+                )
+                area = sum((r[2] - r[0]) * (r[3] - r[1]) for r in regions)
+                if area > base_img.width * base_img.height // 2:
+                    regions = None
+
+        if regions is None:
+            with trace.stage("layout"):
+                layer = Image.new("RGBA", base_img.size, (0, 0, 0, 0))
+            with trace.stage("draw"):
+                plan.replay(layer)
+            with trace.stage("composite"):
+                frame = self.composite(base_img, layer)
+        else:
+            frame = previous[0]
+            with trace.stage("draw"):
+                for box in regions:
+                    layer = Image.new(
+                        "RGBA", (box[2] - box[0], box[3] - box[1]), (0, 0, 0, 0)
+                    )
+                    plan.replay(layer, plan.ops_within(box), offset=box[:2])
+                    frame.paste(self.composite(base_img.crop(box), layer), box[:2])
+
+        if incremental:
+            frames[theme.name] = (frame, plan, regions)
+        return frame
+
+    @staticmethod
+    def clip_regions(regions: List[Box], size: Tuple[int, int]) -> List[Box]:
+        """把区域裁剪到画面内，丢弃空区域"""
+        clipped = []
+        for region in regions:
+            box = (
+                max(0, region[0]),
+                max(0, region[1]),
+                min(size[0], region[2]),
+                min(size[1], region[3]),
+            )
+            if box[0] < box[2] and box[1] < box[3]:
+                clipped.append(box)
+        return clipped
 
-    def render(self, status_info: Dict) -> bytes:
-        """渲染状态图片 样式"""
-        # 加载背景图片
+    def load_background(self) -> Image.Image:
+        """加载背景图片"""
         try:
-            base_img = Image.open(self.bg_img_path).convert("RGBA")
+            return Image.open(self.bg_img_path).convert("RGBA")
         except (OSError, IOError):
             # 如果背景图片不存在，创建一个默认背景 (原项目尺寸)
-            base_img = Image.new("RGBA", (1080, 1920), (255, 255, 255, 255))
-
-        # 创建透明图层用于绘制内容
-        img = Image.new("RGBA", base_img.size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+            return Image.new("RGBA", (1080, 1920), (255, 255, 255, 255))
+
+    def draw_layer(
+        self, size: Tuple[int, int], status_info: Dict, trace=NULL_TRACE
+    ) -> Image.Image:
+        """在透明图层上绘制全部内容"""
+        plan = self.plan(status_info, trace)
+        with trace.stage("layout"):
+            img = Image.new("RGBA", size, (0, 0, 0, 0))
+        with trace.stage("draw"):
+            plan.replay(img)
+        return img
+
+    def plan(self, status_info: Dict, trace=NULL_TRACE) -> DrawPlan:
+        """生成绘制计划：计算全部字符串、角度与像素块，但不绘制到画布"""
+        plan = DrawPlan(self.arc_step)
 
         # 获取系统信息
         cpu_info: CPUInfo = status_info["cpu"]
@@ -89,13 +334,212 @@ class KawaiiStatusRenderer:
         swap_info: SwapInfo = status_info.get("swap")
         gpu_info: GPUInfo = status_info.get("gpu")
 
+        with trace.stage("text"):
+            self._draw_labels(
+                plan,
+                status_info.get("nickname", "AstrBot"),
+                cpu_info,
+                memory_info,
+                swap_info,
+                disk_info,
+                gpu_info,
+                network_info,
+            )
+
+        # 套接字状态汇总
+        sockets = status_info.get("sockets")
+        if sockets:
+            with trace.stage("text"):
+                self._draw_socket_summary(plan, sockets)
+
+        # 绘制圆形进度条
+        with trace.stage("arcs"):
+            self._draw_progress_arcs(
+                plan, cpu_info, memory_info, swap_info, disk_info, gpu_info, network_info
+            )
+
+        # 绘制系统详细信息
+        with trace.stage("text"):
+            self._draw_system_details(
+                plan, system_info, cpu_info, status_info.get("astrbot")
+            )
+
+        # 每核使用率热力图
+        if cpu_info.per_core:
+            with trace.stage("heatmap"):
+                self.draw_core_heatmap(plan, cpu_info.per_core)
+
+        # Bot 进程健康
+        bot_info = status_info.get("bot")
+        if bot_info:
+            with trace.stage("text"):
+                self._draw_bot_section(plan, bot_info)
+
+        # 历史趋势线
+        history = status_info.get("history")
+        if history:
+            with trace.stage("sparklines"):
+                self.draw_sparklines(plan, plan, history)
+
+        return plan
+
+    def _draw_socket_summary(self, draw: ImageDraw.Draw, sockets: SocketInfo):
+        """在下载/上传数值下方绘制 TCP/UDP 连接状态"""
+        tcp_text = (
+            f"TCP {sockets.established} est / {sockets.time_wait} tw"
+            f" / {sockets.listen} listen"
+        )
+        draw.text(
+            (251, 1278),
+            tcp_text,
+            font=self.adlam_small_fnt,
+            fill=self.network_download_color,
+        )
+        ports = "  ".join(
+            f":{port} x{count}" for port, count in sockets.remote_ports[:2]
+        )
+        udp_text = f"UDP {sockets.udp_total}" + (f"  |  {ports}" if ports else "")
+        draw.text(
+            (720, 1278),
+            udp_text,
+            font=self.adlam_small_fnt,
+            fill=self.network_upload_color,
+        )
+
+    def _draw_bot_section(self, draw: ImageDraw.Draw, bot_info: BotInfo):
+        """在环形图与详情框之间绘制 Bot 进程健康信息"""
+        draw.text((112, 1306), "BOT", font=self.adlam_fnt, fill=self.nickname_color)
+        loop_text = (
+            f"loop lag p50 {format_ms(bot_info.loop_lag_p50)}  "
+            f"p99 {format_ms(bot_info.loop_lag_p99)}  "
+            f"max {format_ms(bot_info.loop_lag_max)}  "
+            f"GC p99 {format_ms(bot_info.gc_pause_p99)}"
+        )
+        process_text = (
+            f"RSS {bot_info.rss:.0f}MB  {bot_info.threads} threads  "
+            f"{bot_info.open_fds} fds  {bot_info.tasks} tasks"
+        )
+        draw.text(
+            (220, 1306), loop_text, font=self.adlam_small_fnt, fill=self.details_color
+        )
+        draw.text(
+            (220, 1328), process_text, font=self.adlam_small_fnt, fill=self.details_color
+        )
+
+    def draw_sparklines(
+        self,
+        img: Image.Image,
+        draw: ImageDraw.Draw,
+        history: Dict[str, np.ndarray],
+        origin: Tuple[int, int] = (112, 1612),
+        panel_size: Tuple[int, int] = (150, 48),
+        gap: int = 14,
+    ):
+        """在底部绘制 CPU / RAM / 网络 / 磁盘 I/O 趋势线"""
+        width, height = panel_size
+        label_height = 22
+        panels = [
+            ("CPU", [("cpu", self.cpu_color)], (0.0, 100.0), "%"),
+            ("RAM", [("ram", self.ram_color)], (0.0, 100.0), "%"),
+            (
+                "NET",
+                [
+                    ("net_down", self.network_download_color),
+                    ("net_up", self.network_upload_color),
+                ],
+                None,
+                "/s",
+            ),
+            ("IO", [("disk_io", self.disk_color)], None, "/s"),
+        ]
+
+        for index, (title, series, value_range, unit) in enumerate(panels):
+            x = origin[0] + index * (width + gap)
+            y = origin[1]
+            arrays = [history.get(key) for key, _ in series]
+            if any(values is None for values in arrays):
+                continue
+
+            # 多条线共用纵轴，吞吐类指标按窗口内最大值自动缩放（取到 1/2/5 档）
+            if value_range is None:
+                peak = max((float(v.max()) for v in arrays if len(v)), default=0.0)
+                value_range = (0.0, nice_ceil(peak))
+
+            # 样本按纵轴档位取整，低于一档的波动不改变像素
+            latest = float(arrays[0][-1]) if len(arrays[0]) else 0.0
+            step = value_range[1] / SPARKLINE_LEVELS
+            arrays = [np.round(values / step) * step for values in arrays]
+
+            pixels = np.zeros((height, width, 4), dtype=np.uint8)
+            for values, (_, color) in zip(arrays, series):
+                rasterize_sparkline(values, width, height, color, value_range, out=pixels)
+            img.paste(Image.fromarray(pixels), (x, y + label_height))
+
+            # 百分比取整显示即可；吞吐与趋势线一样按档位取整
+            if unit == "%":
+                label = f"{title} {latest:.0f}%"
+            else:
+                current = quantize(latest, step)
+                label = f"{title} {self.format_bytes(int(current))}{unit}"
+            draw.text(
+                (x, y), label, font=self.adlam_small_fnt, fill=series[0][1]
+            )
+
+    def draw_core_heatmap(
+        self,
+        img: Image.Image,
+        per_core: List[float],
+        box: Tuple[int, int, int, int] = (720, 782, 980, 866),
+    ):
+        """绘制每核使用率热力图
+
+        网格由 NumPy 数组经颜色查找表映射后一次性粘贴，
+        像素量只取决于区域大小，与核心数无关。
+        """
+        width, height = box[2] - box[0], box[3] - box[1]
+        count = len(per_core)
+        cols = min(count, max(1, math.ceil(math.sqrt(count * width / height))))
+        rows = math.ceil(count / cols)
+        cell_w, cell_h = max(1, width // cols), max(1, height // rows)
+
+        # 颜色索引：0-255 对应使用率，256 表示补齐的空格子
+        index = np.full(rows * cols, 256, dtype=np.uint16)
+        values = np.asarray(per_core, dtype=np.float32)
+        values = np.round(values / HEATMAP_STEP) * HEATMAP_STEP
+        index[:count] = np.clip(values * 2.55, 0, 255).astype(np.uint16)
+        grid = self.heatmap_lut[index.reshape(rows, cols)]
+
+        # 放大到像素，格子足够大时留出 1 像素间隙
+        pixels = grid.repeat(cell_h, axis=0).repeat(cell_w, axis=1)
+        if cell_w >= 4:
+            pixels[:, cell_w - 1 :: cell_w, 3] = 0
+        if cell_h >= 4:
+            pixels[cell_h - 1 :: cell_h, :, 3] = 0
+
+        tile = Image.fromarray(pixels)
+        # 网格整体在区域内居中
+        offset_x = box[0] + (width - tile.width) // 2
+        offset_y = box[1] + (height - tile.height) // 2
+        img.paste(tile, (offset_x, offset_y))
+
+    def _draw_labels(
+        self,
+        draw: ImageDraw.Draw,
+        nickname: str,
+        cpu_info: CPUInfo,
+        memory_info: MemoryInfo,
+        swap_info: SwapInfo,
+        disk_info: DiskInfo,
+        gpu_info: GPUInfo,
+        network_info: NetworkInfo,
+    ):
+        """绘制昵称与各项标签文字"""
         # 绘制昵称
-        nickname = "AstrBot"
         draw.text((103, 581), nickname, font=self.baotu_fnt, fill=self.nickname_color)
 
         # 左侧项目
         draw.text((251, 737), "CPU", font=self.adlam_fnt, fill=self.cpu_color)
-        cpu_text = f"{cpu_info.usage:.1f}% - {cpu_info.freq}GHz [{cpu_info.cores} core]"
+        cpu_text = f"{cpu_info.usage:.0f}% - {cpu_info.freq}GHz [{cpu_info.cores} core]"
         draw.text((251, 772), cpu_text, font=self.spicy_fnt, fill=self.cpu_color)
 
         draw.text((251, 892), "RAM", font=self.adlam_fnt, fill=self.ram_color)
@@ -134,7 +578,7 @@ class KawaiiStatusRenderer:
                     f"{gpu_info.memory_used:.1f} / {gpu_info.memory_total:.1f} GB"
                 )
             else:
-                gpu_text = f"{gpu_info.usage:.1f}%"
+                gpu_text = f"{gpu_info.usage:.0f}%"
             draw.text((720, 927), gpu_text, font=self.spicy_fnt, fill=self.gpu_color)
 
         draw.text((720, 1046), "DISK", font=self.adlam_fnt, fill=self.disk_color)
@@ -153,21 +597,14 @@ class KawaiiStatusRenderer:
                 fill=self.network_upload_color,
             )
 
-        # 绘制圆形进度条
-        self._draw_progress_arcs(
-            draw, cpu_info, memory_info, swap_info, disk_info, gpu_info, network_info
-        )
-
-        # 绘制系统详细信息
-        self._draw_system_details(draw, system_info, cpu_info)
-
-        # 合成最终图片
-        final_img = Image.alpha_composite(base_img, img)
+    def composite(self, base_img: Image.Image, layer: Image.Image) -> Image.Image:
+        """合成背景与内容图层"""
+        return Image.alpha_composite(base_img, layer)
 
-        # 保存为字节流
+    def encode(self, image: Image.Image) -> bytes:
+        """编码为PNG字节流"""
         buf = io.BytesIO()
-        final_img.save(buf, format="PNG")
-        buf.seek(0)
+        image.save(buf, format="PNG")
         return buf.getvalue()
 
     def _draw_progress_arcs(
@@ -216,8 +653,6 @@ class KawaiiStatusRenderer:
         # 网络下载进度条
         if network_info:
             # 使用接收字节数的对数比例来显示进度
-            import math
-
             if network_info.bytes_recv > 0:
                 max_bytes = 1024**4  # 1TB
                 download_percentage = min(
@@ -265,8 +700,6 @@ class KawaiiStatusRenderer:
         # 网络上传进度条
         if network_info:
             # 使用发送字节数的对数比例来显示进度
-            import math
-
             if network_info.bytes_sent > 0:
                 max_bytes = 1024**4  # 1TB
                 upload_percentage = min(
@@ -385,16 +818,15 @@ class KawaiiStatusRenderer:
             )
 
     def _draw_system_details(
-        self, draw: ImageDraw.Draw, system_info: SystemInfo, cpu_info: CPUInfo
+        self,
+        draw: ImageDraw.Draw,
+        system_info: SystemInfo,
+        cpu_info: CPUInfo,
+        astrbot_info: Optional[AstrBotInfo] = None,
     ):
         """绘制系统详细信息 坐标"""
-        # 获取CPU信息
-        try:
-            cpu_brand = cpuinfo.get_cpu_info().get("brand_raw", "Unknown CPU")
-            # 截断过长的CPU名称
-            cpu_brand = self.truncate_string(cpu_brand)
-        except Exception:
-            cpu_brand = "Unknown CPU"
+        # CPU信息使用采集结果（远程节点的快照同样携带品牌），截断过长的名称
+        cpu_brand = self.truncate_string(cpu_info.brand or "Unknown CPU")
 
         # 系统信息
         draw.text((352, 1378), cpu_brand, font=self.adlam_fnt, fill=self.details_color)
@@ -406,15 +838,19 @@ class KawaiiStatusRenderer:
             (352, 1431), system_text, font=self.adlam_fnt, fill=self.details_color
         )
 
-        # AstrBot版本信息
-        version_text = "AstrBot v3.5.22"
+        # AstrBot版本与插件数量；远程节点没有 AstrBot，改为显示主机名
+        if astrbot_info:
+            version = astrbot_info.version
+            version_text = f"AstrBot v{version}" if version else "AstrBot"
+            plugin_text = f"{astrbot_info.plugins_loaded} plugins"
+            if astrbot_info.plugins_failed:
+                plugin_text += f" ({astrbot_info.plugins_failed} failed)"
+        else:
+            version_text = "AstrBot agent"
+            plugin_text = self.truncate_string(system_info.hostname)
         draw.text(
             (352, 1484), version_text, font=self.adlam_fnt, fill=self.details_color
         )
-
-        # 插件数量
-        plugin_count = self._get_plugin_count()
-        plugin_text = f"{plugin_count} plugins"
         draw.text(
             (352, 1537), plugin_text, font=self.adlam_fnt, fill=self.details_color
         )
@@ -438,28 +874,6 @@ class KawaiiStatusRenderer:
             anchor="ra",
         )
 
-    def _get_plugin_count(self) -> int:
-        """获取插件数量"""
-        try:
-            plugins_dir = Path(__file__).parent.parent.parent / "plugins"
-            if not plugins_dir.exists():
-                return 0
-
-            # 统计插件目录数量（排除隐藏目录和文件）
-            plugin_count = 0
-            for item in plugins_dir.iterdir():
-                if (
-                    item.is_dir()
-                    and not item.name.startswith(".")
-                    and not item.name.startswith("__")
-                ):
-                    # 检查是否包含main.py或__init__.py
-                    if (item / "main.py").exists() or (item / "__init__.py").exists():
-                        plugin_count += 1
-            return plugin_count
-        except Exception:
-            return 0
-
     def truncate_string(self, text: str, max_length: int = 30) -> str:
         """截断过长的字符串"""
         if len(text) <= max_length:
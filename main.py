@@ -1,16 +1,19 @@
 """AstrBot 状态插件"""
 
+import asyncio
 import hashlib
 import importlib.util
 import os
 import subprocess
 import sys
 import time
-from typing import Dict, Optional, Tuple
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import astrbot.api.message_components as Comp
 from astrbot.api import AstrBotConfig, logger
-from astrbot.api.event import AstrMessageEvent, filter
+from astrbot.api.event import AstrMessageEvent, MessageChain, filter
 from astrbot.api.star import Context, Star, register
 
 
@@ -19,8 +22,8 @@ def _check_and_install_dependencies():
     required_packages = {
         "psutil": "psutil>=5.9.0",
         "PIL": "Pillow>=9.0.0",
-        "matplotlib": "matplotlib>=3.5.0",
         "cpuinfo": "py-cpuinfo>=9.0.0",
+        "numpy": "numpy>=1.21.0",
         # GPU相关包是可选的，不强制安装
         # "pynvml": "nvidia-ml-py3>=7.352.0",
         # "GPUtil": "GPUtil>=1.4.0",
@@ -67,6 +70,19 @@ def _check_and_install_dependencies():
     return True
 
 
+def get_data_dir() -> Path:
+    """插件数据目录（AstrBot 数据目录下的 plugin_data/<插件名>）"""
+    try:
+        from astrbot.core.utils.astrbot_path import get_astrbot_data_path
+
+        base = Path(get_astrbot_data_path()) / "plugin_data"
+    except ImportError:
+        base = Path(__file__).parent / "data"
+    data_dir = base / "astrbot_plugin_status"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
+
+
 @register(
     "status",
     "System",
@@ -88,35 +104,183 @@ class StatusPlugin(Star):
 
         # 延迟导入，确保依赖已安装
         try:
+            from .alerts import AlertEngine
+            from .fleet import FleetAggregator
+            from .imagestore import ImageStore
+            from .inventory import PluginInventory
             from .kawaii_renderer import KawaiiStatusRenderer
+            from .memdiag import MemoryDiagnostics
+            from .perf import PerfRecorder
+            from .probe import BotProbe
+            from .profiler import ProfilerBusy, SamplingProfiler
+            from .ratelimit import RateLimiter
+            from .replay import (
+                ReplayError,
+                ReplayLimits,
+                ReplayRenderer,
+                parse_replay_minutes,
+            )
+            from .sampler import StatusSampler
+            from .shm_snapshot import DEFAULT_NAME, SnapshotWriter
+            from .subscriptions import (
+                BroadcastScheduler,
+                format_interval,
+                parse_interval,
+            )
             from .system_info import get_all_status_info
 
             self.KawaiiStatusRenderer = KawaiiStatusRenderer
             self.get_all_status_info = get_all_status_info
+            self.perf = PerfRecorder()
+            self.probe = BotProbe()
+            self.inventory = PluginInventory(context)
+            self.limiter = RateLimiter(
+                user=(
+                    config.get("rate_user_per_minute", 6),
+                    config.get("rate_user_burst", 3),
+                ),
+                group=(
+                    config.get("rate_group_per_minute", 12),
+                    config.get("rate_group_burst", 5),
+                ),
+                global_=(
+                    config.get("rate_global_per_minute", 30),
+                    config.get("rate_global_burst", 10),
+                ),
+            )
+            self.profiler = SamplingProfiler(
+                rate=config.get("profile_rate_hz", 100),
+                max_overhead=config.get("profile_max_overhead", 5) / 100,
+            )
+            self.ProfilerBusy = ProfilerBusy
+            self.memdiag = MemoryDiagnostics(
+                Path(__file__).resolve().parent.parent,
+                frames=config.get("mem_trace_frames", 1),
+            )
+            self.sampler = StatusSampler(
+                config.get("sample_interval", 2), config.get("history_minutes", 10)
+            )
+            self.fleet = FleetAggregator(
+                FleetAggregator.parse_nodes(config.get("fleet_nodes", [])),
+                stale_after=config.get("fleet_stale_seconds", 30),
+            )
+            self.alerts = AlertEngine(
+                config.get("alert_rules", []),
+                self.queue_alert,
+                hysteresis=config.get("alert_hysteresis", 5),
+                cooldown=config.get("alert_cooldown_minutes", 10) * 60,
+            )
+            self.sampler.add_listener(
+                lambda sampler: self.alerts.evaluate(sampler.metrics())
+            )
+            self.shm_writer = None
+            if config.get("shm_enabled", True):
+                try:
+                    self.shm_writer = SnapshotWriter(
+                        config.get("shm_name") or DEFAULT_NAME
+                    )
+                    self.sampler.add_listener(self.publish_shared_snapshot)
+                except OSError as e:
+                    logger.warning(f"创建共享内存快照失败: {e}")
+            self.scheduler = BroadcastScheduler(
+                get_data_dir() / "subscriptions.json",
+                self.render_status_images,
+                self.send_status_image,
+                theme_for=self.theme_for_session,
+                concurrency=config.get("broadcast_concurrency", 4),
+                send_timeout=config.get("broadcast_send_timeout", 30),
+            )
+            self.replay = ReplayRenderer(
+                ReplayLimits(
+                    max_frames=config.get("replay_max_frames", 60),
+                    max_bytes=int(config.get("replay_max_mb", 4) * 1024**2),
+                    max_seconds=config.get("replay_max_seconds", 20),
+                    frame_ms=min(65535, config.get("replay_frame_ms", 200)),
+                )
+            )
+            self.ReplayError = ReplayError
+            self.parse_replay_minutes = parse_replay_minutes
+            self.parse_interval = parse_interval
+            self.format_interval = format_interval
+            self.image_store = None
+            if config.get("image_store_enabled", True):
+                try:
+                    self.image_store = ImageStore(
+                        config.get("image_store_dir") or None,
+                        max_bytes=config.get("image_store_max_mb", 64) * 1024**2,
+                    )
+                except OSError as e:
+                    logger.warning(f"图片文件存储不可用，将直接发送图片数据: {e}")
         except ImportError as e:
             logger.error(f"导入模块失败: {e}")
             logger.error("请检查依赖是否正确安装")
             # 设置为None，在使用时进行检查
             self.KawaiiStatusRenderer = None
             self.get_all_status_info = None
+            self.perf = None
+            self.probe = None
+            self.inventory = None
+            self.limiter = None
+            self.profiler = None
+            self.memdiag = None
+            self.sampler = None
+            self.fleet = None
+            self.alerts = None
+            self.scheduler = None
+            self.shm_writer = None
+            self.image_store = None
+            self.replay = None
 
         # 配置项
         self.only_superuser = config.get("only_superuser", False)
         self.cache_enabled = config.get("cache_enabled", True)
         self.cache_expire = config.get("cache_expire_minutes", 5) * 60  # 转换为秒
         self.theme = config.get("theme", "light")
+        # "群号:主题"，为指定群单独设置主题
+        self.group_themes: Dict[str, str] = {}
+        for item in config.get("group_themes", []):
+            group_id, sep, theme = str(item).partition(":")
+            if sep and group_id.strip() and theme.strip():
+                self.group_themes[group_id.strip()] = theme.strip()
         self.show_network = config.get("show_network", True)
         self.show_process_count = config.get("show_process_count", True)
+        self.alert_sessions = config.get("alert_sessions", [])
+        self.profile_max_seconds = config.get("profile_max_seconds", 60)
+        # 至少 1 分钟，间隔为 0 会让调度循环无法对齐
+        self.subscribe_min_interval = (
+            max(1, config.get("subscribe_min_minutes", 10)) * 60
+        )
+        self.replay_max_minutes = config.get("history_minutes", 10)
+        self.replay_lock = asyncio.Lock()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
 
         # 初始化渲染器
         if self.KawaiiStatusRenderer:
-            self.renderer = self.KawaiiStatusRenderer()
+            self.renderer = self.KawaiiStatusRenderer(
+                arc_step=config.get("render_arc_step", 3.6),
+                reuse_size=config.get("render_reuse_size", 8),
+            )
         else:
             self.renderer = None
 
         # 缓存系统
         self.cache: Dict[str, Tuple[bytes, float]] = {}
 
+        # 启动后台采样
+        if self.sampler:
+            self.sampler.start()
+
+        # 插件通常在事件循环中加载，此时直接建立到各节点的连接
+        try:
+            self.loop = asyncio.get_running_loop()
+            self.ensure_fleet_started()
+            if self.probe:
+                self.probe.start()
+            if self.scheduler:
+                self.scheduler.start()
+        except RuntimeError:
+            pass
+
         logger.info("Status 插件已加载")
 
     def get_cache_key(self, *args) -> str:
@@ -152,18 +316,127 @@ class StatusPlugin(Star):
         for key in expired_keys:
             del self.cache[key]
 
+    def cache_size(self) -> int:
+        """图片缓存占用的字节数"""
+        return sum(len(image_data) for image_data, _ in self.cache.values())
+
+    def image_component(self, image_data: bytes):
+        """优先以文件形式发送图片，同一张图片只落盘一次"""
+        if self.image_store:
+            try:
+                path = self.image_store.put(image_data)
+                return Comp.Image.fromFileSystem(str(path))
+            except OSError as e:
+                logger.warning(f"写入图片文件失败，改为直接发送: {e}")
+        return Comp.Image.fromBytes(image_data)
+
+    def collect_status_info(self, trace=None, bot=None) -> Dict:
+        """收集本机状态
+
+        包含阻塞调用。在线程中执行时，需先在事件循环线程中取得进程健康信息
+        （self.probe.snapshot() 会读取事件循环的任务列表）作为 bot 传入。
+        """
+        status_info = self.get_all_status_info(trace, self.sampler)
+        status_info["history"] = self.sampler.history_snapshot()
+        status_info["bot"] = bot or self.probe.snapshot()
+        with trace.stage("collect.astrbot") if trace else nullcontext():
+            status_info["astrbot"] = self.inventory.snapshot()
+        return self.filter_status_info(status_info)
+
+    def filter_status_info(self, status_info: Dict) -> Dict:
+        """根据配置去掉不显示的信息（本机采集与远程节点快照共用）"""
+        if not self.show_network:
+            status_info.pop("network", None)
+            status_info.pop("sockets", None)
+        return status_info
+
+    async def render_status_images(self, themes: List[str]) -> Dict[str, bytes]:
+        """定时推送用：采集一次，每个主题各渲染一张
+
+        采集与渲染都在线程中执行，不阻塞事件循环。
+        """
+        bot = self.probe.snapshot()
+
+        def work() -> Dict[str, bytes]:
+            status_info = self.collect_status_info(bot=bot)
+            return self.renderer.render_themes(status_info, themes)
+
+        return await asyncio.to_thread(work)
+
+    async def send_status_image(self, session: str, image_data: bytes):
+        """向会话发送状态图片，会话不可用时抛出异常"""
+        chain = MessageChain(chain=[self.image_component(image_data)])
+        if await self.context.send_message(session, chain) is False:
+            raise RuntimeError("会话不存在或平台不可用")
+
+    def publish_shared_snapshot(self, sampler):
+        """采样回调：把最近一次采样写入共享内存"""
+        self.shm_writer.publish(
+            sampler.metrics(),
+            sampler.per_core,
+            ticks=sampler.ticks,
+            interval=sampler.interval,
+            timestamp=sampler.last_tick,
+        )
+
+    def ensure_fleet_started(self):
+        """启动多节点聚合器的常驻连接（幂等）"""
+        if self.fleet and self.fleet.connections:
+            self.fleet.start()
+
+    def queue_alert(self, text: str):
+        """由采样线程调用，把告警投递到事件循环中发送"""
+        logger.warning(text)
+        if not self.alert_sessions or self.loop is None or self.loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.push_alert(text), self.loop)
+
+    async def push_alert(self, text: str):
+        """向配置的管理员会话推送告警"""
+        for session in self.alert_sessions:
+            try:
+                await self.context.send_message(session, MessageChain().message(text))
+            except Exception as e:
+                logger.error(f"推送告警到 {session} 失败: {e}")
+
     def is_authorized(self, event: AstrMessageEvent) -> bool:
         """检查用户是否有权限使用状态命令"""
         if not self.only_superuser:
             return True
+        return event.is_admin()
+
+    def theme_for(self, event: AstrMessageEvent) -> str:
+        """当前会话使用的主题"""
+        return self.group_themes.get(str(event.get_group_id() or ""), self.theme)
+
+    def theme_for_session(self, session: str) -> str:
+        """会话标识 (unified_msg_origin，格式为 平台:消息类型:会话 ID) 使用的主题
 
-        # 这里需要根据AstrBot的实际权限系统来实现
-        # 暂时返回True，实际使用时需要根据具体的权限检查方式修改
-        return True
+        群聊的会话 ID 即群号。
+        """
+        parts = session.split(":", 2)
+        if len(parts) == 3 and parts[1] == "GroupMessage":
+            return self.group_themes.get(parts[2], self.theme)
+        return self.theme
+
+    def check_rate_limit(self, event: AstrMessageEvent) -> Optional[str]:
+        """检查限流，被限流时返回提示文本；管理员不受限流"""
+        if not self.limiter:
+            return None
+        throttled = self.limiter.acquire(
+            event.get_sender_id(), event.get_group_id(), exempt=event.is_admin()
+        )
+        if throttled is None:
+            return None
+        scope, wait = throttled
+        label = self.limiter.SCOPE_LABELS[scope]
+        return f"⏳ {label}请求过于频繁，请 {max(1, round(wait))} 秒后再试"
 
     @filter.command("status")
-    async def status_command(self, event: AstrMessageEvent):
-        """查看系统状态"""
+    async def status_command(
+        self, event: AstrMessageEvent, node: str = "", minutes: str = ""
+    ):
+        """查看系统状态，指定节点名时查看该节点；/status replay <分钟> 生成回放动画"""
         try:
             # 检查依赖是否可用
             if not self.renderer or not self.get_all_status_info:
@@ -175,42 +448,193 @@ class StatusPlugin(Star):
                 yield event.plain_result("❌ 权限不足，仅管理员可查看系统状态")
                 return
 
+            throttle_text = self.check_rate_limit(event)
+            if node == "replay":
+                if throttle_text:
+                    yield event.plain_result(throttle_text)
+                    return
+                async for result in self.replay_status(event, minutes):
+                    yield result
+                return
+            if node:
+                if throttle_text:
+                    yield event.plain_result(throttle_text)
+                    return
+                async for result in self.node_status(event, node):
+                    yield result
+                return
+
             # 生成缓存键
+            theme = self.theme_for(event)
             cache_key = self.get_cache_key(
-                "status", self.theme, self.show_network, self.show_process_count
+                "status", theme, self.show_network, self.show_process_count
             )
 
-            # 尝试获取缓存
-            cached_image = self.get_cached_image(cache_key)
-            if cached_image:
-                logger.info("使用缓存的状态图片")
-                yield event.chain_result([Comp.Image.fromBytes(cached_image)])
+            # 被限流时不渲染，有缓存（即使已过期）就发缓存图片
+            if throttle_text:
+                cached = self.cache.get(cache_key)
+                if cached:
+                    yield event.chain_result([self.image_component(cached[0])])
+                else:
+                    yield event.plain_result(throttle_text)
                 return
 
-            # 收集系统信息
-            logger.info("收集系统状态信息...")
-            status_info = self.get_all_status_info()
+            trace = self.perf.begin()
+            cache_hit = False
+            image_data = b""
+            try:
+                # 尝试获取缓存
+                with trace.stage("cache"):
+                    cached_image = self.get_cached_image(cache_key)
+                if cached_image:
+                    logger.info("使用缓存的状态图片")
+                    cache_hit = True
+                    image_data = cached_image
+                else:
+                    # 采集与渲染都在线程中执行，不阻塞事件循环
+                    logger.info("收集系统状态信息并渲染...")
+                    bot = self.probe.snapshot()
+
+                    def work() -> bytes:
+                        status_info = self.collect_status_info(trace, bot=bot)
+                        return self.renderer.render(status_info, trace, theme)
+
+                    image_data = await asyncio.to_thread(work)
+
+                    # 缓存图片
+                    self.cache_image(cache_key, image_data)
+
+                    # 清理过期缓存
+                    self.clean_expired_cache()
+
+                # 发送图片
+                with trace.stage("send"):
+                    yield event.chain_result([self.image_component(image_data)])
+            finally:
+                self.perf.finish(trace, cache_hit=cache_hit, image_bytes=len(image_data))
 
-            # 根据配置过滤信息
-            if not self.show_network:
-                status_info.pop("network", None)
+        except Exception as e:
+            logger.error(f"生成状态图片失败: {e}")
+            yield event.plain_result("❌ 生成状态图片时出现错误")
 
-            # 渲染状态图片
-            logger.info("渲染状态图片...")
-            image_data = self.renderer.render(status_info)
+    async def replay_status(self, event: AstrMessageEvent, minutes: str):
+        """最近若干分钟的状态回放动画（同一时间只生成一个）"""
+        if not self.replay or not self.sampler:
+            yield event.plain_result("❌ 回放功能不可用")
+            return
+        try:
+            span = self.parse_replay_minutes(minutes, self.replay_max_minutes)
+        except self.ReplayError as e:
+            yield event.plain_result(f"❌ {e}")
+            return
+        if self.replay_lock.locked():
+            yield event.plain_result("⏳ 正在生成其他回放，请稍后再试")
+            return
+
+        bot = self.probe.snapshot()
+        theme = self.theme_for(event)
+
+        def work():
+            status_info = self.collect_status_info(bot=bot)
+            return self.replay.render(
+                self.renderer,
+                status_info,
+                status_info["history"],
+                self.sampler.interval,
+                self.sampler.last_tick or time.time(),
+                span,
+                theme,
+            )
 
-            # 缓存图片
-            self.cache_image(cache_key, image_data)
+        async with self.replay_lock:
+            try:
+                # 采集与渲染都在线程中执行，不阻塞事件循环
+                result = await asyncio.to_thread(work)
+            except self.ReplayError as e:
+                yield event.plain_result(f"❌ {e}")
+                return
 
-            # 清理过期缓存
+        text = (
+            f"🎞️ 最近 {result.seconds / 60:.1f} 分钟，{result.frames} 帧，"
+            f"{len(result.data) / 1024:.0f}KB，生成耗时 {result.elapsed:.1f}s"
+        )
+        if result.truncated:
+            text += f"\n⚠️ {result.truncated}"
+        yield event.chain_result(
+            [Comp.Plain(text), self.image_component(result.data)]
+        )
+
+    async def node_status(self, event: AstrMessageEvent, node: str):
+        """渲染远程节点的最新快照"""
+        self.ensure_fleet_started()
+        state = self.fleet.get(node)
+        if state is None:
+            names = ", ".join(self.fleet.names()) or "无"
+            yield event.plain_result(f"❌ 未知节点: {node}\n可用节点: {names}")
+            return
+        if state.status_info is None:
+            reason = state.last_error or "尚未收到数据"
+            yield event.plain_result(f"❌ 节点 {node} 暂无数据 ({reason})")
+            return
+
+        theme = self.theme_for(event)
+        cache_key = self.get_cache_key(
+            "node", node, state.collected_at, theme, self.show_network
+        )
+        image_data = self.get_cached_image(cache_key)
+        if not image_data:
+            status_info = self.filter_status_info(
+                dict(state.status_info, nickname=node)
+            )
+            image_data = await asyncio.to_thread(
+                self.renderer.render, status_info, theme=theme
+            )
+            self.cache_image(cache_key, image_data)
             self.clean_expired_cache()
 
-            # 发送图片
-            yield event.chain_result([Comp.Image.fromBytes(image_data)])
+        if state.is_stale(self.fleet.stale_after):
+            age = state.age() or 0.0
+            yield event.plain_result(f"⚠️ 节点 {node} 数据已过期 ({age:.0f} 秒前)")
+        yield event.chain_result([self.image_component(image_data)])
+
+    @filter.command("status_fleet")
+    async def status_fleet_command(self, event: AstrMessageEvent):
+        """查看所有节点的状态总览"""
+        try:
+            if not self.fleet:
+                yield event.plain_result("❌ 插件依赖未正确安装，请检查依赖包")
+                return
+
+            if not self.is_authorized(event):
+                yield event.plain_result("❌ 权限不足")
+                return
+
+            self.ensure_fleet_started()
+            yield event.plain_result(self.fleet.format_overview())
 
         except Exception as e:
-            logger.error(f"生成状态图片失败: {e}")
-            yield event.plain_result("❌ 生成状态图片时出现错误")
+            logger.error(f"查看节点总览失败: {e}")
+            yield event.plain_result("❌ 查看节点总览失败")
+
+    @filter.command("status_bot")
+    async def status_bot_command(self, event: AstrMessageEvent):
+        """查看 Bot 进程健康状态（事件循环延迟、内存、线程、GC）"""
+        try:
+            if not self.probe:
+                yield event.plain_result("❌ 插件依赖未正确安装，请检查依赖包")
+                return
+
+            if not self.is_authorized(event):
+                yield event.plain_result("❌ 权限不足")
+                return
+
+            # 插件加载时若不在事件循环中，则在首次使用时启动探针
+            self.probe.start()
+            yield event.plain_result(self.probe.format_text())
+
+        except Exception as e:
+            logger.error(f"查看 Bot 状态失败: {e}")
+            yield event.plain_result("❌ 查看 Bot 状态失败")
 
     @filter.command("状态")
     async def status_alias(self, event: AstrMessageEvent):
@@ -237,7 +661,7 @@ class StatusPlugin(Star):
 🔒 仅管理员: {'✅' if self.only_superuser else '❌'}
 💾 缓存启用: {'✅' if self.cache_enabled else '❌'}
 ⏰ 缓存过期: {self.cache_expire // 60} 分钟
-🎨 主题: {self.theme}
+🎨 主题: {self.theme}{f" (按群 {len(self.group_themes)} 个)" if self.group_themes else ""}
 🌐 显示网络: {'✅' if self.show_network else '❌'}
 📈 显示进程数: {'✅' if self.show_process_count else '❌'}
 🗂️ 缓存数量: {len(self.cache)}"""
@@ -248,6 +672,192 @@ class StatusPlugin(Star):
             logger.error(f"查看配置失败: {e}")
             yield event.plain_result("❌ 查看配置失败")
 
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @filter.command("status_perf")
+    async def status_perf_command(self, event: AstrMessageEvent):
+        """查看状态命令各阶段耗时统计"""
+        try:
+            if not self.perf:
+                yield event.plain_result("❌ 插件依赖未正确安装，请检查依赖包")
+                return
+
+            report = self.perf.format_report()
+            if self.renderer:
+                encoded = self.renderer.encoded
+                report += (
+                    f"\n♻️ 画面复用: 命中 {encoded.hits} 次 / 未命中 {encoded.misses} 次"
+                )
+            if self.image_store:
+                report += "\n" + self.image_store.format_report()
+            if self.limiter:
+                report += "\n" + self.limiter.format_report()
+            yield event.plain_result(report)
+
+        except Exception as e:
+            logger.error(f"查看性能统计失败: {e}")
+            yield event.plain_result("❌ 查看性能统计失败")
+
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @filter.command("status_alerts")
+    async def status_alerts_command(self, event: AstrMessageEvent):
+        """查看告警规则状态与求值开销"""
+        try:
+            if not self.alerts:
+                yield event.plain_result("❌ 插件依赖未正确安装，请检查依赖包")
+                return
+
+            report = self.alerts.format_report()
+            sessions = len(self.alert_sessions)
+            yield event.plain_result(
+                f"{report}\n📮 推送会话: {sessions} 个\n"
+                f"当前会话: {event.unified_msg_origin}"
+            )
+
+        except Exception as e:
+            logger.error(f"查看告警状态失败: {e}")
+            yield event.plain_result("❌ 查看告警状态失败")
+
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @filter.command("status_profile")
+    async def status_profile_command(self, event: AstrMessageEvent, seconds: int = 10):
+        """对 AstrBot 进程做统计采样分析，返回热点函数与折叠栈文件"""
+        try:
+            if not self.profiler:
+                yield event.plain_result("❌ 插件依赖未正确安装，请检查依赖包")
+                return
+
+            if self.profiler.running:
+                yield event.plain_result("❌ 已有分析任务正在运行，请稍后再试")
+                return
+
+            seconds = max(1, min(int(seconds), self.profile_max_seconds))
+            yield event.plain_result(f"🔍 开始采样分析 {seconds} 秒...")
+
+            try:
+                # 采样循环在线程中运行，事件循环线程本身也会被采样
+                result = await asyncio.to_thread(self.profiler.run, seconds)
+            except self.ProfilerBusy:
+                yield event.plain_result("❌ 已有分析任务正在运行，请稍后再试")
+                return
+
+            profile_dir = get_data_dir() / "profiles"
+            profile_dir.mkdir(exist_ok=True)
+            file_name = time.strftime("profile-%Y%m%d-%H%M%S.collapsed")
+            profile_path = profile_dir / file_name
+            profile_path.write_text(result.collapsed(), encoding="utf-8")
+            # 只保留最近 10 份分析结果
+            for old_file in sorted(profile_dir.glob("profile-*.collapsed"))[:-10]:
+                old_file.unlink(missing_ok=True)
+
+            yield event.plain_result(result.format_report())
+            yield event.chain_result(
+                [Comp.File(name=file_name, file=str(profile_path))]
+            )
+
+        except Exception as e:
+            logger.error(f"采样分析失败: {e}")
+            yield event.plain_result("❌ 采样分析失败")
+
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @filter.command("status_mem")
+    async def status_mem_command(self, event: AstrMessageEvent, action: str = ""):
+        """内存诊断: start 开启追踪 / snapshot 拍摄基准快照 / diff 对比基准 / stop 关闭"""
+        try:
+            if not self.memdiag:
+                yield event.plain_result("❌ 插件依赖未正确安装，请检查依赖包")
+                return
+
+            action = action.strip().lower()
+            extra = {f"图片缓存 ({len(self.cache)} 张)": self.cache_size()}
+            if self.image_store:
+                store = self.image_store
+                extra[f"图片文件 ({len(store.files)} 个)"] = store.total_bytes
+            if action == "start":
+                text = self.memdiag.start()
+            elif action == "stop":
+                text = self.memdiag.stop()
+            elif action == "snapshot":
+                text = await asyncio.to_thread(self.memdiag.snapshot, extra)
+            elif action == "diff":
+                text = await asyncio.to_thread(self.memdiag.diff, extra)
+            else:
+                state = "运行中" if self.memdiag.tracing else "未开启"
+                text = (
+                    f"🧠 内存追踪: {state} | 图片缓存 {len(self.cache)} 张，"
+                    f"{self.cache_size() / 1024:.1f}KB\n"
+                    "用法: /status_mem start|snapshot|diff|stop"
+                )
+            yield event.plain_result(text)
+
+        except Exception as e:
+            logger.error(f"内存诊断失败: {e}")
+            yield event.plain_result("❌ 内存诊断失败")
+
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @filter.command("status_subscribe")
+    async def status_subscribe_command(
+        self, event: AstrMessageEvent, interval: str = "1h"
+    ):
+        """订阅定时状态推送，间隔如 30m、1h、1d（纯数字按分钟计）"""
+        try:
+            if not self.scheduler:
+                yield event.plain_result("❌ 插件依赖未正确安装，请检查依赖包")
+                return
+
+            try:
+                seconds = self.parse_interval(interval)
+            except ValueError:
+                yield event.plain_result("❌ 间隔格式错误，示例: 30m、1h、1d")
+                return
+            if seconds < self.subscribe_min_interval:
+                minimum = self.format_interval(self.subscribe_min_interval)
+                yield event.plain_result(f"❌ 推送间隔不能小于 {minimum}")
+                return
+
+            self.scheduler.subscribe(event.unified_msg_origin, seconds)
+            self.scheduler.start()
+            yield event.plain_result(
+                f"✅ 已订阅，每 {self.format_interval(seconds)} 推送一次状态图片"
+                "（对齐到整点时刻）"
+            )
+
+        except Exception as e:
+            logger.error(f"订阅失败: {e}")
+            yield event.plain_result("❌ 订阅失败")
+
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @filter.command("status_unsubscribe")
+    async def status_unsubscribe_command(self, event: AstrMessageEvent):
+        """取消当前会话的定时推送"""
+        try:
+            if not self.scheduler:
+                yield event.plain_result("❌ 插件依赖未正确安装，请检查依赖包")
+                return
+
+            if self.scheduler.unsubscribe(event.unified_msg_origin):
+                yield event.plain_result("✅ 已取消订阅")
+            else:
+                yield event.plain_result("ℹ️ 当前会话没有订阅")
+
+        except Exception as e:
+            logger.error(f"取消订阅失败: {e}")
+            yield event.plain_result("❌ 取消订阅失败")
+
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @filter.command("status_subscriptions")
+    async def status_subscriptions_command(self, event: AstrMessageEvent):
+        """查看全部订阅与各会话的发送延迟、失败次数"""
+        try:
+            if not self.scheduler:
+                yield event.plain_result("❌ 插件依赖未正确安装，请检查依赖包")
+                return
+
+            yield event.plain_result(self.scheduler.format_report())
+
+        except Exception as e:
+            logger.error(f"查看订阅失败: {e}")
+            yield event.plain_result("❌ 查看订阅失败")
+
     @filter.command("status_clear_cache")
     async def clear_cache_command(self, event: AstrMessageEvent):
         """清理状态插件缓存"""
@@ -259,6 +869,10 @@ class StatusPlugin(Star):
 
             cache_count = len(self.cache)
             self.cache.clear()
+            if self.renderer:
+                self.renderer.encoded.clear()
+            if self.image_store:
+                self.image_store.clear()
             yield event.plain_result(f"✅ 已清理 {cache_count} 个缓存图片")
 
         except Exception as e:
@@ -268,4 +882,18 @@ class StatusPlugin(Star):
     async def terminate(self):
         """插件卸载时的清理工作"""
         self.cache.clear()
+        if self.memdiag:
+            self.memdiag.stop()
+        if self.image_store:
+            self.image_store.clear()
+        if self.sampler:
+            self.sampler.stop()
+        if self.shm_writer:
+            self.shm_writer.close()
+        if self.probe:
+            await self.probe.stop()
+        if self.fleet:
+            await self.fleet.stop()
+        if self.scheduler:
+            await self.scheduler.stop()
         logger.info("Status 插件已卸载")
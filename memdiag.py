@@ -0,0 +1,171 @@
+"""基于 tracemalloc 的内存诊断模块
+
+追踪默认关闭，由管理员命令显式开启；帧深度可配置以控制开销。
+分配统计按文件和来源（插件目录 / 第三方包 / 其他）两级分组。
+"""
+
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+_EXCLUDE = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def _format_size(size: float) -> str:
+    sign = "-" if size < 0 else ""
+    value = abs(float(size))
+    for unit in ["B", "KB", "MB", "GB"]:
+        if value < 1024.0:
+            return f"{sign}{value:.1f}{unit}"
+        value /= 1024.0
+    return f"{sign}{value:.1f}TB"
+
+
+class MemoryDiagnostics:
+    """tracemalloc 快照与差异分析"""
+
+    def __init__(self, plugins_dir: Path, frames: int = 1):
+        self.plugins_dir = plugins_dir.resolve()
+        self.frames = max(1, int(frames))
+        self.reference: Optional[tracemalloc.Snapshot] = None
+        self._owner = False  # 追踪是否由本模块开启
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> str:
+        if tracemalloc.is_tracing():
+            return f"ℹ️ tracemalloc 已在运行 (帧深度 {tracemalloc.get_traceback_limit()})"
+        tracemalloc.start(self.frames)
+        self._owner = True
+        self.reference = None
+        return f"✅ 已开启内存追踪 (帧深度 {self.frames})"
+
+    def stop(self) -> str:
+        self.reference = None
+        if not tracemalloc.is_tracing():
+            return "ℹ️ 内存追踪未开启"
+        if not self._owner:
+            return "ℹ️ tracemalloc 由其他组件开启，未停止"
+        tracemalloc.stop()
+        self._owner = False
+        return "✅ 已关闭内存追踪并释放快照"
+
+    def _take(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_EXCLUDE)
+
+    def classify(self, filename: str) -> str:
+        """把文件归类到插件目录、第三方包或其他"""
+        path = Path(filename)
+        relative = self._relative(path)
+        if relative is not None and relative.parts:
+            return f"plugin:{relative.parts[0]}"
+        parts = path.parts
+        for marker in ("site-packages", "dist-packages"):
+            if marker in parts:
+                index = parts.index(marker)
+                if index + 1 < len(parts):
+                    package = parts[index + 1].split(".")[0]
+                    return f"package:{package}"
+        if "astrbot" in parts:
+            return "astrbot"
+        return "python"
+
+    def _relative(self, path: Path) -> Optional[Path]:
+        """插件目录内的相对路径；<frozen ...> 等非真实路径返回 None"""
+        if not path.is_absolute():
+            return None
+        try:
+            return path.resolve().relative_to(self.plugins_dir)
+        except (ValueError, OSError):
+            return None
+
+    def _group(self, items: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+        groups: Counter = Counter()
+        for filename, size in items:
+            groups[self.classify(filename)] += size
+        return sorted(groups.items(), key=lambda kv: abs(kv[1]), reverse=True)
+
+    def _overhead_line(self) -> str:
+        current, peak = tracemalloc.get_traced_memory()
+        return (
+            f"📦 已追踪 {_format_size(current)} (峰值 {_format_size(peak)})，"
+            f"tracemalloc 自身占用 {_format_size(tracemalloc.get_tracemalloc_memory())}"
+        )
+
+    def snapshot(self, extra: Dict[str, int], top: int = 10) -> str:
+        """拍摄快照作为后续 diff 的基准，并报告当前分配热点"""
+        if not tracemalloc.is_tracing():
+            return "❌ 内存追踪未开启，请先执行 /status_mem start"
+        snap = self._take()
+        self.reference = snap
+
+        by_file = snap.statistics("filename")
+        lines = ["🧠 内存快照", self._overhead_line(), self._extra_lines(extra), ""]
+        lines.append("按来源:")
+        grouped = self._group(
+            [(s.traceback[0].filename, s.size) for s in by_file if s.traceback]
+        )
+        for name, size in grouped[:top]:
+            lines.append(f"  {_format_size(size):>9}  {name}")
+        lines.append("")
+        lines.append("按文件:")
+        for stat in by_file[:top]:
+            lines.append(
+                f"  {_format_size(stat.size):>9}  {stat.count:>7} 块  "
+                f"{self._short(stat.traceback[0].filename)}"
+            )
+        return "\n".join(lines)
+
+    def diff(self, extra: Dict[str, int], top: int = 10) -> str:
+        """与基准快照比较，报告增长最多的位置"""
+        if not tracemalloc.is_tracing():
+            return "❌ 内存追踪未开启，请先执行 /status_mem start"
+        if self.reference is None:
+            return "❌ 没有基准快照，请先执行 /status_mem snapshot"
+        snap = self._take()
+        diffs = snap.compare_to(self.reference, "filename")
+        total = sum(d.size_diff for d in diffs)
+
+        lines = [
+            f"📈 内存差异 (相对基准 {_format_size(total)})",
+            self._overhead_line(),
+            self._extra_lines(extra),
+            "",
+            "按来源:",
+        ]
+        grouped = self._group(
+            [(d.traceback[0].filename, d.size_diff) for d in diffs if d.traceback]
+        )
+        for name, size in grouped[:top]:
+            if size:
+                lines.append(f"  {_format_size(size):>9}  {name}")
+        lines.append("")
+        lines.append("按文件:")
+        for stat in diffs[:top]:
+            if not stat.size_diff:
+                continue
+            lines.append(
+                f"  {_format_size(stat.size_diff):>9}  {stat.count_diff:>+7} 块  "
+                f"{self._short(stat.traceback[0].filename)}"
+            )
+        return "\n".join(lines)
+
+    def _short(self, filename: str) -> str:
+        """缩短路径：插件内显示相对路径，其余保留最后两级"""
+        path = Path(filename)
+        relative = self._relative(path)
+        if relative is not None:
+            return str(relative)
+        return "/".join(path.parts[-2:])
+
+    @staticmethod
+    def _extra_lines(extra: Dict[str, int]) -> str:
+        return " | ".join(f"{name} {_format_size(size)}" for name, size in extra.items())
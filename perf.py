@@ -0,0 +1,178 @@
+"""请求级性能追踪模块"""
+
+import math
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+
+class RollingHistogram:
+    """保留最近 N 个样本的滚动直方图"""
+
+    def __init__(self, size: int = 500):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def record(self, value: float):
+        """记录一个样本"""
+        self.samples.append(value)
+
+    def percentiles(self, *pcts: float) -> List[float]:
+        """按最近秩法计算多个百分位，只排序一次"""
+        if not self.samples:
+            return [0.0 for _ in pcts]
+        ordered = sorted(self.samples)
+        n = len(ordered)
+        result = []
+        for pct in pcts:
+            rank = min(n, max(1, math.ceil(pct / 100 * n)))
+            result.append(ordered[rank - 1])
+        return result
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+
+@dataclass
+class RequestTrace:
+    """单次请求的阶段耗时 (毫秒)"""
+
+    started_at: float = field(default_factory=time.time)
+    stages: Dict[str, float] = field(default_factory=dict)
+    cache_hit: bool = False
+    image_bytes: int = 0
+    total: float = 0.0
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    @contextmanager
+    def stage(self, name: str):
+        """计时一个阶段，同名阶段累加"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+
+class NullTrace:
+    """不做任何记录的追踪对象，用于未启用追踪的调用"""
+
+    _context = nullcontext()
+
+    def stage(self, name: str):
+        return self._context
+
+
+NULL_TRACE = NullTrace()
+
+
+class PerfRecorder:
+    """汇总请求追踪：各阶段滚动直方图、缓存命中率、输出字节数、最慢请求"""
+
+    def __init__(self, window: int = 500, slow_window: int = 200):
+        self.window = window
+        self.stage_histograms: Dict[str, RollingHistogram] = defaultdict(
+            lambda: RollingHistogram(self.window)
+        )
+        self.total_histogram = RollingHistogram(window)
+        self.recent: Deque[RequestTrace] = deque(maxlen=slow_window)
+        self.requests = 0
+        self.cache_hits = 0
+        self.bytes_produced = 0
+        self.bytes_sent = 0
+
+    def begin(self) -> RequestTrace:
+        """开始追踪一次请求"""
+        return RequestTrace()
+
+    def finish(
+        self,
+        trace: RequestTrace,
+        cache_hit: bool = False,
+        image_bytes: int = 0,
+    ):
+        """结束追踪并计入统计"""
+        trace.total = (time.perf_counter() - trace._start) * 1000
+        trace.cache_hit = cache_hit
+        trace.image_bytes = image_bytes
+
+        self.requests += 1
+        self.bytes_sent += image_bytes
+        if cache_hit:
+            self.cache_hits += 1
+        else:
+            self.bytes_produced += image_bytes
+
+        for name, elapsed in trace.stages.items():
+            self.stage_histograms[name].record(elapsed)
+        self.total_histogram.record(trace.total)
+        self.recent.append(trace)
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """缓存命中率"""
+        return self.cache_hits / self.requests if self.requests else 0.0
+
+    def slowest(self, count: int = 5) -> List[RequestTrace]:
+        """最近请求中最慢的若干次"""
+        return sorted(self.recent, key=lambda t: t.total, reverse=True)[:count]
+
+    def reset(self):
+        """清空统计"""
+        self.stage_histograms.clear()
+        self.total_histogram = RollingHistogram(self.window)
+        self.recent.clear()
+        self.requests = 0
+        self.cache_hits = 0
+        self.bytes_produced = 0
+        self.bytes_sent = 0
+
+    def format_report(self, slow_count: int = 5) -> str:
+        """生成文本报告"""
+        if not self.requests:
+            return "📈 暂无状态请求记录"
+
+        lines = [
+            f"📈 Status 性能统计 (累计 {self.requests} 次请求)",
+            f"💾 缓存命中率: {self.cache_hit_ratio * 100:.1f}%"
+            f" ({self.cache_hits}/{self.requests})",
+            f"🖼️ 生成字节: {_format_size(self.bytes_produced)}"
+            f" / 发送字节: {_format_size(self.bytes_sent)}",
+            "",
+            "阶段 (ms)            p50      p95      p99    n",
+        ]
+        rows = sorted(self.stage_histograms.items()) + [("total", self.total_histogram)]
+        for name, histogram in rows:
+            p50, p95, p99 = histogram.percentiles(50, 95, 99)
+            lines.append(
+                f"{name:<18}{p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {len(histogram):>4}"
+            )
+
+        slowest = self.slowest(slow_count)
+        if slowest:
+            lines.append("")
+            lines.append("🐢 最慢请求:")
+            for trace in slowest:
+                lines.append(_format_trace(trace))
+        return "\n".join(lines)
+
+
+def _format_trace(trace: RequestTrace, top: int = 3) -> str:
+    """单行描述一次请求及其最耗时的阶段"""
+    when = time.strftime("%m-%d %H:%M:%S", time.localtime(trace.started_at))
+    heavy = sorted(trace.stages.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    detail = ", ".join(f"{name} {elapsed:.1f}" for name, elapsed in heavy)
+    tag = "缓存" if trace.cache_hit else "渲染"
+    return f"{when} {trace.total:.1f}ms [{tag}] {detail}"
+
+
+def _format_size(size: Optional[int]) -> str:
+    """格式化字节数"""
+    value = float(size or 0)
+    for unit in ["B", "KB", "MB", "GB"]:
+        if value < 1024.0:
+            return f"{value:.1f}{unit}"
+        value /= 1024.0
+    return f"{value:.1f}TB"
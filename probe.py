@@ -0,0 +1,121 @@
+"""AstrBot 进程健康探针
+
+持续测量事件循环调度延迟：每隔 interval 休眠一次，
+实际唤醒时间比预期晚多少即为这段时间里循环被阻塞的程度。
+GC 停顿通过 gc.callbacks 计时，进程资源在读取快照时按需采集。
+"""
+
+import asyncio
+import gc
+import time
+from typing import Optional
+
+import psutil
+
+from .perf import RollingHistogram
+from .system_info import BotInfo
+
+
+class BotProbe:
+    """事件循环延迟与进程健康探针"""
+
+    def __init__(self, interval: float = 0.5, window: int = 1200):
+        self.interval = interval
+        self.lag_histogram = RollingHistogram(window)
+        self.gc_histogram = RollingHistogram(window)
+        self.lag_max = 0.0
+        self.gc_max = 0.0
+        self.gc_collections = 0
+        self.process = psutil.Process()
+        self._gc_started: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self):
+        """启动探针（需在事件循环中调用，幂等）"""
+        if self._task and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run())
+        if self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+
+    async def stop(self):
+        """停止探针并移除 GC 回调"""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected) * 1000
+            self.lag_histogram.record(lag)
+            if lag > self.lag_max:
+                self.lag_max = lag
+
+    def _on_gc(self, phase: str, info: dict):
+        # GC 可能发生在任意线程，这里只做最少的工作
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+        elif phase == "stop" and self._gc_started is not None:
+            pause = (time.perf_counter() - self._gc_started) * 1000
+            self._gc_started = None
+            self.gc_collections += 1
+            self.gc_histogram.record(pause)
+            if pause > self.gc_max:
+                self.gc_max = pause
+
+    def snapshot(self) -> BotInfo:
+        """当前进程健康信息"""
+        lag_p50, lag_p99 = self.lag_histogram.percentiles(50, 99)
+        (gc_p99,) = self.gc_histogram.percentiles(99)
+
+        with self.process.oneshot():
+            rss = self.process.memory_info().rss / 1024**2
+            threads = self.process.num_threads()
+            try:
+                open_fds = self.process.num_fds()
+            except AttributeError:
+                # Windows 没有 num_fds
+                open_fds = self.process.num_handles()
+
+        tasks = len(asyncio.all_tasks(self._loop)) if self._loop else 0
+        return BotInfo(
+            loop_lag_p50=lag_p50,
+            loop_lag_p99=lag_p99,
+            loop_lag_max=self.lag_max,
+            rss=rss,
+            threads=threads,
+            open_fds=open_fds,
+            tasks=tasks,
+            gc_pause_p99=gc_p99,
+            gc_pause_max=self.gc_max,
+            gc_collections=self.gc_collections,
+        )
+
+    def format_text(self) -> str:
+        """文本形式的健康报告"""
+        info = self.snapshot()
+        samples = len(self.lag_histogram)
+        return "\n".join(
+            [
+                "🤖 Bot 进程状态",
+                f"⏱️ 事件循环延迟: p50 {info.loop_lag_p50:.2f}ms / "
+                f"p99 {info.loop_lag_p99:.2f}ms / max {info.loop_lag_max:.1f}ms"
+                f" ({samples} 个样本)",
+                f"🧠 常驻内存: {info.rss:.1f} MB",
+                f"🧵 线程: {info.threads} | 📂 文件描述符: {info.open_fds}"
+                f" | 📋 任务: {info.tasks}",
+                f"♻️ GC 停顿: p99 {info.gc_pause_p99:.2f}ms / "
+                f"max {info.gc_pause_max:.1f}ms (共 {info.gc_collections} 次)",
+            ]
+        )
@@ -0,0 +1,173 @@
+"""进程内统计采样分析器
+
+后台线程按固定频率读取 sys._current_frames()，把各线程的调用栈聚合为折叠栈
+（flamegraph.pl / speedscope 可直接读取的 collapsed 格式）。
+采样开销超过预算时自动降低采样频率，同一时间只允许一个分析任务运行。
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+class ProfilerBusy(RuntimeError):
+    """已有分析任务在运行"""
+
+
+@dataclass
+class ProfileResult:
+    """一次分析的结果"""
+
+    duration: float  # 实际时长 (秒)
+    samples: int  # 采样轮数
+    target_rate: float  # 期望采样频率 (Hz)
+    overhead: float  # 采样耗时占墙钟时间的比例
+    truncated: int = 0  # 超出栈数量上限而被归并的样本数
+    stacks: Counter = field(default_factory=Counter)
+
+    @property
+    def actual_rate(self) -> float:
+        return self.samples / self.duration if self.duration else 0.0
+
+    def top_functions(self, count: int = 15) -> List[Tuple[str, int, int]]:
+        """返回 [(函数, 自身样本数, 包含子调用的样本数)]，按自身样本数排序"""
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, hits in self.stacks.items():
+            # 第一项为线程名，不计入函数
+            frames = stack[1:]
+            if not frames:
+                continue
+            self_counts[frames[-1]] += hits
+            for frame in set(frames):
+                total_counts[frame] += hits
+        return [
+            (frame, hits, total_counts[frame])
+            for frame, hits in self_counts.most_common(count)
+        ]
+
+    def collapsed(self) -> str:
+        """折叠栈文本，每行 "线程;根;...;叶 次数" """
+        lines = [
+            f"{';'.join(stack)} {hits}"
+            for stack, hits in sorted(self.stacks.items(), key=lambda kv: -kv[1])
+        ]
+        return "\n".join(lines) + "\n"
+
+    def format_report(self, count: int = 15) -> str:
+        """热点函数文本报告"""
+        total = sum(self.stacks.values()) or 1
+        lines = [
+            f"🔥 采样分析 {self.duration:.1f}s，{self.samples} 轮采样"
+            f" ({self.actual_rate:.0f}/{self.target_rate:.0f} Hz)",
+            f"⚖️ 采样开销: {self.overhead * 100:.2f}%",
+        ]
+        if self.truncated:
+            lines.append(f"⚠️ {self.truncated} 个样本因栈数量超限被归并")
+        lines.append("")
+        lines.append("自身%  总计%  函数")
+        for frame, self_hits, total_hits in self.top_functions(count):
+            lines.append(
+                f"{self_hits / total * 100:5.1f} {total_hits / total * 100:6.1f}  {frame}"
+            )
+        return "\n".join(lines)
+
+
+class SamplingProfiler:
+    """统计采样分析器"""
+
+    def __init__(
+        self,
+        rate: float = 100.0,
+        max_overhead: float = 0.05,
+        max_depth: int = 64,
+        max_stacks: int = 20000,
+    ):
+        self.rate = max(1.0, float(rate))
+        self.max_overhead = max(0.001, float(max_overhead))
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self._lock = threading.Lock()
+        self._labels: Dict[object, str] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def run(self, seconds: float) -> ProfileResult:
+        """阻塞采样 seconds 秒，应在独立线程中调用；已有任务运行时抛出 ProfilerBusy"""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy("已有分析任务正在运行")
+        try:
+            return self._sample(seconds)
+        finally:
+            self._labels.clear()
+            self._lock.release()
+
+    def _sample(self, seconds: float) -> ProfileResult:
+        interval = 1.0 / self.rate
+        own_ident = threading.get_ident()
+        stacks: Counter = Counter()
+        truncated = 0
+        samples = 0
+        busy = 0.0
+
+        started = time.perf_counter()
+        deadline = started + seconds
+        while True:
+            tick = time.perf_counter()
+            if tick >= deadline:
+                break
+
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = self._walk(names.get(ident, f"thread-{ident}"), frame)
+                if stack in stacks or len(stacks) < self.max_stacks:
+                    stacks[stack] += 1
+                else:
+                    stacks[(stack[0], "<truncated>")] += 1
+                    truncated += 1
+            del frame
+            samples += 1
+
+            cost = time.perf_counter() - tick
+            busy += cost
+            # 保证采样耗时不超过 max_overhead：耗时越高，休眠越长
+            pause = max(interval - cost, cost / self.max_overhead - cost)
+            time.sleep(min(pause, max(0.0, deadline - time.perf_counter())))
+
+        duration = time.perf_counter() - started
+        return ProfileResult(
+            duration=duration,
+            samples=samples,
+            target_rate=self.rate,
+            overhead=busy / duration if duration else 0.0,
+            truncated=truncated,
+            stacks=stacks,
+        )
+
+    def _walk(self, thread_name: str, frame) -> Tuple[str, ...]:
+        """从叶到根遍历栈帧，返回根在前的标签元组"""
+        labels = []
+        depth = 0
+        while frame is not None and depth < self.max_depth:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = (
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}"
+                    f":{code.co_firstlineno})"
+                )
+                self._labels[code] = label
+            labels.append(label)
+            frame = frame.f_back
+            depth += 1
+        labels.append(thread_name)
+        labels.reverse()
+        return tuple(labels)
@@ -0,0 +1,130 @@
+"""状态命令限流模块
+
+按用户、群组和全局三级令牌桶限流。令牌在取用时按经过的时间惰性补充，
+每次请求只触碰至多三个桶，簿记为 O(1)；长时间未使用的桶按 LRU 顺序淘汰。
+"""
+
+import time
+from collections import Counter, OrderedDict
+from typing import Optional, Tuple
+
+
+class TokenBucket:
+    """令牌桶，rate 为每秒补充的令牌数"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def refill(self, now: float) -> float:
+        """补充令牌并返回当前令牌数"""
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+        return self.tokens
+
+    def wait_time(self) -> float:
+        """距离下一个令牌可用还需的秒数"""
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """用户 / 群组 / 全局三级令牌桶
+
+    每级的 per_minute 为 0 时表示该级不限流。
+    """
+
+    SCOPE_LABELS = {"user": "用户", "group": "群组", "global": "全局"}
+
+    def __init__(
+        self,
+        user: Tuple[float, float] = (6, 3),
+        group: Tuple[float, float] = (12, 5),
+        global_: Tuple[float, float] = (30, 10),
+        idle_seconds: float = 600.0,
+    ):
+        # (每分钟令牌数, 突发上限)
+        self.limits = {"user": user, "group": group, "global": global_}
+        self.idle_seconds = idle_seconds
+        self.buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self.throttled: Counter = Counter()
+        self.allowed = 0
+        self.exempted = 0
+
+    def _bucket(self, scope: str, key: str, now: float) -> Optional[TokenBucket]:
+        per_minute, burst = self.limits[scope]
+        if per_minute <= 0:
+            return None
+        bucket_key = (scope, key)
+        bucket = self.buckets.get(bucket_key)
+        if bucket is None:
+            bucket = TokenBucket(per_minute / 60, max(1.0, float(burst)), now)
+            self.buckets[bucket_key] = bucket
+        else:
+            self.buckets.move_to_end(bucket_key)
+        bucket.refill(now)
+        return bucket
+
+    def _evict(self, now: float):
+        """淘汰空闲桶：OrderedDict 按最近使用排序，只需检查队首"""
+        while self.buckets:
+            bucket = next(iter(self.buckets.values()))
+            if now - bucket.updated < self.idle_seconds:
+                break
+            self.buckets.popitem(last=False)
+
+    def acquire(
+        self,
+        user_id: str,
+        group_id: str = "",
+        now: Optional[float] = None,
+        exempt: bool = False,
+    ) -> Optional[Tuple[str, float]]:
+        """尝试放行一次请求
+
+        放行返回 None；被限流时返回 (触发限流的级别, 建议等待秒数)，且不消耗任何令牌。
+        exempt 为真（管理员）时直接放行，不消耗也不创建令牌桶。
+        """
+        if exempt:
+            self.exempted += 1
+            return None
+        now = time.monotonic() if now is None else now
+        self._evict(now)
+
+        scopes = [("user", str(user_id)), ("global", "")]
+        if group_id:
+            scopes.insert(1, ("group", str(group_id)))
+
+        buckets = []
+        for scope, key in scopes:
+            bucket = self._bucket(scope, key, now)
+            if bucket is None:
+                continue
+            if bucket.tokens < 1:
+                self.throttled[scope] += 1
+                return scope, bucket.wait_time()
+            buckets.append(bucket)
+
+        for bucket in buckets:
+            bucket.tokens -= 1
+        self.allowed += 1
+        return None
+
+    def format_report(self) -> str:
+        """限流统计"""
+        throttled = ", ".join(
+            f"{self.SCOPE_LABELS[scope]} {count}"
+            for scope, count in self.throttled.items()
+        )
+        return (
+            f"🚦 限流: 放行 {self.allowed} 次，拦截 {sum(self.throttled.values())} 次"
+            f"{f' ({throttled})' if throttled else ''}，管理员免限 {self.exempted} 次，"
+            f"活跃令牌桶 {len(self.buckets)} 个"
+        )
@@ -0,0 +1,301 @@
+"""状态回放动画
+
+把后台采样器保留的历史逐帧套用到当前状态上，生成 APNG 动画：
+
+- 各帧共用渲染器的背景与换色结果，只重绘内容变化的组件（增量合成）
+- 第一帧量化出 255 色调色板后所有帧共用，后续帧只量化重绘过的区域
+- 后续帧只写入变化范围，未变化的像素写为透明索引并叠加到上一帧，几乎不占体积
+- 帧数、输出字节数与渲染耗时都有硬上限，达到上限即停止追加帧
+
+只有采样器记录历史的指标（CPU、内存与趋势线）随时间变化，其余内容取当前值；
+没有每核历史，回放中不显示每核热力图。
+"""
+
+import math
+import struct
+import time
+import zlib
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from .drawplan import Box
+from .themes import get_theme
+
+# 共用调色板的前 255 项为画面颜色，最后一项为透明（未变化的像素）
+TRANSPARENT_INDEX = 255
+
+
+class ReplayError(Exception):
+    """无法生成回放（历史不足、超出上限等）"""
+
+
+@dataclass
+class ReplayLimits:
+    """回放的硬上限"""
+
+    max_frames: int = 60
+    max_bytes: int = 4 * 1024**2
+    max_seconds: float = 20.0
+    frame_ms: int = 200  # 每帧停留时间
+
+
+@dataclass
+class ReplayResult:
+    data: bytes
+    frames: int
+    seconds: float  # 覆盖的时长
+    elapsed: float  # 生成耗时
+    truncated: str = ""  # 因上限而提前结束时的说明
+
+
+def parse_replay_minutes(
+    text: str, max_minutes: float, default: float = 5.0
+) -> float:
+    """解析回放分钟数（留空取 default），超出 max_minutes 时截断
+
+    非数字、NaN、无穷大或不大于 0 时抛出 ReplayError，消息可直接回复给用户。
+    """
+    try:
+        span = float(text) if text else default
+    except ValueError:
+        span = math.nan
+    if not math.isfinite(span):
+        raise ReplayError("用法: /status replay <分钟>，例如 /status replay 5")
+    if span <= 0:
+        raise ReplayError("分钟数必须大于 0")
+    return min(span, max_minutes)
+
+
+def select_samples(count: int, window: int, max_frames: int) -> List[int]:
+    """从最近 window 个样本中均匀选出不超过 max_frames 个下标，总是包含最新样本"""
+    window = min(window, count)
+    if window <= 0 or max_frames <= 0:
+        return []
+    first = count - window
+    if window <= max_frames:
+        return list(range(first, count))
+    picks = np.linspace(first, count - 1, max_frames).round().astype(int)
+    return sorted(set(picks.tolist()))
+
+
+def frame_status(status_info: Dict, history: Dict[str, np.ndarray], index: int) -> Dict:
+    """第 index 个样本时刻的状态：替换有历史的指标，趋势线截到该时刻"""
+    info = dict(status_info)
+    cpu = status_info.get("cpu")
+    if cpu is not None:
+        usage = cpu.usage
+        if "cpu" in history:
+            usage = round(float(history["cpu"][index]), 1)
+        info["cpu"] = replace(cpu, usage=usage, per_core=[])
+    memory = status_info.get("memory")
+    if memory is not None and "ram" in history:
+        usage = round(float(history["ram"][index]), 1)
+        used = round(memory.total * usage / 100, 2)
+        info["memory"] = replace(
+            memory, usage=usage, used=used, available=round(memory.total - used, 2)
+        )
+    info["history"] = {name: values[: index + 1] for name, values in history.items()}
+    return info
+
+
+def _chunk(tag: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + tag
+        + data
+        + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+    )
+
+
+class ApngWriter:
+    """逐帧追加的调色板 APNG 编码器
+
+    只保存已压缩的帧数据；帧内容未变化时延长上一帧的停留时间。
+    """
+
+    def __init__(self, size: Tuple[int, int], palette: List[int], frame_ms: int):
+        self.size = size
+        self.palette = bytes(palette[: TRANSPARENT_INDEX * 3])
+        self.frame_ms = frame_ms
+        # (x, y, 宽, 高, 停留毫秒, 叠加方式, 压缩数据)
+        self.frames: List[list] = []
+        self.total_bytes = 0
+
+    @staticmethod
+    def _compress(indices: np.ndarray) -> bytes:
+        # 每行前加过滤类型 0（None），调色板图像用其他过滤器收益很小
+        rows = np.zeros((indices.shape[0], indices.shape[1] + 1), dtype=np.uint8)
+        rows[:, 1:] = indices
+        return zlib.compress(rows.tobytes(), 6)
+
+    def add(self, indices: np.ndarray, xy: Tuple[int, int], blend: int) -> int:
+        """追加一帧（indices 为该帧范围内的调色板索引），返回压缩后字节数"""
+        data = self._compress(indices)
+        height, width = indices.shape
+        self.frames.append([xy[0], xy[1], width, height, self.frame_ms, blend, data])
+        self.total_bytes += len(data) + 64  # 另计 fcTL 等块的开销
+        return len(data)
+
+    def hold(self):
+        """画面不变：上一帧多停留一个帧间隔"""
+        if self.frames:
+            self.frames[-1][4] = min(65535, self.frames[-1][4] + self.frame_ms)
+
+    def getvalue(self) -> bytes:
+        width, height = self.size
+        palette = self.palette.ljust(TRANSPARENT_INDEX * 3, b"\0")
+        # 透明项与第 0 项同色，不支持 APNG 的查看器显示首帧时也不会出现异色
+        palette += palette[:3]
+        alpha = b"\xff" * TRANSPARENT_INDEX + b"\0"
+
+        parts = [
+            b"\x89PNG\r\n\x1a\n",
+            _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)),
+            _chunk(b"acTL", struct.pack(">II", len(self.frames), 0)),
+            _chunk(b"PLTE", palette),
+            _chunk(b"tRNS", alpha),
+        ]
+        sequence = 0
+        for index, (x, y, w, h, delay, blend, data) in enumerate(self.frames):
+            parts.append(
+                _chunk(
+                    b"fcTL",
+                    struct.pack(
+                        ">IIIIIHHBB", sequence, w, h, x, y, delay, 1000, 0, blend
+                    ),
+                )
+            )
+            sequence += 1
+            if index == 0:
+                parts.append(_chunk(b"IDAT", data))
+            else:
+                parts.append(_chunk(b"fdAT", struct.pack(">I", sequence) + data))
+                sequence += 1
+        parts.append(_chunk(b"IEND", b""))
+        return b"".join(parts)
+
+
+def _bounds(regions: List[Box]) -> Box:
+    return (
+        min(r[0] for r in regions),
+        min(r[1] for r in regions),
+        max(r[2] for r in regions),
+        max(r[3] for r in regions),
+    )
+
+
+class ReplayRenderer:
+    """用 KawaiiStatusRenderer 生成回放动画"""
+
+    # 时间标签位置（昵称下方、CPU 环形图上方）
+    caption_xy = (103, 664)
+
+    def __init__(self, limits: Optional[ReplayLimits] = None):
+        self.limits = limits or ReplayLimits()
+
+    def render(
+        self,
+        renderer,
+        status_info: Dict,
+        history: Dict[str, np.ndarray],
+        interval: float,
+        last_tick: float,
+        minutes: float,
+        theme: Optional[str] = None,
+    ) -> ReplayResult:
+        """生成最近 minutes 分钟的回放（CPU 密集，应在线程中调用）"""
+        limits = self.limits
+        started = time.perf_counter()
+        deadline = started + limits.max_seconds
+        count = min((len(values) for values in history.values()), default=0)
+        window = int(minutes * 60 / interval) + 1
+        indices = select_samples(count, window, limits.max_frames)
+        if len(indices) < 2:
+            raise ReplayError("历史样本不足，请稍后再试")
+
+        resolved = get_theme(theme)
+        frames: Dict = {}
+        writer: Optional[ApngWriter] = None
+        palette_img: Optional[Image.Image] = None
+        canvas: Optional[np.ndarray] = None
+        rendered = 0
+        truncated = ""
+        for index in indices:
+            if writer and time.perf_counter() > deadline:
+                truncated = f"达到渲染时间上限 {limits.max_seconds:g}s"
+                break
+            plan = renderer.plan(frame_status(status_info, history, index))
+            timestamp = last_tick - (count - 1 - index) * interval
+            plan.text(
+                self.caption_xy,
+                time.strftime("REPLAY %H:%M:%S", time.localtime(timestamp)),
+                font=renderer.adlam_fnt,
+                fill=renderer.nickname_color,
+            )
+            plan = renderer.themed(plan, resolved)
+            frame = renderer.compose(plan, theme=resolved, frames=frames)
+            regions = frames[resolved.name][2]
+
+            if writer is None:
+                # 第一帧决定共用调色板
+                first = frame.convert("RGB").quantize(
+                    TRANSPARENT_INDEX, method=Image.FASTOCTREE
+                )
+                palette = (first.getpalette() or [])[: TRANSPARENT_INDEX * 3]
+                palette += [0] * (TRANSPARENT_INDEX * 3 - len(palette))
+                palette_img = Image.new("P", (1, 1))
+                palette_img.putpalette(palette + palette[:3])
+                canvas = np.array(first)
+                writer = ApngWriter(frame.size, palette, limits.frame_ms)
+                writer.add(canvas, (0, 0), blend=0)
+                if writer.total_bytes > limits.max_bytes:
+                    raise ReplayError("单帧已超出回放大小上限")
+                rendered = index
+                continue
+
+            if regions is None:
+                regions = [(0, 0) + frame.size]
+            if not regions:
+                writer.hold()
+                rendered = index
+                continue
+            left, top, right, bottom = _bounds(regions)
+            before = canvas[top:bottom, left:right].copy()
+            for box in regions:
+                quantized = frame.crop(box).convert("RGB").quantize(
+                    palette=palette_img, dither=Image.NONE
+                )
+                canvas[box[1] : box[3], box[0] : box[2]] = np.asarray(quantized)
+            after = canvas[top:bottom, left:right]
+            # 调色板最后一项与第 0 项同色，量化到它的像素按第 0 项处理
+            after[after == TRANSPARENT_INDEX] = 0
+
+            changed = after != before
+            if not changed.any():
+                writer.hold()
+                rendered = index
+                continue
+            rows = np.flatnonzero(changed.any(axis=1))
+            cols = np.flatnonzero(changed.any(axis=0))
+            r0, r1, c0, c1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+            delta = np.where(
+                changed[r0:r1, c0:c1], after[r0:r1, c0:c1], TRANSPARENT_INDEX
+            ).astype(np.uint8)
+            size = writer.add(delta, (left + c0, top + r0), blend=1)
+            if writer.total_bytes > limits.max_bytes:
+                writer.frames.pop()
+                writer.total_bytes -= size + 64
+                truncated = f"达到大小上限 {limits.max_bytes / 1024**2:.1f}MB"
+                break
+            rendered = index
+
+        return ReplayResult(
+            data=writer.getvalue(),
+            frames=len(writer.frames),
+            seconds=(rendered - indices[0]) * interval,
+            elapsed=time.perf_counter() - started,
+            truncated=truncated,
+        )
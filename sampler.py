@@ -0,0 +1,144 @@
+"""后台采样模块
+
+在独立线程中按固定间隔采样，命令处理时直接读取最近一次结果，
+避免每次请求都阻塞调用 cpu_percent(interval=1)。
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import psutil
+
+from .history import MetricHistory
+
+logger = logging.getLogger(__name__)
+
+# 保留历史的指标
+HISTORY_METRICS = ("cpu", "ram", "net_up", "net_down", "disk_io")
+
+
+class StatusSampler:
+    """周期采样器，每次采样后依次通知监听者"""
+
+    def __init__(self, interval: float = 2.0, history_minutes: float = 10):
+        self.interval = max(0.2, float(interval))
+        self.per_core: List[float] = []
+        self.cpu_usage = 0.0
+        self.memory_usage = 0.0
+        self.swap_usage = 0.0
+        self.disk_usage = 0.0
+        self.net_up_rate = 0.0  # 字节/秒
+        self.net_down_rate = 0.0
+        self.disk_io_rate = 0.0  # 读写合计 字节/秒
+        self.ticks = 0
+        self.last_tick = 0.0
+
+        capacity = int(history_minutes * 60 / self.interval) or 1
+        self.history: Dict[str, MetricHistory] = {
+            name: MetricHistory(capacity) for name in HISTORY_METRICS
+        }
+        self._last_counters: Optional[Tuple[float, int, int, int]] = None
+        self._listeners: List[Callable[["StatusSampler"], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: Callable[["StatusSampler"], None]):
+        """注册采样回调（在采样线程中执行，应保持轻量）"""
+        self._listeners.append(listener)
+
+    def start(self):
+        """启动采样线程（幂等）"""
+        if self._thread and self._thread.is_alive():
+            return
+        # 非阻塞调用返回自 psutil 导入（或上次调用）以来的使用率，同时建立基准；
+        # 先记下它，首次采样前的请求也不会退回到阻塞 1 秒的 cpu_percent(interval=1)
+        self.per_core = psutil.cpu_percent(percpu=True)
+        self.cpu_usage = (
+            round(sum(self.per_core) / len(self.per_core), 1) if self.per_core else 0.0
+        )
+        self._sample_rates()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="status-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """停止采样线程"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def sample(self):
+        """执行一次采样"""
+        per_core = psutil.cpu_percent(percpu=True)
+        self.per_core = per_core
+        self.cpu_usage = round(sum(per_core) / len(per_core), 1) if per_core else 0.0
+        self.memory_usage = psutil.virtual_memory().percent
+        self.disk_usage = psutil.disk_usage("/").percent
+        try:
+            self.swap_usage = psutil.swap_memory().percent
+        except (OSError, AttributeError):
+            self.swap_usage = 0.0
+        self._sample_rates()
+        self.ticks += 1
+        self.last_tick = time.time()
+
+        self.history["cpu"].append(self.cpu_usage)
+        self.history["ram"].append(self.memory_usage)
+        self.history["net_up"].append(self.net_up_rate)
+        self.history["net_down"].append(self.net_down_rate)
+        self.history["disk_io"].append(self.disk_io_rate)
+
+        for listener in self._listeners:
+            try:
+                listener(self)
+            except Exception as e:
+                logger.error(f"采样回调执行失败: {e}")
+
+    def _sample_rates(self):
+        """由累计计数器的差值计算网络与磁盘吞吐"""
+        now = time.monotonic()
+        net = psutil.net_io_counters()
+        sent, recv = (net.bytes_sent, net.bytes_recv) if net else (0, 0)
+        try:
+            disk = psutil.disk_io_counters()
+        except (OSError, AttributeError):
+            disk = None
+        disk_bytes = disk.read_bytes + disk.write_bytes if disk else 0
+
+        if self._last_counters:
+            last_time, last_sent, last_recv, last_disk = self._last_counters
+            elapsed = max(now - last_time, 1e-6)
+            # 计数器可能因网卡重置而回退，此时记为 0
+            self.net_up_rate = max(0, sent - last_sent) / elapsed
+            self.net_down_rate = max(0, recv - last_recv) / elapsed
+            self.disk_io_rate = max(0, disk_bytes - last_disk) / elapsed
+        self._last_counters = (now, sent, recv, disk_bytes)
+
+    def metrics(self) -> Dict[str, float]:
+        """最近一次采样的各项指标"""
+        return {
+            "cpu": self.cpu_usage,
+            "ram": self.memory_usage,
+            "swap": self.swap_usage,
+            "disk": self.disk_usage,
+            "net_up": self.net_up_rate,
+            "net_down": self.net_down_rate,
+            "disk_io": self.disk_io_rate,
+        }
+
+    def history_snapshot(self) -> Dict[str, np.ndarray]:
+        """各指标历史的按时间排序副本"""
+        return {name: history.values() for name, history in self.history.items()}
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                logger.error(f"状态采样失败: {e}")
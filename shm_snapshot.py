@@ -0,0 +1,248 @@
+"""共享内存状态快照
+
+插件的采样线程把最近一次采样写入一段固定布局的共享内存，本机任何进程
+（其他插件、脚本）都可以直接读取，无需再次读取 /proc 或经过 Bot。
+
+本模块只依赖标准库，可以脱离插件单独复制使用：
+
+    from shm_snapshot import SnapshotReader
+    with SnapshotReader() as reader:
+        snap = reader.read()
+        print(snap.cpu, snap.per_core)
+
+或直接运行 ``python shm_snapshot.py`` 打印当前快照。
+
+并发一致性采用 seqlock：写入方先把序号加一（变为奇数），写完数据后再加一（变回偶数）；
+读取方在序号为偶数且读取前后序号相同时才接受读到的数据，否则重试。
+写入方只有一个（采样线程），读取方不加锁、不阻塞写入方。
+
+头部记录写入方的 pid：同名段已存在时，只有原写入进程已退出（异常退出遗留）才接管，
+否则拒绝创建；关闭时也只删除仍归本进程所有的段。
+"""
+
+import os
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+DEFAULT_NAME = "astrbot_status"
+MAGIC = b"ASTS"
+LAYOUT_VERSION = 1
+MAX_CORES = 1024
+
+# 头部：魔数, 布局版本, 每核槽位数, 写入方 pid, 序号
+_HEADER = struct.Struct("<4sIIIQ")
+# 数据：时间戳, 采样序号, 采样间隔, cpu, ram, swap, disk, net_up, net_down, disk_io, 核心数
+_BODY = struct.Struct("<dQd7dI")
+_CORES = struct.Struct(f"<{MAX_CORES}f")
+_SEQ_OFFSET = 16
+_BODY_OFFSET = _HEADER.size
+_CORES_OFFSET = _BODY_OFFSET + ((_BODY.size + 7) // 8) * 8
+SEGMENT_SIZE = _CORES_OFFSET + _CORES.size
+
+METRICS = ("cpu", "ram", "swap", "disk", "net_up", "net_down", "disk_io")
+
+
+class Snapshot(NamedTuple):
+    """一次采样（百分比为 0-100，吞吐为字节/秒）"""
+
+    timestamp: float
+    ticks: int
+    interval: float
+    cpu: float
+    ram: float
+    swap: float
+    disk: float
+    net_up: float
+    net_down: float
+    disk_io: float
+    per_core: Tuple[float, ...]
+
+    def age(self) -> float:
+        """距采样时刻的秒数"""
+        return time.time() - self.timestamp
+
+
+class SnapshotWriter:
+    """创建共享内存段并发布快照（每个段只应有一个写入方）"""
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        try:
+            self.shm = shared_memory.SharedMemory(
+                name=name, create=True, size=SEGMENT_SIZE
+            )
+        except FileExistsError:
+            owner = _segment_owner(name)
+            if owner and owner != os.getpid() and _pid_alive(owner):
+                raise FileExistsError(
+                    f"共享内存段 {name} 正由进程 {owner} 写入，请换用其他名称"
+                ) from None
+            # 上次运行异常退出遗留的段：布局相同则接管，否则重建
+            self.shm = shared_memory.SharedMemory(name=name)
+            if self.shm.size < SEGMENT_SIZE:
+                self.shm.close()
+                self.shm.unlink()
+                self.shm = shared_memory.SharedMemory(
+                    name=name, create=True, size=SEGMENT_SIZE
+                )
+        self.name = name
+        self._seq = 0
+        _HEADER.pack_into(
+            self.shm.buf, 0, MAGIC, LAYOUT_VERSION, MAX_CORES, os.getpid(), 0
+        )
+
+    def publish(
+        self,
+        metrics: Dict[str, float],
+        per_core: List[float],
+        ticks: int = 0,
+        interval: float = 0.0,
+        timestamp: Optional[float] = None,
+    ):
+        """写入一次采样"""
+        buf = self.shm.buf
+        count = min(len(per_core), MAX_CORES)
+        body = _BODY.pack(
+            time.time() if timestamp is None else timestamp,
+            ticks,
+            interval,
+            *(float(metrics.get(name, 0.0)) for name in METRICS),
+            count,
+        )
+
+        self._seq += 1  # 奇数：写入中
+        struct.pack_into("<Q", buf, _SEQ_OFFSET, self._seq)
+        buf[_BODY_OFFSET : _BODY_OFFSET + _BODY.size] = body
+        if count:
+            struct.pack_into(f"<{count}f", buf, _CORES_OFFSET, *per_core[:count])
+        self._seq += 1  # 偶数：写入完成
+        struct.pack_into("<Q", buf, _SEQ_OFFSET, self._seq)
+
+    def close(self, unlink: bool = True):
+        """关闭映射；unlink 时只删除仍归本进程所有的段"""
+        self.shm.close()
+        if not unlink:
+            return
+        if _segment_owner(self.name) == os.getpid():
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+        elif os.name != "nt":
+            # 段已被删除或重建：撤销登记，避免本进程退出时 resource_tracker 删掉它
+            from multiprocessing import resource_tracker
+
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """附加到已有的段，且不登记到 resource_tracker
+
+    附加方被登记后，其进程退出时 resource_tracker 会把共享内存段一并删除。
+    3.13 起可用 track=False；更早的版本在附加期间临时屏蔽登记。
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    from multiprocessing import resource_tracker
+
+    register = resource_tracker.register
+
+    def skip_shared_memory(resource_name, rtype):
+        if rtype != "shared_memory":
+            register(resource_name, rtype)
+
+    resource_tracker.register = skip_shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _segment_owner(name: str) -> Optional[int]:
+    """同名段头部记录的写入方 pid；段不存在或不是快照段时返回 None"""
+    try:
+        shm = _attach(name)
+    except FileNotFoundError:
+        return None
+    try:
+        if shm.size < _HEADER.size:
+            return None
+        magic, _, _, pid, _ = _HEADER.unpack_from(shm.buf, 0)
+        return pid if magic == MAGIC else None
+    finally:
+        shm.close()
+
+
+def _pid_alive(pid: int) -> bool:
+    """进程是否仍存在（信号 0 只做存在性检查，不发送信号）"""
+    if os.name == "nt":
+        # Windows 上信号 0 是 CTRL_C_EVENT；且段随最后一个句柄关闭而释放，
+        # 能打开同名段即说明仍有进程持有
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # 进程存在但属于其他用户
+    return True
+
+
+class SnapshotReader:
+    """只读地附加到共享内存段"""
+
+    def __init__(self, name: str = DEFAULT_NAME, max_retries: int = 10000):
+        self.shm = _attach(name)
+        magic, version, max_cores, _, _ = _HEADER.unpack_from(self.shm.buf, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION or max_cores != MAX_CORES:
+            self.shm.close()
+            raise ValueError(f"共享内存段 {name} 的布局不兼容")
+        self.max_retries = max_retries
+
+    def read(self) -> Snapshot:
+        """读取一致的快照；写入方持续占用时抛出 TimeoutError"""
+        buf = self.shm.buf
+        for _ in range(self.max_retries):
+            (seq,) = struct.unpack_from("<Q", buf, _SEQ_OFFSET)
+            if seq & 1:
+                continue
+            body = _BODY.unpack_from(buf, _BODY_OFFSET)
+            count = min(body[-1], MAX_CORES)
+            per_core = struct.unpack_from(f"<{count}f", buf, _CORES_OFFSET)
+            (seq_after,) = struct.unpack_from("<Q", buf, _SEQ_OFFSET)
+            if seq == seq_after:
+                if seq == 0:
+                    raise LookupError("尚未发布任何快照")
+                return Snapshot(*body[:-1], per_core)
+        raise TimeoutError("读取共享内存快照失败：写入方持续更新")
+
+    def close(self):
+        self.shm.close()
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None) -> int:
+    name = (argv if argv is not None else sys.argv[1:]) or [DEFAULT_NAME]
+    try:
+        with SnapshotReader(name[0]) as reader:
+            snap = reader.read()
+    except (FileNotFoundError, LookupError, ValueError) as e:
+        print(f"无法读取快照: {e}", file=sys.stderr)
+        return 1
+    print(f"采样于 {snap.age():.1f}s 前 (第 {snap.ticks} 次，间隔 {snap.interval}s)")
+    for metric in METRICS:
+        print(f"{metric:>9}: {getattr(snap, metric):.1f}")
+    print(f" per_core: {' '.join(f'{v:.0f}' for v in snap.per_core)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""状态快照二进制编解码
+
+用于 agent 与聚合器之间传输，格式为定长数值区 + 长度前缀字符串区，
+所有整数与浮点均使用网络字节序。
+"""
+
+import asyncio
+import math
+import struct
+import time
+from typing import Dict, Optional, Tuple
+
+from .system_info import (
+    CPUInfo,
+    DiskInfo,
+    GPUInfo,
+    MemoryInfo,
+    NetworkInfo,
+    SwapInfo,
+    SystemInfo,
+)
+
+PROTOCOL_VERSION = 2
+_MIN_VERSION = 1  # 版本 1 不含每核使用率
+
+# 帧类型
+FRAME_HELLO = 1
+FRAME_SNAPSHOT = 2
+FRAME_HEARTBEAT = 3
+
+FRAME_HEADER = struct.Struct("!BI")  # 帧类型, 负载长度
+MAX_FRAME_SIZE = 1024 * 1024
+
+# 可选分区标记
+_HAS_SWAP = 1
+_HAS_NETWORK = 2
+_HAS_GPU = 4
+
+_FIXED = struct.Struct(
+    "!B"  # 协议版本
+    "B"  # 可选分区标记
+    "d"  # 采集时间戳
+    "ffHf"  # CPU: 使用率, 频率, 核心数, 温度
+    "ffff"  # 内存: 总量, 已用, 可用, 使用率
+    "fff"  # 交换: 总量, 已用, 使用率
+    "ffff"  # 磁盘: 总量, 已用, 可用, 使用率
+    "QQQQff"  # 网络: 收发字节, 收发包数, 上下行速度
+    "ffff"  # GPU: 使用率, 已用显存, 总显存, 温度
+    "dI"  # 系统: 启动时间, 进程数
+)
+_STRING_LEN = struct.Struct("!H")
+_CORE_COUNT = struct.Struct("!H")  # 之后每核一个字节，取值 0-200 (0.5% 精度)
+
+
+class SnapshotError(ValueError):
+    """快照格式错误"""
+
+
+def _opt(value: Optional[float]) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _unopt(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _pack_strings(*values: str) -> bytes:
+    parts = []
+    for value in values:
+        data = value.encode("utf-8")[:0xFFFF]
+        parts.append(_STRING_LEN.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def _unpack_strings(data: bytes, offset: int, count: int) -> Tuple[list, int]:
+    values = []
+    for _ in range(count):
+        if offset + _STRING_LEN.size > len(data):
+            raise SnapshotError("字符串区被截断")
+        (length,) = _STRING_LEN.unpack_from(data, offset)
+        offset += _STRING_LEN.size
+        if offset + length > len(data):
+            raise SnapshotError("字符串区被截断")
+        values.append(data[offset : offset + length].decode("utf-8", "replace"))
+        offset += length
+    return values, offset
+
+
+def encode_snapshot(status_info: Dict, timestamp: Optional[float] = None) -> bytes:
+    """把 get_all_status_info() 的结果编码为紧凑二进制"""
+    cpu: CPUInfo = status_info["cpu"]
+    memory: MemoryInfo = status_info["memory"]
+    disk: DiskInfo = status_info["disk"]
+    system: SystemInfo = status_info["system"]
+    swap: Optional[SwapInfo] = status_info.get("swap")
+    network: Optional[NetworkInfo] = status_info.get("network")
+    gpu: Optional[GPUInfo] = status_info.get("gpu")
+
+    flags = (
+        (_HAS_SWAP if swap else 0)
+        | (_HAS_NETWORK if network else 0)
+        | (_HAS_GPU if gpu else 0)
+    )
+    swap = swap or SwapInfo(0.0, 0.0, 0.0)
+    network = network or NetworkInfo(0, 0, 0, 0, 0.0, 0.0)
+    gpu = gpu or GPUInfo("", 0.0, 0.0, 0.0)
+
+    fixed = _FIXED.pack(
+        PROTOCOL_VERSION,
+        flags,
+        time.time() if timestamp is None else timestamp,
+        cpu.usage,
+        cpu.freq,
+        min(cpu.cores, 0xFFFF),
+        _opt(cpu.temperature),
+        memory.total,
+        memory.used,
+        memory.available,
+        memory.usage,
+        swap.total,
+        swap.used,
+        swap.usage,
+        disk.total,
+        disk.used,
+        disk.free,
+        disk.usage,
+        network.bytes_sent,
+        network.bytes_recv,
+        network.packets_sent,
+        network.packets_recv,
+        network.upload_speed,
+        network.download_speed,
+        gpu.usage,
+        gpu.memory_used,
+        gpu.memory_total,
+        _opt(gpu.temperature),
+        system.boot_time,
+        system.process_count,
+    )
+    strings = _pack_strings(
+        cpu.brand,
+        gpu.name,
+        system.hostname,
+        system.system,
+        system.release,
+        system.architecture,
+        system.uptime,
+    )
+    per_core = (cpu.per_core or [])[:0xFFFF]
+    cores = _CORE_COUNT.pack(len(per_core)) + bytes(
+        max(0, min(200, round(value * 2))) for value in per_core
+    )
+    return fixed + strings + cores
+
+
+def decode_snapshot(data: bytes) -> Tuple[float, Dict]:
+    """解码快照，返回 (采集时间戳, status_info)"""
+    if len(data) < _FIXED.size:
+        raise SnapshotError("快照长度不足")
+    fields = _FIXED.unpack_from(data, 0)
+    version = fields[0]
+    if not _MIN_VERSION <= version <= PROTOCOL_VERSION:
+        raise SnapshotError(f"不支持的快照版本: {version}")
+    (
+        brand,
+        gpu_name,
+        hostname,
+        system_name,
+        release,
+        architecture,
+        uptime,
+    ), offset = _unpack_strings(data, _FIXED.size, 7)
+
+    per_core = None
+    if version >= 2:
+        if offset + _CORE_COUNT.size > len(data):
+            raise SnapshotError("每核数据被截断")
+        (count,) = _CORE_COUNT.unpack_from(data, offset)
+        offset += _CORE_COUNT.size
+        if offset + count > len(data):
+            raise SnapshotError("每核数据被截断")
+        per_core = [value / 2 for value in data[offset : offset + count]]
+
+    (
+        _,
+        flags,
+        timestamp,
+        cpu_usage,
+        cpu_freq,
+        cpu_cores,
+        cpu_temp,
+        mem_total,
+        mem_used,
+        mem_available,
+        mem_usage,
+        swap_total,
+        swap_used,
+        swap_usage,
+        disk_total,
+        disk_used,
+        disk_free,
+        disk_usage,
+        bytes_sent,
+        bytes_recv,
+        packets_sent,
+        packets_recv,
+        upload_speed,
+        download_speed,
+        gpu_usage,
+        gpu_mem_used,
+        gpu_mem_total,
+        gpu_temp,
+        boot_time,
+        process_count,
+    ) = fields
+
+    status_info = {
+        "cpu": CPUInfo(
+            usage=cpu_usage,
+            freq=round(cpu_freq, 2),
+            cores=cpu_cores,
+            brand=brand,
+            temperature=_unopt(cpu_temp),
+            per_core=per_core,
+        ),
+        "memory": MemoryInfo(
+            total=mem_total, used=mem_used, available=mem_available, usage=mem_usage
+        ),
+        "disk": DiskInfo(
+            total=disk_total, used=disk_used, free=disk_free, usage=disk_usage
+        ),
+        "system": SystemInfo(
+            hostname=hostname,
+            system=system_name,
+            release=release,
+            architecture=architecture,
+            boot_time=boot_time,
+            uptime=uptime,
+            process_count=process_count,
+        ),
+    }
+    if flags & _HAS_SWAP:
+        status_info["swap"] = SwapInfo(
+            total=swap_total, used=swap_used, usage=swap_usage
+        )
+    if flags & _HAS_NETWORK:
+        status_info["network"] = NetworkInfo(
+            bytes_sent=bytes_sent,
+            bytes_recv=bytes_recv,
+            packets_sent=packets_sent,
+            packets_recv=packets_recv,
+            upload_speed=upload_speed,
+            download_speed=download_speed,
+        )
+    if flags & _HAS_GPU:
+        status_info["gpu"] = GPUInfo(
+            name=gpu_name,
+            usage=gpu_usage,
+            memory_used=gpu_mem_used,
+            memory_total=gpu_mem_total,
+            temperature=_unopt(gpu_temp),
+        )
+    return timestamp, status_info
+
+
+def pack_frame(frame_type: int, payload: bytes = b"") -> bytes:
+    """打包一帧"""
+    return FRAME_HEADER.pack(frame_type, len(payload)) + payload
+
+
+async def read_frame(reader) -> Tuple[int, bytes]:
+    """从 asyncio.StreamReader 读取一帧"""
+    header = await reader.readexactly(FRAME_HEADER.size)
+    frame_type, length = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise SnapshotError(f"帧过大: {length} 字节")
+    payload = await reader.readexactly(length) if length else b""
+    return frame_type, payload
+
+
+def parse_endpoint(endpoint: str) -> Tuple[str, str, int]:
+    """解析 tcp://host:port 或 unix:///path，返回 (协议, 主机或路径, 端口)"""
+    if endpoint.startswith("unix://"):
+        path = endpoint[len("unix://") :]
+        if not path:
+            raise ValueError(f"无效的 unix 地址: {endpoint}")
+        return "unix", path, 0
+    if endpoint.startswith("tcp://"):
+        endpoint = endpoint[len("tcp://") :]
+    host, sep, port = endpoint.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"无效的 tcp 地址: {endpoint}")
+    # 省略主机时只用回环地址，避免无意中对外暴露
+    return "tcp", host.strip("[]") or "127.0.0.1", int(port)
+
+
+async def open_endpoint(endpoint: str):
+    """连接到 agent，返回 (reader, writer)"""
+    scheme, host, port = parse_endpoint(endpoint)
+    if scheme == "unix":
+        return await asyncio.open_unix_connection(host)
+    return await asyncio.open_connection(host, port)
+
+
+async def serve_endpoint(handler, endpoint: str):
+    """在 endpoint 上启动服务"""
+    scheme, host, port = parse_endpoint(endpoint)
+    if scheme == "unix":
+        return await asyncio.start_unix_server(handler, host)
+    return await asyncio.start_server(handler, host, port)
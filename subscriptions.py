@@ -0,0 +1,247 @@
+"""定时状态推送
+
+订阅按间隔对齐到共享的时刻（Unix 时间的整数倍），同一时刻到期的所有订阅
+共用一次采集，按会话的主题分组、每个主题渲染一次，再以有限并发、
+带单次超时的方式发送到各个会话。
+订阅列表持久化为 JSON，每个会话的发送延迟与失败次数单独统计。
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from .perf import RollingHistogram
+
+logger = logging.getLogger(__name__)
+
+_INTERVAL_RE = re.compile(r"^\s*(\d+)\s*([smhd]?)\s*$", re.IGNORECASE)
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_interval(text: str) -> int:
+    """解析 30m / 1h / 1d / 90s，纯数字按分钟计；格式错误或不大于 0 时抛出 ValueError"""
+    match = _INTERVAL_RE.match(str(text))
+    if not match:
+        raise ValueError(f"无法解析间隔: {text}")
+    value, unit = int(match[1]), (match[2] or "m").lower()
+    if value <= 0:
+        raise ValueError(f"间隔必须大于 0: {text}")
+    return value * _UNITS[unit]
+
+
+def format_interval(seconds: int) -> str:
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+
+@dataclass
+class Subscription:
+    """单个会话的订阅"""
+
+    session: str
+    interval: int  # 秒
+    sent: int = 0
+    failed: int = 0
+    last_error: str = ""
+    latency: RollingHistogram = field(
+        default_factory=lambda: RollingHistogram(100), repr=False
+    )
+
+    def to_dict(self) -> Dict:
+        return {
+            "session": self.session,
+            "interval": self.interval,
+            "sent": self.sent,
+            "failed": self.failed,
+            "last_error": self.last_error,
+        }
+
+
+class BroadcastScheduler:
+    """订阅管理与对齐调度"""
+
+    def __init__(
+        self,
+        path: Path,
+        render: Callable[[List[str]], Awaitable[Dict[str, bytes]]],
+        send: Callable[[str, bytes], Awaitable[None]],
+        theme_for: Callable[[str], str] = lambda session: "",
+        concurrency: int = 4,
+        send_timeout: float = 30.0,
+    ):
+        # render 接收主题名列表，返回 {主题名: 图片}；theme_for 由会话标识得到主题名
+        self.path = path
+        self.render = render
+        self.send = send
+        self.theme_for = theme_for
+        self.concurrency = max(1, concurrency)
+        self.send_timeout = send_timeout
+        self.subscriptions: Dict[str, Subscription] = {}
+        self.ticks = 0
+        self.render_histogram = RollingHistogram(100)
+        self._changed: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.load()
+
+    def load(self):
+        """读取持久化的订阅，文件损坏时记录日志并忽略"""
+        try:
+            items = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error(f"读取订阅列表失败: {e}")
+            return
+        for item in items:
+            try:
+                subscription = Subscription(
+                    session=str(item["session"]),
+                    interval=int(item["interval"]),
+                    sent=int(item.get("sent", 0)),
+                    failed=int(item.get("failed", 0)),
+                    last_error=str(item.get("last_error", "")),
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+            # 间隔不大于 0 无法对齐调度，丢弃
+            if subscription.interval <= 0:
+                continue
+            self.subscriptions[subscription.session] = subscription
+
+    def save(self):
+        """原子地写回订阅列表"""
+        data = [s.to_dict() for s in self.subscriptions.values()]
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(
+                json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"保存订阅列表失败: {e}")
+
+    def subscribe(self, session: str, interval: int) -> Subscription:
+        subscription = self.subscriptions.get(session)
+        if subscription:
+            subscription.interval = interval
+        else:
+            subscription = Subscription(session, interval)
+            self.subscriptions[session] = subscription
+        self.save()
+        self._wake()
+        return subscription
+
+    def unsubscribe(self, session: str) -> bool:
+        if self.subscriptions.pop(session, None) is None:
+            return False
+        self.save()
+        self._wake()
+        return True
+
+    def _wake(self):
+        if self._changed is not None:
+            self._changed.set()
+
+    def start(self):
+        """启动调度循环（需在事件循环中调用，幂等）"""
+        if self._task and not self._task.done():
+            return
+        self._changed = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def next_tick(self, now: float) -> Optional[int]:
+        """所有订阅中最近的对齐时刻"""
+        if not self.subscriptions:
+            return None
+        return min(
+            (int(now) // s.interval + 1) * s.interval
+            for s in self.subscriptions.values()
+        )
+
+    async def _run(self):
+        while True:
+            self._changed.clear()
+            tick = self.next_tick(time.time())
+            timeout = None if tick is None else max(0.0, tick - time.time())
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+                continue  # 订阅变化，重新计算下一个时刻
+            except asyncio.TimeoutError:
+                pass
+
+            due = [s for s in self.subscriptions.values() if tick % s.interval == 0]
+            if due:
+                try:
+                    await self.broadcast(due)
+                except Exception as e:
+                    logger.error(f"定时推送失败: {e}")
+
+    async def broadcast(self, subscriptions: List[Subscription]):
+        """每个主题渲染一次，发送给该主题下所有到期的订阅"""
+        themes = {s.session: self.theme_for(s.session) for s in subscriptions}
+        started = time.perf_counter()
+        images = await self.render(sorted(set(themes.values())))
+        self.render_histogram.record((time.perf_counter() - started) * 1000)
+        self.ticks += 1
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def deliver(subscription: Subscription):
+            async with semaphore:
+                sent_at = time.perf_counter()
+                try:
+                    image_data = images[themes[subscription.session]]
+                    await asyncio.wait_for(
+                        self.send(subscription.session, image_data), self.send_timeout
+                    )
+                except asyncio.TimeoutError:
+                    subscription.failed += 1
+                    subscription.last_error = f"发送超时 ({self.send_timeout:g}s)"
+                except Exception as e:
+                    subscription.failed += 1
+                    subscription.last_error = str(e) or type(e).__name__
+                else:
+                    subscription.sent += 1
+                    subscription.latency.record(
+                        (time.perf_counter() - sent_at) * 1000
+                    )
+
+        await asyncio.gather(*(deliver(s) for s in subscriptions))
+        self.save()
+
+    def format_report(self) -> str:
+        """订阅列表与发送统计"""
+        if not self.subscriptions:
+            return "📭 暂无订阅"
+        (render_p50,) = self.render_histogram.percentiles(50)
+        lines = [
+            f"📬 订阅 {len(self.subscriptions)} 个，已推送 {self.ticks} 轮"
+            f" (渲染 p50 {render_p50:.0f}ms)"
+        ]
+        for s in self.subscriptions.values():
+            p50, p99 = s.latency.percentiles(50, 99)
+            line = (
+                f"• 每 {format_interval(s.interval)} {s.session}\n"
+                f"  成功 {s.sent} / 失败 {s.failed}，发送 p50 {p50:.0f}ms / p99 {p99:.0f}ms"
+            )
+            if s.last_error:
+                line += f"\n  最近错误: {s.last_error}"
+            lines.append(line)
+        return "\n".join(lines)
@@ -3,9 +3,12 @@
 import logging
 import os
 import platform
+import re
 import time
-from dataclasses import dataclass
-from typing import Dict, Optional
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Tuple
 
 import cpuinfo
 import psutil
@@ -22,6 +25,7 @@ class CPUInfo:
     cores: int  # CPU核心数
     brand: str  # CPU品牌型号
     temperature: Optional[float] = None  # CPU温度（如果可用）
+    per_core: Optional[List[float]] = None  # 每个逻辑核心的使用率百分比
 
 
 @dataclass
@@ -65,6 +69,20 @@ class NetworkInfo:
     download_speed: float  # 下载速度 (MB/s)
 
 
+@dataclass
+class SocketInfo:
+    """TCP/UDP 套接字状态汇总"""
+
+    tcp_total: int
+    established: int
+    time_wait: int
+    close_wait: int
+    listen: int
+    udp_total: int
+    states: Dict[str, int] = field(default_factory=dict)  # TCP 各状态数量
+    remote_ports: List[Tuple[int, int]] = field(default_factory=list)  # (端口, 连接数)
+
+
 @dataclass
 class GPUInfo:
     """GPU信息"""
@@ -89,6 +107,31 @@ class SystemInfo:
     process_count: int
 
 
+@dataclass
+class BotInfo:
+    """AstrBot 自身进程的健康信息"""
+
+    loop_lag_p50: float  # 事件循环调度延迟 (ms)
+    loop_lag_p99: float
+    loop_lag_max: float
+    rss: float  # 常驻内存 (MB)
+    threads: int  # 线程数
+    open_fds: int  # 打开的文件描述符数（Windows 为句柄数）
+    tasks: int  # asyncio 任务数
+    gc_pause_p99: float  # GC 停顿 (ms)
+    gc_pause_max: float
+    gc_collections: int  # 累计 GC 次数
+
+
+@dataclass
+class AstrBotInfo:
+    """AstrBot 版本与插件加载情况"""
+
+    version: str
+    plugins_loaded: int
+    plugins_failed: Optional[int]  # None 表示无法获取
+
+
 def bytes_to_gb(bytes_value: int) -> float:
     """将字节转换为GB"""
     return round(bytes_value / (1024**3), 2)
@@ -120,10 +163,21 @@ def is_docker_environment() -> bool:
         return False
 
 
-def get_cpu_info() -> CPUInfo:
-    """获取CPU信息"""
-    # CPU使用率
-    cpu_percent = psutil.cpu_percent(interval=1)
+@lru_cache(maxsize=1)
+def get_cpu_brand() -> str:
+    """CPU 型号（运行期间不变，只查询一次；cpuinfo 单次查询约需 1 秒）"""
+    return cpuinfo.get_cpu_info().get("brand_raw", "Unknown CPU")
+
+
+def get_cpu_info(per_core: Optional[List[float]] = None) -> CPUInfo:
+    """获取CPU信息
+
+    per_core 为采样器提供的每核使用率；未提供时阻塞采样 1 秒。
+    """
+    # CPU使用率（总体使用率取各核平均，与 psutil 的汇总口径一致）
+    if per_core is None:
+        per_core = psutil.cpu_percent(interval=1, percpu=True)
+    cpu_percent = round(sum(per_core) / len(per_core), 1) if per_core else 0.0
 
     # CPU频率
     cpu_freq = psutil.cpu_freq()
@@ -133,7 +187,7 @@ def get_cpu_info() -> CPUInfo:
     cores = psutil.cpu_count(logical=True)
 
     # CPU品牌信息
-    cpu_brand = cpuinfo.get_cpu_info().get("brand_raw", "Unknown CPU")
+    cpu_brand = get_cpu_brand()
 
     # 尝试获取CPU温度（可能不可用）
     temperature = None
@@ -155,6 +209,7 @@ def get_cpu_info() -> CPUInfo:
         cores=cores,
         brand=cpu_brand,
         temperature=temperature,
+        per_core=list(per_core),
     )
 
 
@@ -230,6 +285,88 @@ def get_network_info() -> NetworkInfo:
     )
 
 
+TCP_STATES = {
+    b"01": "ESTABLISHED",
+    b"02": "SYN_SENT",
+    b"03": "SYN_RECV",
+    b"04": "FIN_WAIT1",
+    b"05": "FIN_WAIT2",
+    b"06": "TIME_WAIT",
+    b"07": "CLOSE",
+    b"08": "CLOSE_WAIT",
+    b"09": "LAST_ACK",
+    b"0A": "LISTEN",
+    b"0B": "CLOSING",
+    b"0C": "NEW_SYN_RECV",
+}
+
+# 每行形如 "  12: 0100007F:1F90 0100007F:C350 01 ..."，只取出 "远端端口 状态"
+_SOCKET_RE = re.compile(
+    rb": [0-9A-F]+:[0-9A-F]{4} [0-9A-F]+:([0-9A-F]{4} [0-9A-F]{2}) "
+)
+_PROC_CHUNK = 1 << 20
+
+
+def _count_proc_net(path: str, counter: Counter) -> bool:
+    """分块读取 /proc/net/{tcp,udp}[6]，按 "远端端口 状态" 计数；文件不存在时返回 False"""
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return False
+    with f:
+        tail = b""
+        while True:
+            chunk = f.read(_PROC_CHUNK)
+            if not chunk:
+                break
+            chunk = tail + chunk
+            cut = chunk.rfind(b"\n") + 1
+            tail = chunk[cut:]
+            counter.update(_SOCKET_RE.findall(chunk, 0, cut))
+        if tail:
+            counter.update(_SOCKET_RE.findall(tail))
+    return True
+
+
+def get_socket_info(
+    proc_root: Optional[str] = None, top: int = 5
+) -> Optional[SocketInfo]:
+    """从 /proc/net 汇总套接字状态（仅 Linux，其他平台返回 None）
+
+    一次顺序扫描完成计数，不为每个连接构造对象，也不需要遍历各进程的 fd，
+    因此无需 root 即可看到本网络命名空间内的全部套接字。
+    """
+    root = proc_root or getattr(psutil, "PROCFS_PATH", "/proc")
+    tcp: Counter = Counter()
+    found = False
+    for name in ("tcp", "tcp6"):
+        found |= _count_proc_net(os.path.join(root, "net", name), tcp)
+    if not found:
+        return None
+    udp: Counter = Counter()
+    for name in ("udp", "udp6"):
+        _count_proc_net(os.path.join(root, "net", name), udp)
+
+    states: Counter = Counter()
+    ports: Counter = Counter()
+    for key, count in tcp.items():
+        port, state = key[:4], key[5:]
+        states[TCP_STATES.get(state, state.decode())] += count
+        if state != b"0A" and port != b"0000":
+            ports[int(port, 16)] += count
+
+    return SocketInfo(
+        tcp_total=sum(states.values()),
+        established=states["ESTABLISHED"],
+        time_wait=states["TIME_WAIT"],
+        close_wait=states["CLOSE_WAIT"],
+        listen=states["LISTEN"],
+        udp_total=sum(udp.values()),
+        states=dict(states),
+        remote_ports=ports.most_common(top),
+    )
+
+
 def get_gpu_info() -> GPUInfo:
     """获取GPU信息"""
     try:
@@ -340,14 +477,34 @@ def get_system_info() -> SystemInfo:
     )
 
 
-def get_all_status_info() -> Dict:
-    """获取所有状态信息"""
-    return {
-        "cpu": get_cpu_info(),
-        "memory": get_memory_info(),
-        "swap": get_swap_info(),
-        "disk": get_disk_info(),
-        "network": get_network_info(),
-        "gpu": get_gpu_info(),
-        "system": get_system_info(),
-    }
+COLLECTORS = {
+    "cpu": get_cpu_info,
+    "memory": get_memory_info,
+    "swap": get_swap_info,
+    "disk": get_disk_info,
+    "network": get_network_info,
+    "sockets": get_socket_info,
+    "gpu": get_gpu_info,
+    "system": get_system_info,
+}
+
+
+def get_all_status_info(trace=None, sampler=None) -> Dict:
+    """获取所有状态信息
+
+    trace 为可选的请求追踪对象（需提供 stage(name) 上下文管理器），
+    传入时会分别记录每个采集函数的耗时。
+    sampler 为可选的后台采样器，有数据时 CPU 使用率直接取其最近一次采样。
+    """
+    collectors = COLLECTORS
+    if sampler is not None and sampler.per_core:
+        collectors = dict(COLLECTORS, cpu=partial(get_cpu_info, sampler.per_core))
+
+    if trace is None:
+        return {name: collector() for name, collector in collectors.items()}
+
+    info = {}
+    for name, collector in collectors.items():
+        with trace.stage(f"collect.{name}"):
+            info[name] = collector()
+    return info
@@ -0,0 +1,30 @@
+"""测试共用设置
+
+复用 benchmarks/fakes.py：注入确定性的假 psutil / cpuinfo / GPU 模块，
+并以包的形式加载插件模块（插件内部使用相对导入）。
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import fakes  # noqa: E402
+
+HOST = fakes.install()
+
+
+@pytest.fixture
+def plugin():
+    """按名称加载插件子模块，例如 plugin("fleet")"""
+    return fakes.load_plugin_module
+
+
+@pytest.fixture
+def host():
+    """驱动假 psutil 的 FakeHost，测试结束后恢复其状态"""
+    saved = dict(vars(HOST))
+    yield HOST
+    vars(HOST).update(saved)
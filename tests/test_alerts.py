@@ -0,0 +1,50 @@
+def _engine(plugin, rules, **kwargs):
+    alerts = plugin("alerts")
+    sent = []
+    return alerts.AlertEngine(rules, sent.append, **kwargs), sent
+
+
+def test_flapping_rule_within_cooldown_sends_one_fire_and_one_recovery(plugin):
+    engine, sent = _engine(plugin, ["cpu > 90"], cooldown=600)
+    now = 0
+    for _ in range(20):
+        engine.evaluate({"cpu": 95.0}, now=now)
+        engine.evaluate({"cpu": 50.0}, now=now + 2)
+        now += 4
+
+    assert [text[0] for text in sent] == ["🚨", "✅"]
+    assert engine.rules[0].fired_count == 1
+
+    # 冷却结束后重新推送，对应的恢复也推送
+    engine.evaluate({"cpu": 95.0}, now=700)
+    engine.evaluate({"cpu": 50.0}, now=702)
+    assert [text[0] for text in sent] == ["🚨", "✅", "🚨", "✅"]
+
+
+def test_suppressed_fire_still_tracks_state(plugin):
+    engine, sent = _engine(plugin, ["cpu > 90"], cooldown=600)
+    engine.evaluate({"cpu": 95.0}, now=0)
+    engine.evaluate({"cpu": 50.0}, now=2)
+    engine.evaluate({"cpu": 95.0}, now=4)
+
+    rule = engine.rules[0]
+    assert rule.active and not rule.notified
+    assert len(sent) == 2
+
+
+def test_hysteresis_is_relative_to_threshold(plugin):
+    mb = 1024**2
+    engine, sent = _engine(plugin, [f"net_up > {100 * mb}"], hysteresis=5)
+    engine.evaluate({"net_up": 120.0 * mb}, now=0)
+    # 低于阈值但仍在 5% 回差内，不算恢复
+    engine.evaluate({"net_up": 96.0 * mb}, now=2)
+    assert len(sent) == 1
+    engine.evaluate({"net_up": 94.0 * mb}, now=4)
+    assert len(sent) == 2 and sent[1].startswith("✅")
+
+    engine, sent = _engine(plugin, ["cpu > 90"], hysteresis=5)
+    engine.evaluate({"cpu": 95.0}, now=0)
+    engine.evaluate({"cpu": 86.0}, now=2)
+    assert len(sent) == 1
+    engine.evaluate({"cpu": 85.0}, now=4)
+    assert len(sent) == 2
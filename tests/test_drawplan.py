@@ -0,0 +1,25 @@
+import threading
+
+
+def test_encoded_cache_is_thread_safe(plugin):
+    cache = plugin("drawplan").EncodedCache(size=4)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(5000):
+                key = bytes([(offset + i) % 16])
+                if cache.get(key) is None:
+                    cache.put(key, key)
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(cache.entries) <= 4
+    assert cache.hits + cache.misses == 8 * 5000
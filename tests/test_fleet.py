@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+
+def test_heartbeats_do_not_refresh_staleness(plugin, tmp_path):
+    """只发心跳、不再推送快照的节点应在 stale_after 后被标记为过期"""
+    fleet_mod = plugin("fleet")
+    snapshot = plugin("snapshot")
+    system_info = plugin("system_info")
+    payload = snapshot.encode_snapshot(system_info.get_all_status_info())
+    endpoint = f"unix://{tmp_path / 'agent.sock'}"
+    stale_after = 0.5
+
+    async def handle(reader, writer):
+        writer.write(snapshot.pack_frame(snapshot.FRAME_HELLO, b"2|node"))
+        writer.write(snapshot.pack_frame(snapshot.FRAME_SNAPSHOT, payload))
+        try:
+            while True:
+                writer.write(snapshot.pack_frame(snapshot.FRAME_HEARTBEAT))
+                await writer.drain()
+                await asyncio.sleep(0.05)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def scenario():
+        server = await snapshot.serve_endpoint(handle, endpoint)
+        fleet = fleet_mod.FleetAggregator({"node": endpoint}, stale_after=stale_after)
+        fleet.start()
+        state = fleet.get("node")
+        try:
+            deadline = time.monotonic() + 5
+            while state.status_info is None and time.monotonic() < deadline:
+                await asyncio.sleep(0.02)
+            assert state.status_info is not None
+            assert not state.is_stale(stale_after)
+
+            await asyncio.sleep(stale_after * 2)
+            assert state.connected
+            assert time.monotonic() - state.last_seen < stale_after
+            assert state.is_stale(stale_after)
+            assert "🟡 node" in fleet.format_overview()
+        finally:
+            await fleet.stop()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_parse_nodes_drops_invalid_endpoints(plugin):
+    fleet_mod = plugin("fleet")
+    nodes = fleet_mod.FleetAggregator.parse_nodes(
+        ["a=tcp://10.0.0.5:9477", "b=host", "c=unix:///run/a.sock", "d=", "e"]
+    )
+    assert nodes == {"a": "tcp://10.0.0.5:9477", "c": "unix:///run/a.sock"}
+
+
+def test_invalid_endpoint_is_recorded_not_fatal(plugin):
+    fleet_mod = plugin("fleet")
+
+    async def scenario():
+        fleet = fleet_mod.FleetAggregator({"bad": "host"})
+        fleet.start()
+        connection = fleet.connections["bad"]
+        state = connection.state
+        deadline = time.monotonic() + 2
+        while not state.last_error and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        try:
+            assert "无效的 tcp 地址" in state.last_error
+            assert not connection.task.done()
+        finally:
+            await fleet.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,20 @@
+def test_put_counts_writes_and_reuses(plugin, tmp_path):
+    store = plugin("imagestore").ImageStore(tmp_path, max_bytes=1024)
+
+    first = store.put(b"a" * 100)
+    assert store.put(b"a" * 100) == first
+    store.put(b"b" * 100)
+
+    assert (store.writes, store.reuses) == (2, 1)
+    assert "写入 2 次，复用 1 次" in store.format_report()
+    assert "现有 2 个" in store.format_report()
+
+
+def test_eviction_keeps_total_under_limit(plugin, tmp_path):
+    store = plugin("imagestore").ImageStore(tmp_path, max_bytes=250)
+
+    paths = [store.put(bytes([n]) * 100) for n in range(3)]
+
+    assert store.total_bytes == 200
+    assert not paths[0].exists()
+    assert paths[1].exists() and paths[2].exists()
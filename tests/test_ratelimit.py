@@ -0,0 +1,55 @@
+import pytest
+
+
+@pytest.fixture
+def limiter(plugin):
+    # 用户每分钟 6 个（每 10 秒 1 个），突发 3；群组与全局不限
+    return plugin("ratelimit").RateLimiter(user=(6, 3), group=(0, 0), global_=(0, 0))
+
+
+def test_burst_then_throttle(limiter):
+    assert all(limiter.acquire("u", now=0.0) is None for _ in range(3))
+    scope, wait = limiter.acquire("u", now=0.0)
+    assert scope == "user" and wait == pytest.approx(10.0)
+    # 其他用户有独立的桶
+    assert limiter.acquire("v", now=0.0) is None
+    assert limiter.allowed == 4 and limiter.throttled["user"] == 1
+
+
+def test_refill_is_lazy_and_capped(limiter):
+    for _ in range(3):
+        limiter.acquire("u", now=0.0)
+    assert limiter.acquire("u", now=9.0) is not None
+    assert limiter.acquire("u", now=10.0) is None
+    assert limiter.acquire("u", now=10.0) is not None
+
+    # 长时间空闲后最多补满突发上限
+    allowed = [limiter.acquire("u", now=1000.0 + i * 0.01) for i in range(5)]
+    assert allowed.count(None) == 3
+
+
+def test_throttled_request_consumes_no_tokens(plugin):
+    limiter = plugin("ratelimit").RateLimiter(
+        user=(60, 5), group=(6, 1), global_=(0, 0)
+    )
+    assert limiter.acquire("u", "g", now=0.0) is None
+    assert limiter.acquire("u", "g", now=0.0)[0] == "group"
+    # 群组拦截的请求没有扣用户桶：私聊仍剩 4 个
+    assert [limiter.acquire("u", now=0.0) for _ in range(5)].count(None) == 4
+
+
+def test_admin_is_exempt(limiter):
+    for _ in range(3):
+        limiter.acquire("u", now=0.0)
+    assert limiter.acquire("u", now=0.0) is not None
+    assert all(limiter.acquire("u", now=0.0, exempt=True) is None for _ in range(10))
+    assert limiter.exempted == 10 and limiter.allowed == 3
+
+
+def test_idle_buckets_are_evicted(plugin):
+    limiter = plugin("ratelimit").RateLimiter(idle_seconds=60)
+    limiter.acquire("a", "g", now=0.0)
+    limiter.acquire("b", now=30.0)
+    limiter.acquire("b", now=100.0)
+    assert ("user", "a") not in limiter.buckets
+    assert ("user", "b") in limiter.buckets
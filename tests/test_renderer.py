@@ -0,0 +1,37 @@
+def test_consecutive_ticks_reuse_encoded_image(plugin, host, monkeypatch):
+    system_info = plugin("system_info")
+    sampler_mod = plugin("sampler")
+    renderer = plugin("kawaii_renderer").KawaiiStatusRenderer(arc_step=3.6)
+    # 固定运行时间，避免两次渲染之间恰好跨过整分钟
+    monkeypatch.setattr(system_info.time, "time", lambda: 1_700_086_400.0)
+
+    # 负载平稳的主机：两次采样之间只有细微抖动
+    base = [12.0, 31.0, 48.0, 66.0, 20.0, 9.0, 73.0, 45.0]
+    sampler = sampler_mod.StatusSampler(interval=2, history_minutes=1)
+
+    def tick(jitter):
+        host.per_core = [value + jitter for value in base]
+        host.mem_used += 1024**2
+        sampler.sample()
+        status_info = system_info.get_all_status_info(sampler=sampler)
+        status_info["history"] = sampler.history_snapshot()
+        return renderer.render(status_info)
+
+    # 填满历史窗口，之后的趋势线只平移
+    for i in range(sampler.history["cpu"].capacity):
+        tick(0.3 * (i % 2))
+
+    first = tick(0.4)
+    hits = renderer.encoded.hits
+    second = tick(-0.4)
+    assert second is first
+    assert renderer.encoded.hits == hits + 1
+
+
+def test_nice_ceil(plugin):
+    nice_ceil = plugin("kawaii_renderer").nice_ceil
+    assert nice_ceil(0) == 1.0
+    assert nice_ceil(1.0) == 1.0
+    assert nice_ceil(1.3) == 2.0
+    assert nice_ceil(3_000) == 5_000
+    assert nice_ceil(7_200) == 10_000
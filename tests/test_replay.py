@@ -0,0 +1,32 @@
+import math
+
+import pytest
+
+
+def test_select_samples_bounds(plugin):
+    select_samples = plugin("replay").select_samples
+
+    assert select_samples(0, 30, 10) == []
+    assert select_samples(100, 0, 10) == []
+    assert select_samples(100, 30, 0) == []
+    # 窗口超过已有样本数时只取已有的
+    assert select_samples(5, 30, 10) == [0, 1, 2, 3, 4]
+    assert select_samples(100, 8, 10) == list(range(92, 100))
+
+    picks = select_samples(300, 150, 60)
+    assert len(picks) <= 60
+    assert picks[0] == 150 and picks[-1] == 299
+    assert picks == sorted(set(picks))
+
+
+def test_parse_replay_minutes(plugin):
+    replay = plugin("replay")
+    parse = replay.parse_replay_minutes
+
+    assert parse("", 10) == 5.0
+    assert parse("2.5", 10) == 2.5
+    assert parse("1e9", 10) == 10
+    for text in ("abc", "nan", "NaN", "inf", "-inf", "0", "-3"):
+        with pytest.raises(replay.ReplayError):
+            parse(text, 10)
+    assert math.isfinite(parse("999999", 10))
@@ -0,0 +1,25 @@
+import time
+
+
+def test_start_seeds_per_core_without_blocking(plugin, monkeypatch):
+    sampler_mod = plugin("sampler")
+    system_info = plugin("system_info")
+    sampler = sampler_mod.StatusSampler(interval=60)
+
+    def blocking(*args, **kwargs):
+        if kwargs.get("interval"):
+            raise AssertionError("不应阻塞采样")
+        return [10.0, 30.0]
+
+    monkeypatch.setattr(sampler_mod.psutil, "cpu_percent", blocking)
+    monkeypatch.setattr(system_info.psutil, "cpu_percent", blocking)
+    sampler.start()
+    try:
+        assert sampler.ticks == 0
+        started = time.perf_counter()
+        info = system_info.get_all_status_info(sampler=sampler)
+        assert time.perf_counter() - started < 0.5
+        assert info["cpu"].per_core == [10.0, 30.0]
+        assert info["cpu"].usage == 20.0
+    finally:
+        sampler.stop()
@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS = Path(__file__).resolve().parent.parent / "benchmarks"
+
+# 子进程中创建写入方；replace 时先删除同名段，crash 时模拟异常退出（不清理段）
+_CHILD = """
+import os, sys
+sys.path.insert(0, {benchmarks!r})
+import fakes
+from multiprocessing import resource_tracker
+shm_snapshot = fakes.load_plugin_module("shm_snapshot")
+if "replace" in sys.argv:
+    import _posixshmem
+    _posixshmem.shm_unlink("/" + {name!r})
+writer = shm_snapshot.SnapshotWriter({name!r})
+print("ready", flush=True)
+if sys.stdin.readline().strip() == "crash":
+    resource_tracker.unregister(writer.shm._name, "shared_memory")
+    os._exit(0)
+writer.close()
+"""
+
+
+@pytest.fixture
+def shm(plugin):
+    return plugin("shm_snapshot")
+
+
+@pytest.fixture
+def name():
+    return f"astrbot_status_test_{os.getpid()}"
+
+
+@pytest.fixture
+def spawn(name):
+    processes = []
+
+    def start(*args):
+        code = _CHILD.format(benchmarks=str(BENCHMARKS), name=name)
+        process = subprocess.Popen(
+            [sys.executable, "-c", code, *args],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        processes.append(process)
+        assert process.stdout.readline().strip() == "ready"
+        return process
+
+    yield start
+    for process in processes:
+        process.kill()
+        process.wait()
+
+
+def test_live_owner_is_not_taken_over(shm, spawn, name):
+    process = spawn()
+    assert shm._segment_owner(name) == process.pid
+    with pytest.raises(FileExistsError):
+        shm.SnapshotWriter(name)
+
+    # 被拒绝的一方不影响原写入方，原写入方退出时正常删除段
+    process.communicate("close\n")
+    assert shm._segment_owner(name) is None
+
+
+def test_segment_left_by_dead_writer_is_taken_over(shm, spawn, name):
+    process = spawn()
+    process.communicate("crash\n")
+    assert shm._segment_owner(name) == process.pid
+
+    writer = shm.SnapshotWriter(name)
+    try:
+        assert shm._segment_owner(name) == os.getpid()
+        writer.publish({"cpu": 42.0}, [1.0], ticks=1)
+        with shm.SnapshotReader(name) as reader:
+            assert reader.read().cpu == 42.0
+    finally:
+        writer.close()
+    assert shm._segment_owner(name) is None
+
+
+def test_close_keeps_segment_recreated_by_another_writer(shm, spawn, name):
+    writer = shm.SnapshotWriter(name)
+    process = spawn("replace")
+    writer.close()
+    assert shm._segment_owner(name) == process.pid
+    process.communicate("close\n")
+    assert shm._segment_owner(name) is None
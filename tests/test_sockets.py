@@ -0,0 +1,36 @@
+import fakes
+
+
+def test_socket_info_matches_proc_net(plugin, tmp_path):
+    system_info = plugin("system_info")
+    expected = fakes.write_proc_net(tmp_path, 1000, seed=7)
+
+    sockets = system_info.get_socket_info(proc_root=str(tmp_path))
+
+    names = {code.decode(): name for code, name in system_info.TCP_STATES.items()}
+    assert sockets.states == {names[code]: n for code, n in expected.items()}
+    # 表头行不计入；tcp 与 tcp6、udp 与 udp6 合并统计
+    assert sockets.tcp_total == 900
+    assert sockets.udp_total == 100
+    assert sockets.listen == expected["0A"]
+
+
+def test_socket_info_reads_tcp6_only_table(plugin, tmp_path):
+    system_info = plugin("system_info")
+    fakes.write_proc_net(tmp_path, 400)
+    net = tmp_path / "net"
+    tcp6_lines = net.joinpath("tcp6").read_text().splitlines()[1:]
+    # 只剩表头的 tcp 与缺失的 udp 表
+    header = net.joinpath("tcp").read_text().splitlines(keepends=True)[0]
+    net.joinpath("tcp").write_text(header)
+    for name in ("udp", "udp6"):
+        net.joinpath(name).unlink()
+
+    sockets = system_info.get_socket_info(proc_root=str(tmp_path))
+
+    assert sockets.tcp_total == len(tcp6_lines) > 0
+    assert sockets.udp_total == 0
+
+
+def test_socket_info_without_proc_net(plugin, tmp_path):
+    assert plugin("system_info").get_socket_info(proc_root=str(tmp_path)) is None
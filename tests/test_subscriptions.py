@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+import pytest
+
+
+def test_broadcast_renders_once_per_theme(plugin, tmp_path):
+    subscriptions = plugin("subscriptions")
+    themes = {"qq:GroupMessage:1": "dark", "qq:GroupMessage:2": "light"}
+    themes["qq:FriendMessage:3"] = "light"
+    renders, sent = [], {}
+
+    async def render(names):
+        renders.append(names)
+        return {name: name.encode() for name in names}
+
+    async def send(session, image_data):
+        sent[session] = image_data
+
+    scheduler = subscriptions.BroadcastScheduler(
+        tmp_path / "subscriptions.json", render, send, theme_for=themes.get
+    )
+    for session in themes:
+        scheduler.subscribe(session, 600)
+    asyncio.run(scheduler.broadcast(list(scheduler.subscriptions.values())))
+
+    assert renders == [["dark", "light"]]
+    assert sent == {session: theme.encode() for session, theme in themes.items()}
+    assert all(s.sent == 1 for s in scheduler.subscriptions.values())
+
+
+def test_parse_interval_rejects_zero(plugin):
+    subscriptions = plugin("subscriptions")
+    assert subscriptions.parse_interval("90s") == 90
+    assert subscriptions.parse_interval("30") == 1800
+    for text in ("0", "0m", "0s", "0d", "-5m", "soon"):
+        with pytest.raises(ValueError):
+            subscriptions.parse_interval(text)
+
+
+def test_load_drops_zero_interval(plugin, tmp_path):
+    subscriptions = plugin("subscriptions")
+    path = tmp_path / "subscriptions.json"
+    path.write_text(
+        json.dumps([{"session": "a", "interval": 0}, {"session": "b", "interval": 600}])
+    )
+
+    scheduler = subscriptions.BroadcastScheduler(path, None, None)
+
+    assert list(scheduler.subscriptions) == ["b"]
+    assert scheduler.next_tick(1_000) == 1_200
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+
+def _luminance(rgb):
+    """WCAG 相对亮度"""
+    c = np.asarray(rgb, dtype=np.float64) / 255
+    c = np.where(c <= 0.03928, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return c @ [0.2126, 0.7152, 0.0722]
+
+
+def _contrast(a, b):
+    high, low = sorted((_luminance(a), _luminance(b)), reverse=True)
+    return (high + 0.05) / (low + 0.05)
+
+
+@pytest.fixture(scope="module")
+def renderer():
+    import fakes
+
+    return fakes.load_plugin_module("kawaii_renderer").KawaiiStatusRenderer()
+
+
+def _heading_colors(renderer, theme):
+    """背景标题区域内，标题像素与纸色像素在该主题下的平均颜色"""
+    box = renderer.heading_box
+    base = np.array(renderer.background().crop(box).convert("RGB"))
+    themed = np.array(renderer.background(theme).crop(box).convert("RGB"))
+    ink = np.all(base == renderer.base_theme.palette["details"][:3], axis=-1)
+    paper = np.all(base == renderer.heading_paper, axis=-1)
+    assert ink.sum() > 5000 and paper.sum() > 100000
+    return themed[ink].mean(axis=0), themed[paper].mean(axis=0)
+
+
+def test_dark_background_headings_keep_contrast(plugin, renderer):
+    themes = plugin("themes")
+    dark = themes.get_theme("dark")
+    heading, paper = _heading_colors(renderer, dark)
+    light_contrast = _contrast(*_heading_colors(renderer, themes.get_theme("light")))
+
+    assert _contrast(heading, paper) >= max(4.5, light_contrast)
+    # 标题与同一区域内绘制的数值使用同一颜色角色
+    assert np.abs(heading - dark.palette["details"][:3]).max() <= 1
+
+
+def test_dark_background_is_dark(plugin, renderer):
+    dark = renderer.background(plugin("themes").get_theme("dark"))
+    pixels = np.array(dark.convert("RGB"), dtype=np.float64)
+    assert np.median(_luminance(pixels)) < 0.1
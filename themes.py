@@ -0,0 +1,140 @@
+"""配色主题
+
+主题只声明调色板与背景的色调映射，不参与绘制：渲染器始终按基础主题生成绘制计划，
+其他主题由基础计划逐项换色得到。
+
+- 文字、弧线等调用的 fill 按颜色对照表直接替换
+- 热力图、趋势线等像素块按 RGB 查表重映射（NumPy 一次完成）
+- 背景图按通道查找表经 Image.point 重映射；背景中预先画好的标题随后由渲染器
+  改用 details 角色的颜色，避免与纸色一起被压暗而看不清
+
+因此切换主题或同时为不同群提供不同主题时，采集与布局只做一次，
+每个主题各自保留上一帧做增量合成。
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+RGBA = Tuple[int, int, int, int]
+
+# 调色板中的颜色角色；基础主题中颜色相同的角色，在其他主题中也必须相同
+ROLES = (
+    "cpu",
+    "ram",
+    "swap",
+    "disk",
+    "gpu",
+    "network_upload",
+    "network_download",
+    "details",
+    "nickname",
+    "hot",
+)
+
+
+@dataclass(frozen=True)
+class Theme:
+    """声明式主题
+
+    background 为背景的色调映射：(亮度 0 映射到的 RGB, 亮度 255 映射到的 RGB)，
+    各通道线性插值；None 表示保持原图。
+    """
+
+    name: str
+    palette: Dict[str, RGBA]
+    background: Optional[Tuple[Tuple[int, int, int], Tuple[int, int, int]]] = None
+
+    def background_lut(self) -> Optional[List[int]]:
+        """RGBA 图像用的 1024 项查找表（透明度不变）"""
+        if self.background is None:
+            return None
+        low, high = self.background
+        lut: List[int] = []
+        for channel in range(3):
+            span = high[channel] - low[channel]
+            lut.extend(round(low[channel] + span * v / 255) for v in range(256))
+        lut.extend(range(256))
+        return lut
+
+
+THEMES: Dict[str, Theme] = {
+    "light": Theme(
+        "light",
+        {
+            "cpu": (84, 173, 255, 255),
+            "ram": (255, 179, 204, 255),
+            "swap": (251, 170, 147, 255),
+            "disk": (184, 170, 159, 255),
+            "gpu": (144, 238, 144, 255),  # 浅绿色
+            "network_upload": (255, 165, 0, 255),  # 橙色
+            "network_download": (135, 206, 235, 255),  # 天蓝色
+            "details": (184, 170, 159, 255),
+            "nickname": (84, 173, 255, 255),
+            "hot": (255, 99, 99, 255),
+        },
+    ),
+    "dark": Theme(
+        "dark",
+        {
+            "cpu": (110, 190, 255, 255),
+            "ram": (255, 168, 200, 255),
+            "swap": (255, 176, 150, 255),
+            "disk": (214, 202, 192, 255),
+            "gpu": (128, 226, 140, 255),
+            "network_upload": (255, 184, 64, 255),
+            "network_download": (142, 214, 244, 255),
+            "details": (214, 202, 192, 255),
+            "nickname": (110, 190, 255, 255),
+            "hot": (255, 112, 112, 255),
+        },
+        background=((14, 14, 20), (66, 62, 76)),
+    ),
+}
+DEFAULT_THEME = "light"
+
+
+def get_theme(name: Optional[str]) -> Theme:
+    """按名称取主题，未知名称退回默认主题"""
+    return THEMES.get(name or DEFAULT_THEME, THEMES[DEFAULT_THEME])
+
+
+def _pack(rgb: np.ndarray) -> np.ndarray:
+    rgb = rgb.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+class Recolor:
+    """基础主题到目标主题的颜色映射"""
+
+    def __init__(self, pairs: Iterable[Tuple[RGBA, RGBA]]):
+        self.fills: Dict[RGBA, RGBA] = {}
+        for source, target in pairs:
+            self.fills.setdefault(tuple(source), tuple(target))
+        # 像素块只按 RGB 匹配，透明度保持原样
+        rgb = {}
+        for source, target in self.fills.items():
+            rgb.setdefault(source[:3], target[:3])
+        keys = _pack(np.array(list(rgb), dtype=np.uint8).reshape(-1, 3))
+        order = np.argsort(keys)
+        self.keys = keys[order]
+        self.values = np.array(list(rgb.values()), dtype=np.uint8).reshape(-1, 3)[
+            order
+        ]
+
+    def fill(self, color):
+        """文字、弧线等调用的颜色参数"""
+        if isinstance(color, tuple):
+            return self.fills.get(color, color)
+        return color
+
+    def image(self, image: Image.Image) -> Image.Image:
+        """像素块中与映射表相同的 RGB 替换为目标颜色"""
+        pixels = np.array(image.convert("RGBA"))
+        packed = _pack(pixels[..., :3])
+        index = np.searchsorted(self.keys, packed).clip(0, len(self.keys) - 1)
+        hit = self.keys[index] == packed
+        pixels[hit, :3] = self.values[index[hit]]
+        return Image.fromarray(pixels)